@@ -0,0 +1,94 @@
+import functools
+import os
+import threading
+
+from bike_data_scraper.libs.timing import stage_timer
+
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "32"))
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "5"))
+
+
+@functools.cache
+def client_config():
+    # boto3 and botocore are imported on first use, not on a handler's import
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "adaptive"},
+        tcp_keepalive=True,
+    )
+
+
+_lock = threading.Lock()
+_pid = None
+_session = None
+_clients = {}
+_resources = {}
+
+# How long every client and resource of this process took to create, in ms
+creation_timings = {}
+
+
+def _process_cache():
+    """The session of this process, started over after a fork.
+
+    A forked child would otherwise share the parent's pooled connections.
+    """
+    global _pid, _session
+    if _pid != os.getpid():
+        import boto3
+
+        _pid = os.getpid()
+        _session = boto3.Session()
+        _clients.clear()
+        _resources.clear()
+        creation_timings.clear()
+    return _session
+
+
+def get_client(service_name: str):
+    """The process's client for the service, created on first use.
+
+    Clients are thread safe, so every thread shares them.
+    """
+    with _lock:
+        session = _process_cache()
+        if service_name not in _clients:
+            with stage_timer(f"client {service_name}", creation_timings):
+                _clients[service_name] = session.client(
+                    service_name, config=client_config()
+                )
+        return _clients[service_name]
+
+
+def get_resource(service_name: str):
+    """The process's resource for the service, created on first use.
+
+    Resources are not thread safe; worker threads use new_resource.
+    """
+    with _lock:
+        session = _process_cache()
+        if service_name not in _resources:
+            with stage_timer(f"resource {service_name}", creation_timings):
+                _resources[service_name] = session.resource(
+                    service_name, config=client_config()
+                )
+        return _resources[service_name]
+
+
+def new_resource(service_name: str):
+    """A resource of its own, on a session of its own, for one worker thread."""
+    import boto3.session
+
+    return boto3.session.Session().resource(service_name, config=client_config())
+
+
+def reset_clients():
+    """Drops every cached client, so the next use creates them again.
+
+    Tests call this whenever the AWS mocks change.
+    """
+    global _pid
+    with _lock:
+        _pid = None
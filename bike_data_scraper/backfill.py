@@ -0,0 +1,260 @@
+"""Rebuilds the processed bike datasets for a past range of days.
+
+Every day is a partition that goes through the same steps as the scheduled
+Lambdas: the day's bikes are read from DynamoDB and encoded like the
+two-week export, its weather comes from the weather store (missing days are
+fetched from Open-Meteo first), and the frames are merged, featured and
+split like the preprocessing Lambda does. Days run in a process pool, and
+every finished day is recorded in a checkpoint file, so a killed run picks
+up where it stopped.
+
+    python -m bike_data_scraper.backfill 2023-10-01 2023-10-14 \\
+        --table dev-dscrap-bike-data --weather-bucket dev-dscrap-raw-weather-data \\
+        --destination-bucket dev-dscrap-processed
+
+--endpoint-url points every AWS client at a local stand-in such as MinIO or
+a moto server.
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.concurrent_fetch import ConcurrentFetcher
+from bike_data_scraper.csv_client.csv_handler import IncrementalCSVEncoder
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    DAY_BUCKET_INDEX_NAME,
+    BikeDataDynamoDbHandler,
+)
+from bike_data_scraper.libs.preprocessing import preprocess, save_processed_datasets
+from bike_data_scraper.libs.station_deltas import restore_scraped_series
+from bike_data_scraper.libs.station_samples import decode_station_pages
+from bike_data_scraper.open_meteo import fetch_missing_weather
+from bike_data_scraper.s3_client.s3_handler import CSV_FORMAT, S3Handler
+from bike_data_scraper.s3_client.weather_store import WeatherDayStore
+
+DEFAULT_WEATHER_POINT = {"name": "default", "latitude": 52.52, "longitude": 13.41}
+
+
+class BackfillConfig:
+    def __init__(
+        self,
+        table_name: str,
+        weather_bucket: str,
+        destination_bucket: str,
+        day_index_name: str | None = DAY_BUCKET_INDEX_NAME,
+        weather_prefix: str = "weather",
+        weather_point: dict = DEFAULT_WEATHER_POINT,
+        path: str = "processed",
+        file_format: str = CSV_FORMAT,
+        compression: str = "snappy",
+    ):
+        self.table_name = table_name
+        self.weather_bucket = weather_bucket
+        self.destination_bucket = destination_bucket
+        self.day_index_name = day_index_name
+        self.weather_prefix = weather_prefix
+        self.weather_point = weather_point
+        self.path = path
+        self.file_format = file_format
+        self.compression = compression
+
+    def weather_store(self, s3_handler: S3Handler) -> WeatherDayStore:
+        return WeatherDayStore(s3_handler, self.weather_bucket, self.weather_prefix)
+
+
+class Checkpoint:
+    """The days a backfill has finished, kept in a JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.days = {}
+        if os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self.days = json.load(checkpoint_file)["days"]
+
+    def done(self, day: str) -> bool:
+        return day in self.days
+
+    def mark_done(self, day: str, result: dict):
+        self.days[day] = result
+        # Written aside and renamed, so a kill never leaves half a file
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump({"days": self.days}, checkpoint_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
+
+
+def load_bikes_for_day(config: BackfillConfig, day: dt.date) -> pd.DataFrame | None:
+    """The day's bikes as the two-week export writes and preprocessing reads them."""
+    dynamodb_handler = BikeDataDynamoDbHandler(
+        config.table_name, day_index_name=config.day_index_name
+    )
+    pages = restore_scraped_series(
+        dynamodb_handler.iter_bike_data_between_days(day, day + dt.timedelta(days=1)),
+        delta_samples=dynamodb_handler.get_scraper_state() is not None,
+        time_ordered=bool(config.day_index_name),
+    )
+    csv_encoder = IncrementalCSVEncoder()
+    body = b"".join(csv_encoder.encode(decode_station_pages(pages)))
+    if csv_encoder.rows == 0:
+        return None
+    return pd.read_csv(BytesIO(body))
+
+
+def process_day(day: str, config: BackfillConfig) -> dict:
+    """Runs one day through fetch, merge, features and split. Picklable."""
+    first_day = dt.date.fromisoformat(day)
+    bikes_data = load_bikes_for_day(config, first_day)
+    if bikes_data is None:
+        logger.warning(f"No bikes were scraped on {day}")
+        return {"rows": 0, "keys": []}
+
+    s3_handler = S3Handler()
+    weather_data = config.weather_store(s3_handler).load_window(
+        config.weather_point["name"], first_day, first_day
+    )
+    df = preprocess(weather_data, bikes_data)
+    keys = save_processed_datasets(
+        df,
+        s3_handler,
+        config.destination_bucket,
+        config.path,
+        file_format=config.file_format,
+        compression=config.compression,
+    )
+    return {"rows": len(df), "keys": keys}
+
+
+def run_backfill(
+    start_date: dt.date,
+    end_date: dt.date,
+    config: BackfillConfig,
+    checkpoint_path: str,
+    workers: int = 1,
+    fetch_weather: bool = True,
+) -> dict:
+    """Processes every day of [start_date, end_date] not in the checkpoint yet.
+
+    Failed days are logged and left out of the checkpoint, so the next run
+    retries them. Returns the results and the failed days of this run.
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    days = [day.isoformat() for day in pd.date_range(start_date, end_date).date]
+    pending = [day for day in days if not checkpoint.done(day)]
+    logger.info(f"Backfilling {len(pending)} of {len(days)} days")
+
+    if fetch_weather and pending:
+        fetch_missing_weather(
+            config.weather_store(S3Handler()),
+            ConcurrentFetcher(),
+            [config.weather_point],
+            dt.date.fromisoformat(pending[0]),
+            dt.date.fromisoformat(pending[-1]),
+            today=dt.date.today(),
+        )
+
+    results = {}
+    failed = {}
+
+    def record(day: str, result: dict):
+        checkpoint.mark_done(day, result)
+        results[day] = result
+        logger.info(f"Backfilled {day}: {result['rows']} rows")
+
+    def record_failure(day: str, error: Exception):
+        failed[day] = repr(error)
+        logger.error(f"Backfilling {day} failed: {error}")
+
+    if workers <= 1:
+        for day in pending:
+            try:
+                record(day, process_day(day, config))
+            except Exception as e:
+                record_failure(day, e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_day, day, config): day for day in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    record(futures[future], future.result())
+                except Exception as e:
+                    record_failure(futures[future], e)
+
+    return {"results": results, "failed": failed}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("start_date", type=dt.date.fromisoformat)
+    parser.add_argument("end_date", type=dt.date.fromisoformat)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--weather-bucket", required=True)
+    parser.add_argument("--destination-bucket", required=True)
+    parser.add_argument("--day-index", default=DAY_BUCKET_INDEX_NAME)
+    parser.add_argument("--weather-prefix", default="weather")
+    parser.add_argument("--weather-point", default=DEFAULT_WEATHER_POINT["name"])
+    parser.add_argument(
+        "--latitude", type=float, default=DEFAULT_WEATHER_POINT["latitude"]
+    )
+    parser.add_argument(
+        "--longitude", type=float, default=DEFAULT_WEATHER_POINT["longitude"]
+    )
+    parser.add_argument("--path", default="processed")
+    parser.add_argument("--file-format", default=CSV_FORMAT)
+    parser.add_argument("--compression", default="snappy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--no-fetch-weather", action="store_true")
+    parser.add_argument("--endpoint-url", default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.endpoint_url:
+        # Read by every boto3 client, in the workers too
+        os.environ["AWS_ENDPOINT_URL"] = args.endpoint_url
+
+    config = BackfillConfig(
+        table_name=args.table,
+        weather_bucket=args.weather_bucket,
+        destination_bucket=args.destination_bucket,
+        day_index_name=args.day_index or None,
+        weather_prefix=args.weather_prefix,
+        weather_point={
+            "name": args.weather_point,
+            "latitude": args.latitude,
+            "longitude": args.longitude,
+        },
+        path=args.path,
+        file_format=args.file_format,
+        compression=args.compression,
+    )
+    checkpoint_path = (
+        args.checkpoint or f".backfill-{args.start_date}-{args.end_date}.json"
+    )
+    summary = run_backfill(
+        args.start_date,
+        args.end_date,
+        config,
+        checkpoint_path,
+        workers=args.workers,
+        fetch_weather=not args.no_fetch_weather,
+    )
+    if summary["failed"]:
+        logger.error(f"{len(summary['failed'])} days failed, run again to retry them")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+import asyncio
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from bike_data_scraper.http_client import (
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_READ_TIMEOUT_SECONDS,
+    HttpClient,
+    build_session,
+)
+
+
+class FetchTarget:
+    """One GET to make, such as a station API region or a weather point."""
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        timeout: tuple = (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS),
+    ):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+
+
+class FetchResult:
+    def __init__(self, target: FetchTarget, payload, metrics: dict):
+        self.target = target
+        # None when the request failed, see metrics for why
+        self.payload = payload
+        self.metrics = metrics
+
+
+class ConcurrentFetcher:
+    """Fetches many targets at once, at most max_concurrency at a time.
+
+    Requests run on threads through a pooled session per host, so targets on
+    the same host share connections. Every target keeps its own HttpClient
+    (and so its ETag cache) across calls, and gets its own timeout.
+    """
+
+    def __init__(
+        self, max_concurrency: int = HTTP_POOL_SIZE, max_retries: int = HTTP_MAX_RETRIES
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._clients = {}
+
+    def _client(self, target: FetchTarget) -> HttpClient:
+        host = urlsplit(target.url).netloc
+        if host not in self._sessions:
+            self._sessions[host] = build_session(max_retries=self.max_retries)
+        if target.name not in self._clients:
+            self._clients[target.name] = HttpClient(session=self._sessions[host])
+        client = self._clients[target.name]
+        client.timeout = target.timeout
+        return client
+
+    async def iter_results(
+        self, targets: list[FetchTarget]
+    ) -> AsyncIterator[FetchResult]:
+        """Yields the result of every target as soon as it completes."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(target: FetchTarget) -> FetchResult:
+            client = self._client(target)
+            async with semaphore:
+                payload = await asyncio.to_thread(client.get_data, target.url)
+            return FetchResult(target, payload, client.metrics)
+
+        for completed in asyncio.as_completed([fetch(target) for target in targets]):
+            yield await completed
+
+    def fetch_all(self, targets: list[FetchTarget]) -> list[FetchResult]:
+        """Runs iter_results to the end, results in completion order."""
+
+        async def collect():
+            return [result async for result in self.iter_results(targets)]
+
+        return asyncio.run(collect())
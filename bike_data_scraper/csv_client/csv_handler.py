@@ -1,48 +1,180 @@
-import csv
-from io import StringIO
-import pandas as pd
-
-
-class UniversalCSVConverter:
-    def __init__(self, columns=None, data=None):
-        self.columns = columns
-        self.data = data
-
-    def set_data(self, data):
-        self.data = data  # lets us change the data after instantiation
-
-    def set_columns(self, columns):
-        self.columns = columns  # same as above but for columns
-
-    @staticmethod  # doesn't require self as an argument
-    # can use convert_to_csv without creating an instance of the class
-    # can't modify object state nor class state
-    def convert_to_csv(columns, data):
-        csv_file = StringIO()
-        csv_writer = csv.DictWriter(csv_file, fieldnames=columns)
-        csv_writer.writeheader()
-        for item in data:
-            csv_writer.writerow(item)
-        csv_data = csv_file.getvalue()
-        csv_file.close()
-        return csv_data
-
-    def to_csv(self):
-        if self.data is None:
-            raise ValueError("No data provided")
-
-        if isinstance(self.data, pd.DataFrame):  # for pandas dataframes
-            return self.data.to_csv(
-                index=False, columns=self.columns
-            )  # "to_csv" is a pandas method here
-
-        elif isinstance(self.data, list) and all(  # for lists of dictionaries
-            isinstance(item, dict) for item in self.data
-        ):
-            columns = self.columns or list(
-                self.data[0].keys()
-            )  # keys in this case are the column names
-            return self.convert_to_csv(columns, self.data)
-
-        else:
-            raise ValueError("Unsupported data type")
+from __future__ import annotations
+
+import csv
+from decimal import Decimal
+from io import BytesIO, StringIO
+from typing import BinaryIO, Iterable, Iterator
+
+from bike_data_scraper.libs.lazy_imports import lazy_attribute, lazy_module
+
+logger = lazy_attribute("loguru", "logger")
+pd = lazy_module("pandas")
+
+# Rows encoded per write to the stream
+CSV_CHUNK_ROWS = 10_000
+
+
+class UniversalCSVConverter:
+    def __init__(self, columns=None, data=None):
+        self.columns = columns
+        self.data = data
+
+    def set_data(self, data):
+        self.data = data  # lets us change the data after instantiation
+
+    def set_columns(self, columns):
+        self.columns = columns  # same as above but for columns
+
+    @staticmethod  # doesn't require self as an argument
+    # can use convert_to_csv without creating an instance of the class
+    # can't modify object state nor class state
+    def convert_to_csv(columns, data):
+        with BytesIO() as csv_file:
+            write_items_csv(data, csv_file, columns=columns)
+            return csv_file.getvalue().decode()
+
+    def to_csv(self):
+        if self.data is None:
+            raise ValueError("No data provided")
+
+        if isinstance(self.data, pd.DataFrame):  # for pandas dataframes
+            return self.data.to_csv(
+                index=False, columns=self.columns
+            )  # "to_csv" is a pandas method here
+
+        elif isinstance(self.data, list) and all(  # for lists of dictionaries
+            isinstance(item, dict) for item in self.data
+        ):
+            columns = self.columns or union_columns(
+                self.data
+            )  # keys in this case are the column names
+            return self.convert_to_csv(columns, self.data)
+
+        else:
+            raise ValueError("Unsupported data type")
+
+
+class IncrementalCSVEncoder:
+    """Encodes pages of dict rows into CSV bytes, one page at a time.
+
+    Only the page being encoded is buffered. The header is taken from
+    `columns` or from the keys of the first non-empty page; keys that show up
+    for the first time in a later page can't be added to a header that was
+    already written, so they are dropped with a warning.
+    """
+
+    def __init__(self, columns=None, encoding: str = "utf-8"):
+        self.columns = list(columns) if columns is not None else None
+        self.encoding = encoding
+        self.rows = 0
+
+    def encode(self, pages: Iterable[list[dict]]) -> Iterator[bytes]:
+        csv_file = StringIO()
+        csv_writer = None
+        dropped_columns = set()
+
+        for page in pages:
+            if not page:
+                continue
+
+            if csv_writer is None:
+                if self.columns is None:
+                    self.columns = list(dict.fromkeys(k for row in page for k in row))
+                header = set(self.columns)
+                csv_writer = csv.writer(csv_file)
+                csv_writer.writerow(self.columns)
+
+            for row in page:
+                dropped_columns.update(row.keys() - header)
+            csv_file.write(encode_csv_rows(page, self.columns))
+            self.rows += len(page)
+
+            yield csv_file.getvalue().encode(self.encoding)
+            csv_file.seek(0)
+            csv_file.truncate()
+
+        if dropped_columns:
+            logger.warning(
+                f"Dropped columns missing from the CSV header: {sorted(dropped_columns)}"
+            )
+
+
+def union_columns(items: Iterable[dict]) -> list:
+    """Every key of the items, in the order they first show up."""
+    columns = {}
+    for item in items:
+        # update() walks the keys in C; the values are never read
+        columns.update(item)
+    return list(columns)
+
+
+def quote_csv_field(value: str) -> str:
+    """Quotes a field the way csv.writer does by default."""
+    if any(character in value for character in ',"\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def encode_csv_rows(items: list[dict], columns: list) -> str:
+    """The items as CSV rows, exactly as csv.writer writes them.
+
+    Rows are built a column at a time. Station samples repeat most of their
+    values (names, counts, flags), so every distinct value of a column is
+    formatted and quoted once instead of once per row.
+    """
+    if not items:
+        return ""
+    if len(columns) == 1:
+        # csv.writer quotes a lone empty field, leave that rule to it
+        csv_file = StringIO()
+        csv.writer(csv_file).writerows((item.get(columns[0]),) for item in items)
+        return csv_file.getvalue()
+    formatted = [
+        _format_column([item.get(column) for item in items]) for column in columns
+    ]
+    return "\r\n".join(map(",".join, zip(*formatted))) + "\r\n"
+
+
+def _format_column(values: list) -> list[str]:
+    kinds = set(map(type, values))
+    # True == 1, so bools and ints can't share a cache of labels
+    if kinds <= {str, int, type(None)} or kinds <= {str, bool, type(None)}:
+        labels = {value: _format_field(value) for value in set(values)}
+        return list(map(labels.__getitem__, values))
+    if len(kinds) == 1 and kinds <= {float, Decimal}:
+        # 0.0 == -0.0 and Decimal("1.0") == Decimal("1"), so no cache either
+        return list(map(str, values))
+    return [_format_field(value) for value in values]
+
+
+def _format_field(value) -> str:
+    if value is None:
+        return ""
+    return quote_csv_field(value if isinstance(value, str) else str(value))
+
+
+def write_items_csv(
+    items: list[dict],
+    stream: BinaryIO,
+    columns: list | None = None,
+    encoding: str = "utf-8",
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> int:
+    """Writes DynamoDB items as CSV to a binary stream, returns the row count.
+
+    The header is the union of every item's keys unless `columns` is given;
+    items without a column get an empty cell and keys outside `columns` are
+    left out. Rows are encoded `chunk_rows` at a time, so the stream sees
+    one write per chunk.
+    """
+    if columns is None:
+        columns = union_columns(items)
+    if not columns:
+        return 0
+
+    header = ",".join(quote_csv_field(str(column)) for column in columns)
+    stream.write(f"{header}\r\n".encode(encoding))
+    for start in range(0, len(items), chunk_rows):
+        chunk = items[start : start + chunk_rows]
+        stream.write(encode_csv_rows(chunk, columns).encode(encoding))
+    return len(items)
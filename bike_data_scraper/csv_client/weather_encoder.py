@@ -0,0 +1,105 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from bike_data_scraper.csv_client.csv_handler import quote_csv_field
+from bike_data_scraper.s3_client.dataset_schemas import WEATHER_DTYPES
+
+# Open-Meteo variable names to the column names the pipeline reads
+OPEN_METEO_RENAMES = {
+    "time": "Time",
+    "temperature_2m": "Temperature",
+    "relativehumidity_2m": "Humidity",
+    "windspeed_10m": "Wind_Speed",
+    "precipitation": "Precipitation",
+    "visibility": "Visibility",
+    "snowfall": "Snowfall",
+}
+
+
+class WeatherEncoder:
+    """Encodes the hourly arrays of an Open-Meteo response as CSV or Parquet.
+
+    The response is already one array per variable, so columns are encoded
+    as they are, never as per-hour rows. Variables are renamed through
+    `renames`; unknown ones keep their name, so any number of them can be
+    requested.
+    """
+
+    def __init__(self, renames: dict = OPEN_METEO_RENAMES):
+        self.renames = renames
+
+    def columns(self, weather_data: dict) -> dict:
+        """The renamed hourly arrays, with nulls as NaN."""
+        return {
+            self.renames.get(name, name): _as_array(values)
+            for name, values in weather_data["hourly"].items()
+        }
+
+    def to_csv(self, weather_data: dict) -> str:
+        """The CSV csv.writer writes for the hourly rows, CRLF line endings included.
+
+        Values are formatted from the response itself, so integer variables
+        with nulls stay integers.
+        """
+        hourly = weather_data["hourly"]
+        if not hourly:
+            return ""
+        header = ",".join(
+            quote_csv_field(self.renames.get(name, name)) for name in hourly
+        )
+        formatted = [_format_column(values) for values in hourly.values()]
+        rows = "".join(f"{','.join(row)}\r\n" for row in zip(*formatted))
+        return f"{header}\r\n{rows}"
+
+    def to_parquet(self, weather_data: dict, compression: str = "snappy") -> bytes:
+        """Typed Parquet (datetime Time, float32 measures). Needs pyarrow."""
+        df = pd.DataFrame(self.columns(weather_data))
+        if "Time" in df.columns:
+            df["Time"] = pd.to_datetime(df["Time"])
+        df = df.astype(
+            {column: dtype for column, dtype in WEATHER_DTYPES.items() if column in df}
+        )
+        with BytesIO() as parquet_buffer:
+            df.to_parquet(parquet_buffer, index=False, compression=compression)
+            return parquet_buffer.getvalue()
+
+
+def _as_array(values: list) -> np.ndarray:
+    array = np.asarray(values)
+    if array.dtype == object:
+        try:
+            # Numbers with nulls in between
+            array = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+    return array
+
+
+def _format_column(values: list) -> list[str]:
+    """Formats every distinct value once; hourly weather repeats a lot."""
+    array = np.asarray(values)
+    nulls = None
+    if array.dtype == object:
+        # Numbers with nulls in between, typed by the values that are there
+        nulls = np.equal(array, None)
+        present = np.asarray(array[~nulls].tolist())
+        if present.dtype.kind in "iuf":
+            array = np.zeros(len(values), dtype=present.dtype)
+            array[~nulls] = present
+    if array.dtype.kind not in "iuf":
+        return [
+            quote_csv_field("" if value is None else str(value)) for value in values
+        ]
+
+    # Floats are told apart by their bits, so -0.0 keeps its sign
+    keys = array.view(np.int64) if array.dtype.kind == "f" else array
+    distinct, positions = np.unique(keys, return_inverse=True)
+    if array.dtype.kind == "f":
+        distinct = distinct.view(np.float64)
+    labels = np.array([str(value) for value in distinct.tolist()] + [""], dtype=object)
+    positions = positions.reshape(-1)
+    if nulls is not None:
+        positions[nulls] = len(distinct)
+    return labels[positions].tolist()
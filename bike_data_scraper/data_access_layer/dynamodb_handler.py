@@ -1,41 +1,283 @@
-from datetime import timedelta, datetime
-
-import boto3
-from boto3.dynamodb.conditions import Attr
-
-
-class BikeDataDynamoDbHandler:
-    def __init__(self, bike_table_name: str):
-        self.bike_table_name = bike_table_name
-        self.dynamodb = boto3.resource("dynamodb")
-        self.bike_table = self.dynamodb.Table(self.bike_table_name)
-
-    def get_bike_data_last_two_weeks_from_datetime(self, starting_date: datetime):
-        from_date = (starting_date + timedelta(days=1)).date()
-        two_weeks_ago = (starting_date - timedelta(days=14)).date()
-
-        response = self.bike_table.scan(
-            Select="ALL_ATTRIBUTES",
-            FilterExpression=Attr("timestamp").gte(f"{two_weeks_ago}")
-            & Attr("timestamp").lt(f"{from_date}"),
-        )
-
-        if not response["Items"]:
-            return {"message": "No items found in DynamoDB for the last two weeks."}
-
-        bikes = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = self.bike_table.scan(
-                ExclusiveStartKey=response["LastEvaluatedKey"]
-            )
-            bikes.extend(response["Items"])
-
-        return bikes
-
-    def create_bike_data_item(self, item: dict):
-        self.bike_table.put_item(Item=item)
-
-    @staticmethod
-    def create_dynamodb_item(pk: str, sk: str, item: dict) -> dict:
-        return {}
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta, datetime
+from typing import Iterator
+
+from bike_data_scraper.aws_clients import get_resource, new_resource
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
+# Query conditions, only needed by reads
+Attr = lazy_attribute("boto3.dynamodb.conditions", "Attr")
+Key = lazy_attribute("boto3.dynamodb.conditions", "Key")
+
+DAY_BUCKET_ATTRIBUTE = "dayBucket"
+DAY_BUCKET_INDEX_NAME = "dayBucket-timestamp-index"
+
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_RETRIES = 8
+BATCH_WRITE_BASE_BACKOFF_SECONDS = 0.05
+BATCH_WRITE_MAX_BACKOFF_SECONDS = 5.0
+
+# The scraper's change detection state lives in the bike table under this key.
+# It has no day bucket, so exports never read it.
+SCRAPER_STATE_KEY = {"stationId": "#scraper-state", "timestamp": "fingerprints"}
+
+
+class BikeDataDynamoDbHandler:
+    def __init__(
+        self,
+        bike_table_name: str,
+        day_index_name: str | None = None,
+        scan_workers: int = 1,
+    ):
+        self.bike_table_name = bike_table_name
+        self.day_index_name = day_index_name
+        self.scan_workers = max(1, scan_workers)
+        self._dynamodb = None
+        self._bike_table = None
+
+    @property
+    def dynamodb(self):
+        # Created on first use, so importing a handler never builds a resource
+        if self._dynamodb is None:
+            self._dynamodb = get_resource("dynamodb")
+        return self._dynamodb
+
+    @property
+    def bike_table(self):
+        if self._bike_table is None:
+            self._bike_table = self.dynamodb.Table(self.bike_table_name)
+        return self._bike_table
+
+    def get_bike_data_last_two_weeks_from_datetime(self, starting_date: datetime):
+        bikes = [
+            item
+            for page in self.iter_bike_data_last_two_weeks_from_datetime(starting_date)
+            for item in page
+        ]
+
+        if not bikes:
+            return {"message": "No items found in DynamoDB for the last two weeks."}
+
+        return bikes
+
+    def iter_bike_data_last_two_weeks_from_datetime(
+        self, starting_date: datetime
+    ) -> Iterator[list[dict]]:
+        """Yields the two weeks window one DynamoDB page at a time.
+
+        Only the page being consumed (plus a few prefetched ones for parallel
+        scans) is held in memory, whatever the length of the window.
+        """
+        from_date = (starting_date + timedelta(days=1)).date()
+        two_weeks_ago = (starting_date - timedelta(days=14)).date()
+        return self.iter_bike_data_between_days(two_weeks_ago, from_date)
+
+    def iter_bike_data_between_days(
+        self, first_day: date, end_day: date
+    ) -> Iterator[list[dict]]:
+        """Yields the items of the days in [first_day, end_day), page by page."""
+        if self.day_index_name:
+            pages = self._iter_day_bucket_pages(first_day, end_day)
+        else:
+            pages = self._iter_scan_pages_between(first_day, end_day)
+
+        for page in pages:
+            yield self._strip_day_buckets(page)
+
+    def _iter_day_bucket_pages(
+        self, first_day: date, end_day: date
+    ) -> Iterator[list[dict]]:
+        """Issues one paginated Query per day bucket in [first_day, end_day)."""
+        day = first_day
+        while day < end_day:
+            query_kwargs = {
+                "IndexName": self.day_index_name,
+                "KeyConditionExpression": Key(DAY_BUCKET_ATTRIBUTE).eq(f"{day}"),
+            }
+            response = self.bike_table.query(**query_kwargs)
+            yield response["Items"]
+            while "LastEvaluatedKey" in response:
+                response = self.bike_table.query(
+                    ExclusiveStartKey=response["LastEvaluatedKey"], **query_kwargs
+                )
+                yield response["Items"]
+            day += timedelta(days=1)
+
+    def _iter_scan_pages_between(
+        self, two_weeks_ago: date, from_date: date
+    ) -> Iterator[list[dict]]:
+        scan_kwargs = {
+            "Select": "ALL_ATTRIBUTES",
+            "FilterExpression": Attr("timestamp").gte(f"{two_weeks_ago}")
+            & Attr("timestamp").lt(f"{from_date}"),
+        }
+
+        if self.scan_workers > 1:
+            return self._iter_parallel_scan_pages(scan_kwargs)
+        return self._iter_scan_pages(self.bike_table, scan_kwargs)
+
+    def _iter_parallel_scan_pages(self, scan_kwargs: dict) -> Iterator[list[dict]]:
+        """Scans the table as scan_workers segments, one thread per segment.
+
+        Workers hand pages over through a bounded queue, so a slow consumer
+        holds back the scan instead of buffering the table in memory.
+        """
+        total_segments = self.scan_workers
+        pages = queue.Queue(maxsize=total_segments * 2)
+        stopped = threading.Event()
+        segment_done = object()
+
+        def put(page):
+            while not stopped.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int):
+            try:
+                for page in self._iter_segment_pages(
+                    segment, total_segments, scan_kwargs
+                ):
+                    if stopped.is_set():
+                        return
+                    put(page)
+            finally:
+                put(segment_done)
+
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            futures = [
+                executor.submit(scan_segment, segment)
+                for segment in range(total_segments)
+            ]
+            try:
+                finished = 0
+                while finished < total_segments:
+                    page = pages.get()
+                    if page is segment_done:
+                        finished += 1
+                        continue
+                    yield page
+            finally:
+                stopped.set()
+
+            for future in futures:
+                future.result()
+
+    def _iter_segment_pages(
+        self, segment: int, total_segments: int, scan_kwargs: dict
+    ) -> Iterator[list[dict]]:
+        # boto3 resources are not thread safe, so every worker gets its own
+        table = new_resource("dynamodb").Table(self.bike_table_name)
+        return self._iter_scan_pages(
+            table, dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+        )
+
+    @staticmethod
+    def _iter_scan_pages(table, scan_kwargs: dict) -> Iterator[list[dict]]:
+        # Every page has to repeat the filter, otherwise it returns all items
+        response = table.scan(**scan_kwargs)
+        yield response["Items"]
+        while "LastEvaluatedKey" in response:
+            response = table.scan(
+                ExclusiveStartKey=response["LastEvaluatedKey"], **scan_kwargs
+            )
+            yield response["Items"]
+
+    @staticmethod
+    def _strip_day_buckets(items: list[dict]) -> list[dict]:
+        # The bucket only exists to feed the index; keep it out of the export.
+        for item in items:
+            item.pop(DAY_BUCKET_ATTRIBUTE, None)
+        return items
+
+    def create_bike_data_item(self, item: dict):
+        self.bike_table.put_item(Item=item)
+
+    def create_bike_data_items(self, items: list[dict]) -> dict:
+        """Writes items with BatchWriteItem in chunks of 25.
+
+        Unprocessed items are retried with capped exponential backoff. Items
+        sharing a key are collapsed (last one wins) since a batch may not
+        contain duplicate keys. Returns the write counts and latency of the run.
+        """
+        started = time.perf_counter()
+        unique_items = list(
+            {(item["stationId"], item["timestamp"]): item for item in items}.values()
+        )
+
+        metrics = {"items": len(unique_items), "batches": 0, "retries": 0}
+        for start in range(0, len(unique_items), BATCH_WRITE_MAX_ITEMS):
+            batch = unique_items[start : start + BATCH_WRITE_MAX_ITEMS]
+            metrics["batches"] += 1
+            metrics["retries"] += self._write_batch(batch)
+
+        metrics["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"Wrote {metrics['items']} items to {self.bike_table_name} in "
+            f"{metrics['batches']} batches ({metrics['retries']} retries) "
+            f"in {metrics['latency_ms']} ms"
+        )
+        return metrics
+
+    def _write_batch(self, batch: list[dict]) -> int:
+        request_items = {
+            self.bike_table_name: [{"PutRequest": {"Item": item}} for item in batch]
+        }
+        retries = 0
+        while True:
+            response = self.dynamodb.batch_write_item(RequestItems=request_items)
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                return retries
+
+            if retries >= BATCH_WRITE_MAX_RETRIES:
+                unprocessed = len(request_items.get(self.bike_table_name, []))
+                raise Exception(
+                    f"Failed to write {unprocessed} items to {self.bike_table_name} "
+                    f"after {retries} retries"
+                )
+
+            backoff = min(
+                BATCH_WRITE_MAX_BACKOFF_SECONDS,
+                BATCH_WRITE_BASE_BACKOFF_SECONDS * 2**retries,
+            )
+            retries += 1
+            logger.warning(
+                f"Retrying {len(request_items[self.bike_table_name])} unprocessed "
+                f"items in {backoff} s"
+            )
+            time.sleep(backoff)
+
+    def get_scraper_state(self) -> dict | None:
+        response = self.bike_table.get_item(Key=SCRAPER_STATE_KEY)
+        item = response.get("Item")
+        if item is None:
+            return None
+        return {"day": item["day"], "fingerprints": item["fingerprints"]}
+
+    def put_scraper_state(self, state: dict):
+        self.bike_table.put_item(
+            Item={
+                **SCRAPER_STATE_KEY,
+                "day": state["day"],
+                "fingerprints": state["fingerprints"],
+            }
+        )
+
+    @staticmethod
+    def create_dynamodb_item(pk: str, sk: str, item: dict) -> dict:
+        """Builds a bike data item keyed on station and ISO timestamp.
+
+        The day bucket (YYYY-MM-DD of the timestamp) is the partition key of
+        the day index, so a time window can be read one Query per day.
+        """
+        dynamodb_item = {"stationId": pk, "timestamp": sk}
+        dynamodb_item.update(item)
+        dynamodb_item[DAY_BUCKET_ATTRIBUTE] = sk[:10]
+        return dynamodb_item
@@ -1,11 +1,14 @@
-import boto3
 import time
-from loguru import logger
+
+from bike_data_scraper.aws_clients import get_client
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
 
 
 def lambda_handler(event, context):
-    ec2_client = boto3.client("ec2")
-    s3_client = boto3.client("s3")
+    ec2_client = get_client("ec2")
+    s3_client = get_client("s3")
 
     logger.info("Checking EC2 instance status")
     if "InstanceId" not in event:
@@ -1,35 +1,50 @@
-import boto3
 from datetime import datetime, timedelta
 import os
 
 from bike_data_scraper.s3_client.s3_handler import S3Handler
 from bike_data_scraper.data_access_layer.dynamodb_handler import BikeDataDynamoDbHandler
-from bike_data_scraper.csv_client.csv_handler import UniversalCSVConverter
+from bike_data_scraper.csv_client.csv_handler import IncrementalCSVEncoder
+from bike_data_scraper.libs.station_deltas import restore_scraped_series
+from bike_data_scraper.libs.station_samples import decode_station_pages
 
-dynamodb = boto3.resource("dynamodb")
-s3 = boto3.client("s3")
 table_name = os.environ["BIKE_TABLE_NAME"]
-table = dynamodb.Table(table_name)
 bucket_name = os.environ["S3_BUCKET_NAME"]
 stage_name = os.environ.get("STAGE_NAME")
 service_short_name = os.environ.get("SERVICE_SHORT_NAME")
+# Unset keeps the full-table scan as a fallback for items written without a day bucket
+day_index_name = os.environ.get("BIKE_DATA_DAY_INDEX_NAME")
+scan_workers = int(os.environ.get("BIKE_DATA_SCAN_WORKERS", "1"))
 
 
 def lambda_handler(event, context):
     starting_date = datetime.now()
-    items = BikeDataDynamoDbHandler(
-        table_name
-    ).get_bike_data_last_two_weeks_from_datetime(starting_date=starting_date)
+    dynamodb_handler = BikeDataDynamoDbHandler(
+        table_name, day_index_name=day_index_name, scan_workers=scan_workers
+    )
+    pages = dynamodb_handler.iter_bike_data_last_two_weeks_from_datetime(
+        starting_date=starting_date
+    )
+    # The scraper only keeps a state once it has written in delta mode
+    pages = restore_scraped_series(
+        pages,
+        delta_samples=dynamodb_handler.get_scraper_state() is not None,
+        time_ordered=bool(day_index_name),
+    )
+    # Typed and older all-string samples come out as the same rows
+    pages = decode_station_pages(pages)
 
-    columns = items[0].keys()
-    csv_data = UniversalCSVConverter(columns=columns, data=items).to_csv()
+    # Pages are encoded and uploaded as they arrive, never as one list or string
+    csv_encoder = IncrementalCSVEncoder()
 
     one_day_ago = datetime.now() - timedelta(days=1)
     s3_key = f"bikes_two_weeks_{one_day_ago.isoformat()}.csv"
-    S3Handler().put_in_s3_bucket(
-        filename=s3_key, data_to_save=csv_data, bucket_name=bucket_name
+    S3Handler().upload_stream_to_s3(
+        chunks=csv_encoder.encode(pages), bucket_name=bucket_name, key=s3_key
     )
 
+    if csv_encoder.rows == 0:
+        return {"message": "No items found in DynamoDB for the last two weeks."}
+
     return {
         "message": f"Data from the last two weeks saved to s3://{bucket_name}/{s3_key}"
     }
@@ -1,30 +1,136 @@
-import boto3
-from datetime import datetime
-import os
-
-from bike_data_scraper.data_access_layer.dynamodb_handler import BikeDataDynamoDbHandler
-from bike_data_scraper.http_client import HttpClient
-
-bike_data_table_name = os.environ["BIKE_DATA_TABLE_NAME"]
-http_client = HttpClient()
-dynamodb_client = BikeDataDynamoDbHandler(bike_table_name=bike_data_table_name)
-
-app_id = "d722487b-3b24-451c-87fe-db73219c9568"
-url = f"https://data.goteborg.se/SelfServiceBicycleService/v2.0/Stations/{app_id}?getclosingperiods=true&latitude=57.7089&longitude=11.9746&radius=30000&format=json"
-
-
-def lambda_handler(event, context):
-    response = http_client.get_data(url)
-    if response is None:
-        raise Exception(f"Failed to get data from API: {url}")
-
-    current_timestamp = datetime.now().isoformat()
-
-    for station in response:
-        station_id = station.get("Name") or station.get("StationId")
-        item = {"stationId": station_id, "timestamp": current_timestamp}
-        item.update({k: str(v) for k, v in station.items()})
-
-        dynamodb_client.create_bike_data_item(item)
-
-    print(f"Added {len(response)} stations to DynamoDB.")
+from datetime import datetime
+import json
+import os
+
+from bike_data_scraper.data_access_layer.dynamodb_handler import BikeDataDynamoDbHandler
+from bike_data_scraper.concurrent_fetch import ConcurrentFetcher, FetchTarget
+from bike_data_scraper.libs.station_deltas import (
+    SCRAPE_MARKER_STATION_ID,
+    station_fingerprint,
+)
+from bike_data_scraper.libs.station_samples import StationSample
+
+bike_data_table_name = os.environ["BIKE_DATA_TABLE_NAME"]
+# Only write the stations that changed since the last scrape
+delta_mode = os.environ.get("SCRAPER_DELTA_MODE", "false").lower() == "true"
+dynamodb_client = BikeDataDynamoDbHandler(bike_table_name=bike_data_table_name)
+# Every region is one station API query, all of them are fetched concurrently
+station_api_regions = json.loads(
+    os.environ.get(
+        "STATION_API_REGIONS",
+        '[{"name": "goteborg", "latitude": 57.7089, "longitude": 11.9746, "radius": 30000}]',
+    )
+)
+fetcher = ConcurrentFetcher()
+
+app_id = "d722487b-3b24-451c-87fe-db73219c9568"
+base_url = f"https://data.goteborg.se/SelfServiceBicycleService/v2.0/Stations/{app_id}"
+
+
+def station_api_url(region: dict) -> str:
+    return (
+        f"{base_url}?getclosingperiods=true&latitude={region['latitude']}"
+        f"&longitude={region['longitude']}&radius={region['radius']}&format=json"
+    )
+
+
+def fetch_stations() -> tuple[list, dict]:
+    """Fetches every region, returns their stations and the request metrics.
+
+    Regions that fail are left out; it is only an error when all of them do.
+    """
+    targets = [
+        FetchTarget(region["name"], station_api_url(region))
+        for region in station_api_regions
+    ]
+    stations = []
+    http_metrics = {}
+    failed = []
+    for result in fetcher.fetch_all(targets):
+        http_metrics[result.target.name] = result.metrics
+        if result.payload is None:
+            failed.append(result.target.url)
+        else:
+            stations.extend(result.payload)
+
+    if len(failed) == len(targets):
+        raise Exception(f"Failed to get data from API: {failed}")
+    if failed:
+        print(f"Failed to get data from API: {failed}")
+    return stations, http_metrics
+
+
+# Kept across warm invocations, so DynamoDB is only read on a cold start
+scraper_state = None
+
+
+def select_changed_items(items: list[dict], timestamp: str) -> tuple[list, dict]:
+    """Keeps the items whose fingerprint changed, plus a marker for the scrape.
+
+    The first scrape of a day, or one where a known station disappeared, is a
+    keyframe that writes every station, so a day can be rebuilt on its own
+    by forward filling. Returns the items to write and the new state.
+    """
+    global scraper_state
+    if scraper_state is None:
+        scraper_state = dynamodb_client.get_scraper_state()
+
+    fingerprints = {item["stationId"]: station_fingerprint(item) for item in items}
+    day = timestamp[:10]
+    keyframe = (
+        scraper_state is None
+        or scraper_state["day"] != day
+        or not scraper_state["fingerprints"].keys() <= fingerprints.keys()
+    )
+    previous = {} if keyframe else scraper_state["fingerprints"]
+    changed = [
+        item
+        for item in items
+        if previous.get(item["stationId"]) != fingerprints[item["stationId"]]
+    ]
+
+    marker = BikeDataDynamoDbHandler.create_dynamodb_item(
+        pk=SCRAPE_MARKER_STATION_ID,
+        sk=timestamp,
+        item={"keyframe": keyframe, "written": len(changed)},
+    )
+    return changed + [marker], {"day": day, "fingerprints": fingerprints}
+
+
+def save_scraper_state(state: dict):
+    global scraper_state
+    if state != scraper_state:
+        dynamodb_client.put_scraper_state(state)
+        scraper_state = state
+
+
+def lambda_handler(event, context):
+    response, http_metrics = fetch_stations()
+
+    current_timestamp = datetime.now().isoformat()
+
+    # Regions may overlap, a station is kept once
+    items = {}
+    for station in response:
+        sample = StationSample.from_api(station, current_timestamp)
+        items[sample.station_id] = BikeDataDynamoDbHandler.create_dynamodb_item(
+            pk=sample.station_id, sk=current_timestamp, item=sample.to_item()
+        )
+    items = list(items.values())
+
+    if not delta_mode:
+        metrics = dynamodb_client.create_bike_data_items(items)
+        metrics["http"] = http_metrics
+        print(f"Added {len(items)} stations to DynamoDB.")
+        return metrics
+
+    changed, state = select_changed_items(items, current_timestamp)
+    metrics = dynamodb_client.create_bike_data_items(changed)
+    # Saved only once the samples are, so a failed write is redone in full
+    save_scraper_state(state)
+    written = len(changed) - 1
+    metrics["skipped"] = len(items) - written
+    metrics["http"] = http_metrics
+
+    print(f"Added {written} of {len(items)} stations to DynamoDB.")
+    return metrics
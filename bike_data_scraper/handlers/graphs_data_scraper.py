@@ -1,10 +1,16 @@
+import multiprocessing
 import os
-import boto3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from loguru import logger
-import pandas as pd
 from bike_data_scraper.s3_client.s3_handler import S3Handler
 from bike_data_scraper.libs.functions import get_min_and_max_dates_from_dataframe
+from bike_data_scraper.libs.metric_partials import (
+    MetricPartialStore,
+    incremental_metrics,
+)
+from bike_data_scraper.libs.metrics_engine import CORRELATION_COLUMNS, MetricsEngine
+from bike_data_scraper.libs.timing import stage_timer
 
 SOURCE_BUCKET = os.environ.get("GRAPHS_SOURCE_BUCKET")
 DESTINATION_BUCKET = os.environ.get("GRAPHS_DESTINATION_BUCKET")
@@ -12,151 +18,38 @@ DESTINATION_BUCKET = os.environ.get("GRAPHS_DESTINATION_BUCKET")
 SINGLE_BIKE_DATA_KEY = os.environ.get("SINGLE_BIKE_DATA")
 STATION_BIKE_DATA_KEY = os.environ.get("STATION_BIKE_DATA")
 
-AWS_TMP_DIR = "/tmp/"
-S3_CLIENT = boto3.client("s3")
-S3_RESOURCE = boto3.resource("s3")
+SEQUENTIAL_MODE = "sequential"
+PARALLEL_MODE = "parallel"
+EXECUTION_MODE = os.environ.get("GRAPHS_EXECUTION_MODE", SEQUENTIAL_MODE)
+INCREMENTAL_METRICS = os.environ.get("GRAPHS_INCREMENTAL_METRICS", "false") == "true"
+PARTIALS_PATH = os.environ.get("GRAPHS_PARTIALS_PATH", "graphs_data/partials")
+JSON_LAYOUT = os.environ.get("GRAPHS_JSON_LAYOUT", "records")
+JSON_CONTENT_ENCODING = os.environ.get("GRAPHS_JSON_CONTENT_ENCODING") or None
+
 CURRENT_DATE = datetime.now().strftime("%Y-%m-%d")
 
 s3_handler = S3Handler()
+metrics_engine = MetricsEngine()
+partial_store = MetricPartialStore(s3_handler, DESTINATION_BUCKET, PARTIALS_PATH)
 
-
-def number_of_bikes_available(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating number of bikes available")
-        number_of_unique_bikes_in_dataset = df["stationId"].nunique()
-        unique_bike_object = f"{number_of_unique_bikes_in_dataset}"
-        return unique_bike_object
-    except Exception as e:
-        logger.error(f"Error calculating number of bikes available: {e}")
-        raise e
+# Everything calculate_metrics reads; the rest of the file is never parsed
+GRAPHS_COLUMNS = [
+    "stationId",
+    "timestamp",
+    "TotalAvailableBikes",
+    *CORRELATION_COLUMNS,
+]
+# sub path of the results -> (source key, dataset schema)
+DATASETS = {
+    "station_bikes": (STATION_BIKE_DATA_KEY, "StationaryStations"),
+    "single_bikes": (SINGLE_BIKE_DATA_KEY, "SingleBikes"),
+}
 
 
-def warmest_temperature(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating warmest temperature")
-        warmest_temperature = df["Temperature"].max()
-        warmest_temperature_object = f"{warmest_temperature}"
-        return warmest_temperature_object
-    except Exception as e:
-        logger.error(f"Error calculating warmest temperature: {e}")
-        raise e
-
-
-def coldest_temperature(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating coldest temperature")
-        coldest_temperature = df["Temperature"].min()
-        coldest_temperature_object = f"{coldest_temperature}"
-        return coldest_temperature_object
-    except Exception as e:
-        logger.error(f"Error calculating coldest temperature: {e}")
-        raise e
-
-
-def coldest_day(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating coldest day")
-        coldest_day = df["timestamp"].loc[df["Temperature"].idxmin()]
-        coldest_day_object = f"{coldest_day}"
-        return coldest_day_object
-    except Exception as e:
-        logger.error(f"Error calculating coldest day: {e}")
-        raise e
-
-
-def warmest_day(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating warmest day")
-        warmest_day = df["timestamp"].loc[df["Temperature"].idxmax()]
-        warmest_day_object = f"{warmest_day}"
-        return warmest_day_object
-    except Exception as e:
-        logger.error(f"Error calculating warmest day: {e}")
-        raise e
-
-
-def day_with_most_used_bikes(df: pd.DataFrame) -> str:
-    try:
-        logger.info("Calculating day with most used bikes")
-        day_with_most_used_bikes = df["timestamp"].value_counts().idxmax()
-        day_with_most_used_bikes_object = f"{day_with_most_used_bikes}"
-        return day_with_most_used_bikes_object
-    except Exception as e:
-        logger.error(f"Error calculating day with most used bikes: {e}")
-        raise e
-
-
-def correlation_matrix_plot(df: pd.DataFrame) -> pd.DataFrame:
-    logger.info("Calculating correlation matrix plot")
-    corr_columns = [
-        "AvailableBikes",
-        "Distance",
-        "Long",
-        "Lat",
-        "Year",
-        "Month",
-        "Day",
-        "Hour",
-        "Temperature",
-        "Humidity",
-        "Wind_Speed",
-        "Precipitation",
-        "Visibility",
-        "Snowfall",
-        "IsWeekend",
-    ]
-    correlation_matrix = df[corr_columns].corr()
-    correlation_matrix.to_csv(f"{AWS_TMP_DIR}CorrelationMatrix.csv")
-    return correlation_matrix
-
-
-def weekend_vs_weekday_plot(df: pd.DataFrame) -> pd.DataFrame:
-    logger.info("Calculating weekend vs weekday plot")
-    average_number_of_bikes = (
-        df.groupby("IsWeekend")["AvailableBikes"].mean().reset_index()
-    )
-    average_number_of_bikes["IsWeekend"] = average_number_of_bikes["IsWeekend"].replace(
-        {0: "Weekdays", 1: "Weekend"}
-    )
-    average_number_of_bikes.to_csv(
-        f"{AWS_TMP_DIR}WeekendVsWeekdaysSingles.csv", index=False
-    )
-    return average_number_of_bikes
-
-
-def weather_over_timestamp_plot(df: pd.DataFrame) -> pd.DataFrame:
-    logger.info("Calculating weather over timestamp plot")
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    grouped_df = (
-        df.resample("H", on="timestamp")
-        .agg(
-            {
-                "Humidity": "mean",
-                "Wind_Speed": "mean",
-                "Temperature": "mean",
-                "TotalAvailableBikes": "sum",
-            }
-        )
-        .reset_index()
-    )
-    grouped_df.to_csv(f"{AWS_TMP_DIR}WeatherOverTimeStations.csv", index=False)
-    return grouped_df
-
-
-def calculate_metrics(bike_data):
-    metrics = {}
-    logger.info("Start calculating metrics for dataset")
-    metrics["number_of_bikes_available"] = number_of_bikes_available(bike_data)
-    metrics["warmest_temperature"] = warmest_temperature(bike_data)
-    metrics["coldest_temperature"] = coldest_temperature(bike_data)
-    metrics["coldest_day"] = coldest_day(bike_data)
-    metrics["warmest_day"] = warmest_day(bike_data)
-    metrics["day_with_most_used_bikes"] = day_with_most_used_bikes(bike_data)
-    metrics["correlation_matrix"] = correlation_matrix_plot(bike_data)
-    metrics["weekend_vs_weekday"] = weekend_vs_weekday_plot(bike_data)
-    metrics["weather_over_timestamp"] = weather_over_timestamp_plot(bike_data)
-    logger.info("Finished calculating metrics for dataset")
-    return metrics
+def calculate_metrics(bike_data, sub_path: str | None = None):
+    if INCREMENTAL_METRICS and sub_path is not None:
+        return incremental_metrics(bike_data, sub_path, partial_store)
+    return metrics_engine.compute(bike_data)
 
 
 def package_results(metrics):
@@ -175,37 +68,115 @@ def save_results(results, data_sub_folder: str, sub_path: str):
         path_name="graphs_data",
         sub_path=sub_path,
         current_date=data_sub_folder,
+        layout=JSON_LAYOUT,
+        content_encoding=JSON_CONTENT_ENCODING,
     )
 
 
-def lambda_handler(event, context):
-    try:
-        station_bikes_data = s3_handler.get_data_from_s3(
-            SOURCE_BUCKET, STATION_BIKE_DATA_KEY
+def load_datasets(parallel: bool) -> dict:
+    """Downloads every dataset, concurrently when `parallel`."""
+
+    def load(sub_path: str):
+        key, dataset = DATASETS[sub_path]
+        return s3_handler.get_data_from_s3(
+            SOURCE_BUCKET, key, columns=GRAPHS_COLUMNS, dataset=dataset
         )
-        single_bikes_data = s3_handler.get_data_from_s3(
-            SOURCE_BUCKET, SINGLE_BIKE_DATA_KEY
+
+    if not parallel:
+        return {sub_path: load(sub_path) for sub_path in DATASETS}
+    with ThreadPoolExecutor(max_workers=len(DATASETS)) as executor:
+        futures = {sub_path: executor.submit(load, sub_path) for sub_path in DATASETS}
+        return {sub_path: future.result() for sub_path, future in futures.items()}
+
+
+def _send_metrics(bike_data, sub_path: str, connection):
+    try:
+        results = package_results(calculate_metrics(bike_data, sub_path))
+        connection.send(("ok", results))
+    except Exception as e:
+        connection.send(("error", repr(e)))
+    finally:
+        connection.close()
+
+
+def calculate_metrics_in_processes(datasets: dict) -> dict:
+    """Computes the metrics of every dataset in its own forked process.
+
+    Lambda has no /dev/shm, so multiprocessing pools and queues are not
+    available there; each worker reports back through a Pipe instead. The
+    frames are inherited through fork, only the results are pickled.
+    """
+    context = multiprocessing.get_context("fork")
+    workers = {}
+    for sub_path, bike_data in datasets.items():
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_send_metrics, args=(bike_data, sub_path, sender)
         )
+        process.start()
+        sender.close()
+        workers[sub_path] = (process, receiver)
 
-        current_date = get_min_and_max_dates_from_dataframe(station_bikes_data)
-        date = f"{current_date['min_date']}-{current_date['max_date']}"
+    results = {}
+    for sub_path, (process, receiver) in workers.items():
+        # Receive before joining, a worker blocks until its result is read
+        status, payload = receiver.recv()
+        process.join()
+        if status != "ok":
+            raise Exception(f"Metrics for {sub_path} failed: {payload}")
+        results[sub_path] = payload
+    return results
 
-        metrics_station_bikes = calculate_metrics(station_bikes_data)
-        metrics_single_bikes = calculate_metrics(single_bikes_data)
 
-        results_station_bikes = package_results(metrics_station_bikes)
-        results_single_bikes = package_results(metrics_single_bikes)
+def save_all_results(results: dict, data_sub_folder: str, parallel: bool):
+    if not parallel:
+        for sub_path, dataset_results in results.items():
+            save_results(dataset_results, data_sub_folder, sub_path)
+        return
+    with ThreadPoolExecutor(max_workers=len(results)) as executor:
+        futures = [
+            executor.submit(save_results, dataset_results, data_sub_folder, sub_path)
+            for sub_path, dataset_results in results.items()
+        ]
+        for future in futures:
+            future.result()
 
-        save_results(
-            results=results_station_bikes,
-            data_sub_folder=date,
-            sub_path="station_bikes",
-        )
 
-        save_results(
-            results=results_single_bikes,
-            data_sub_folder=date,
-            sub_path="single_bikes",
-        )
+def lambda_handler(event, context):
+    parallel = EXECUTION_MODE == PARALLEL_MODE
+    timings = {}
+    try:
+        with stage_timer("total", timings):
+            with stage_timer("download", timings):
+                datasets = load_datasets(parallel)
+
+            current_date = get_min_and_max_dates_from_dataframe(
+                datasets["station_bikes"]
+            )
+            date = f"{current_date['min_date']}-{current_date['max_date']}"
+
+            with stage_timer("metrics", timings):
+                results = None
+                if parallel:
+                    try:
+                        results = calculate_metrics_in_processes(datasets)
+                    except OSError as e:
+                        logger.warning(
+                            f"Could not start metric workers, falling back to "
+                            f"sequential metrics: {e}"
+                        )
+                if results is None:
+                    results = {
+                        sub_path: package_results(
+                            calculate_metrics(bike_data, sub_path)
+                        )
+                        for sub_path, bike_data in datasets.items()
+                    }
+
+            with stage_timer("upload", timings):
+                save_all_results(results, date, parallel)
+
+        logger.info(f"Graphs data saved in {EXECUTION_MODE} mode: {timings}")
+        return {"mode": EXECUTION_MODE, "timings_ms": timings}
     except Exception as e:
         logger.error(f"Error saving graph data into S3: {e}")
@@ -1,13 +1,14 @@
-import boto3
 import logging
 
+from bike_data_scraper.aws_clients import get_client
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
 def lambda_handler(event, context):
-    ec2_client = boto3.client("ec2")
-    ssm = boto3.client("ssm")
+    ec2_client = get_client("ec2")
+    ssm = get_client("ssm")
 
     instance_id = event.get("InstanceId")
     if not instance_id:
@@ -1,10 +1,12 @@
-from loguru import logger
-import boto3
+from bike_data_scraper.aws_clients import get_client, get_resource
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
 
 
 def lambda_handler(event, context):
-    ec2 = boto3.resource("ec2")
-    ssm = boto3.client("ssm")
+    ec2 = get_resource("ec2")
+    ssm = get_client("ssm")
 
     training_date = event.get("date")
 
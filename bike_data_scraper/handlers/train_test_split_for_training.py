@@ -1,23 +1,21 @@
 import os
-import boto3
 from datetime import datetime
 from io import StringIO
 import pandas as pd
 from loguru import logger
 import json
-from sklearn.model_selection import train_test_split
 from bike_data_scraper.s3_client.s3_handler import S3Handler
 from bike_data_scraper.libs.functions import get_min_and_max_dates_from_dataframe
-
+from bike_data_scraper.libs.model_selection import train_test_split
 
 SOURCE_BUCKET = os.environ.get("TRAINING_SOURCE_BUCKET")
 DESTINATION_BUCKET = os.environ.get("TRAINING_DESTINATION_BUCKET")
 
 STATION_BIKE_DATA_KEY = os.environ.get("STATION_BIKE_DATA")
 SINGLE_BIKE_DATA_KEY = os.environ.get("SINGLE_BIKE_DATA")
+TRAINING_DATA_FORMAT = os.environ.get("TRAINING_DATA_FORMAT", "csv")
+TRAINING_DATA_COMPRESSION = os.environ.get("TRAINING_DATA_COMPRESSION", "snappy")
 
-S3_CLIENT = boto3.client("s3")
-S3_RESOURCE = boto3.resource("s3")
 CURRENT_DATE = datetime.now().strftime("%Y-%m-%d")
 
 s3_handler = S3Handler()
@@ -27,7 +25,7 @@ def lambda_handler(event, context):
     try:
         logger.info("Getting data from S3")
         station_bikes_data = s3_handler.get_data_from_s3(
-            SOURCE_BUCKET, STATION_BIKE_DATA_KEY
+            SOURCE_BUCKET, STATION_BIKE_DATA_KEY, dataset="StationaryStations"
         )
         # single_bikes_data = s3_handler.get_data_from_s3(
         #     SOURCE_BUCKET, SINGLE_BIKE_DATA_KEY
@@ -107,10 +105,12 @@ def split_dataset_into_train_and_test_sets(
 
 def save_results(df: pd.DataFrame, date_sub_folder: str, sub_path: str, filename: str):
     s3_handler.save_dataframe_to_s3(
-        data=df,
+        df=df,
         bucket_name=DESTINATION_BUCKET,
         path_name="training",
         sub_path=sub_path,
         current_date=date_sub_folder,
         filename=filename,
+        file_format=TRAINING_DATA_FORMAT,
+        compression=TRAINING_DATA_COMPRESSION,
     )
@@ -1,48 +1,47 @@
 import os
-import http.client
-import urllib.parse
-import boto3
 import json
-import csv
-from io import StringIO
 from typing import Any, Dict
 import datetime as dt
 
-from bike_data_scraper.s3_client.s3_handler import S3Handler
+from bike_data_scraper.concurrent_fetch import ConcurrentFetcher
+from bike_data_scraper.csv_client.weather_encoder import WeatherEncoder
+from bike_data_scraper.open_meteo import fetch_missing_weather
+from bike_data_scraper.s3_client.s3_handler import CSV_FORMAT, S3Handler
+from bike_data_scraper.s3_client.weather_store import WeatherDayStore
 
-# Define constants
-API_ENDPOINT = "api.open-meteo.com"
-PATH = "/v1/forecast"
 s3_handler = S3Handler()
 bucket_name = os.environ["S3_BUCKET_NAME"]
+weather_file_format = os.environ.get("WEATHER_FILE_FORMAT", CSV_FORMAT)
+weather_store_prefix = os.environ.get("WEATHER_STORE_PREFIX", "weather")
+# Every point is fetched concurrently and saved under its own name
+weather_points = json.loads(
+    os.environ.get(
+        "WEATHER_POINTS", '[{"name": "default", "latitude": 52.52, "longitude": 13.41}]'
+    )
+)
+fetcher = ConcurrentFetcher()
+weather_encoder = WeatherEncoder()
+weather_store = WeatherDayStore(
+    s3_handler,
+    bucket_name,
+    weather_store_prefix,
+    file_format=weather_file_format,
+    encoder=weather_encoder,
+)
 
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     start_date, end_date = calculate_dates()
-    params = {
-        "latitude": 52.52,
-        "longitude": 13.41,
-        "start_date": start_date.strftime("%Y-%m-%d"),
-        "end_date": end_date.strftime("%Y-%m-%d"),
-        "hourly": "temperature_2m,relativehumidity_2m,windspeed_10m,precipitation,visibility,snowfall",
-    }
-    params_str = urllib.parse.urlencode(params)
-    url = f"{PATH}?{params_str}"
-
-    weather_data = fetch_weather_data(url, API_ENDPOINT)
 
-    if weather_data is None:
-        raise Exception("Weather data could not be fetched from API!")
-
-    csv_str = convert_to_csv(weather_data)
-    response = S3Handler().save_data_as_string_to_csv(
-        csv_str=csv_str, end_date=end_date.strftime("%Y-%m-%d"), bucket_name=bucket_name
+    # Only the days the store doesn't have complete yet are asked for
+    written = fetch_missing_weather(
+        weather_store, fetcher, weather_points, start_date, end_date, today=end_date
     )
 
     return {
         "statusCode": 200,
         "body": "Weather data saved successfully!",
-        "s3_info": response,
+        "s3_info": {"weather_bucket_name": bucket_name, "written": written},
     }
 
 
@@ -61,48 +60,5 @@ def calculate_dates():
     return start_date, end_date
 
 
-def fetch_weather_data(url: str, api_endpoint: str) -> dict:
-    conn = http.client.HTTPSConnection(api_endpoint)
-    conn.request("GET", url)
-    response = conn.getresponse()
-
-    if response.status == 200:
-        try:
-            response_data = response.read()
-            print(f"Response data: {response_data}")
-            weather_data = json.loads(response_data)
-            return weather_data
-        finally:
-            conn.close()
-    else:
-        try:
-            error_message = response.read().decode()
-            print(f"Failed to retrieve weather data: {error_message}")
-            raise Exception(f"Failed to retrieve weather data: {error_message}")
-        finally:
-            conn.close()
-
-
 def convert_to_csv(weather_data: dict) -> str:
-    hourly_data = weather_data["hourly"]
-    fieldnames = [
-        "time",
-        "temperature_2m",
-        "relativehumidity_2m",
-        "windspeed_10m",
-        "precipitation",
-        "visibility",
-        "snowfall",
-    ]
-    csv_data = []
-    for i in range(len(hourly_data["time"])):
-        row = {field: hourly_data[field][i] for field in fieldnames}
-        csv_data.append(row)
-
-    csv_buffer = StringIO()
-    writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in csv_data:
-        writer.writerow(row)
-
-    return csv_buffer.getvalue()
+    return weather_encoder.to_csv(weather_data)
@@ -1,16 +1,135 @@
-import requests
-
-
-class HttpClient:
-    def __init__(self):
-        pass
-
-    @staticmethod
-    def get_data(url: str) -> dict | None:
-        response = requests.get(url)
-        json = response.json()
-        return json
-
-
-def test_http_client():
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
+
+HTTP_CONNECT_TIMEOUT_SECONDS = 3.05
+HTTP_READ_TIMEOUT_SECONDS = 10
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUS_CODES = (500, 502, 503, 504)
+HTTP_POOL_SIZE = 4
+
+_session = None
+
+
+def build_session(
+    max_retries: int = HTTP_MAX_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+) -> requests.Session:
+    """A pooled session that retries GETs on 5xx, connection errors and timeouts.
+
+    Retries back off exponentially (backoff_factor * 2 ** attempt seconds)
+    and honour Retry-After.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        status_forcelist=HTTP_RETRY_STATUS_CODES,
+        allowed_methods=["GET"],
+        backoff_factor=backoff_factor,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+    )
+    return session
+
+
+def get_session() -> requests.Session:
+    """The module's session, kept across warm Lambda invocations."""
+    global _session
+    if _session is None:
+        _session = build_session()
+    return _session
+
+
+class HttpClient:
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        timeout: tuple = (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS),
+    ):
+        self.session = session
+        self.timeout = timeout
+        # url -> (ETag, payload) of the last full response
+        self._cached = {}
+        self.metrics = {}
+
+    def get_data(self, url: str) -> dict | None:
+        """GETs a JSON payload, or None when the request finally fails.
+
+        The ETag of every response is kept, and the next request for the
+        same url is made conditional on it; a 304 returns the cached payload.
+        Latency, status, sizes and retries of the request end up in
+        self.metrics.
+        """
+        session = self.session or get_session()
+        headers = {}
+        if url in self._cached:
+            headers["If-None-Match"] = self._cached[url][0]
+
+        started = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error(f"Request to {url} failed: {e}")
+            self.metrics = {
+                "status": None,
+                "latency_ms": self._elapsed_ms(started),
+                "error": type(e).__name__,
+            }
+            return None
+
+        self.metrics = {
+            "status": response.status_code,
+            "latency_ms": self._elapsed_ms(started),
+            "bytes": len(response.content),
+            "wire_bytes": int(
+                response.headers.get("Content-Length", len(response.content))
+            ),
+            "content_encoding": response.headers.get("Content-Encoding"),
+            "retries": self._retries(response),
+            "not_modified": response.status_code == 304,
+        }
+        logger.info(f"GET {url}: {self.metrics}")
+
+        if response.status_code == 304 and url in self._cached:
+            return self._cached[url][1]
+        if not response.ok:
+            logger.error(f"Request to {url} failed with {response.status_code}")
+            return None
+
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._cached[url] = (etag, payload)
+        else:
+            self._cached.pop(url, None)
+        return payload
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 2)
+
+    @staticmethod
+    def _retries(response: requests.Response) -> int:
+        retries = getattr(response.raw, "retries", None)
+        return len(retries.history) if retries is not None else 0
+
+
+def test_http_client():
     print("")
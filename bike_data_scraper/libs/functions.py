@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -5,8 +6,36 @@ def get_min_and_max_dates_from_dataframe(df: pd.DataFrame) -> dict:
     if pd.api.types.is_datetime64_any_dtype(df["timestamp"]) == False:
         df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
 
-    df = df.dropna(subset=["timestamp"])
-
+    # min and max skip NaT, no need to copy the frame without them
     min_date = df["timestamp"].min().strftime("%Y-%m-%d")
     max_date = df["timestamp"].max().strftime("%Y-%m-%d")
     return {"min_date": min_date, "max_date": max_date}
+
+
+def count_list_items(values: pd.Series) -> pd.Series:
+    """Counts the items of stringified lists such as "['BIKE1', 'BIKE2']".
+
+    The column is scanned as one byte buffer instead of parsing every row:
+    a row holds commas + 1 items, or none when there is nothing between its
+    brackets. Missing values count as empty lists.
+    """
+    text = values.fillna("[]").astype(str)
+    if text.empty:
+        return pd.Series([], index=values.index, dtype="int64")
+
+    buffer = np.frombuffer("\n".join(text).encode(), dtype=np.uint8)
+    separators = np.flatnonzero(buffer == ord("\n"))
+    if len(separators) != len(text) - 1:
+        raise ValueError("List values must not contain line breaks")
+
+    starts = np.concatenate(([0], separators + 1))
+    ends = np.append(separators, len(buffer))
+
+    def count_per_row(positions: np.ndarray) -> np.ndarray:
+        return np.searchsorted(positions, ends) - np.searchsorted(positions, starts)
+
+    counts = count_per_row(np.flatnonzero(buffer == ord(","))) + 1
+    # Without a comma a row holds one item or none; only those rows need a look
+    single = counts == 1
+    counts[single] = text[single].str.strip("[] ").str.len().to_numpy() > 0
+    return pd.Series(counts, index=values.index, dtype="int64")
@@ -0,0 +1,40 @@
+import importlib
+
+
+class LazyAttribute:
+    """Stands in for `module.attribute`, importing the module on first use.
+
+    Lets handlers keep module-level names such as `logger` or `pd` without
+    paying for the import on a cold start that never uses them. Without an
+    attribute it stands in for the module itself. Annotations that name a
+    lazy module need `from __future__ import annotations`, or they import it
+    when the function is defined.
+    """
+
+    def __init__(self, module_name: str, attribute: str | None = None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            module = importlib.import_module(self._module_name)
+            self._target = (
+                module if self._attribute is None else getattr(module, self._attribute)
+            )
+        return self._target
+
+    def __getattr__(self, name: str):
+        # Only reached for names the proxy itself doesn't have
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+
+def lazy_attribute(module_name: str, attribute: str) -> LazyAttribute:
+    return LazyAttribute(module_name, attribute)
+
+
+def lazy_module(module_name: str) -> LazyAttribute:
+    return LazyAttribute(module_name)
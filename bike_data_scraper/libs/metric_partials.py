@@ -0,0 +1,414 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.metrics_engine import (
+    CORRELATION_COLUMNS,
+    HOURLY_MEAN_COLUMNS,
+    HOURLY_SUM_COLUMNS,
+    METRICS,
+)
+from bike_data_scraper.libs.weather_join import hour_keys
+
+
+class MetricPartial:
+    """Mergeable aggregates of the graph metrics over a span of days.
+
+    A partial keeps what the metrics need instead of the rows: the station
+    ids, the busiest timestamp, the temperature extremes with their
+    timestamps, weekend sums and counts, per hour sums and counts, and the
+    counts, means, centered sums of squares and cross-products of the
+    correlation columns. Merging two partials is exact, so the metrics of
+    two weeks are the merge of fourteen daily partials. The moments are
+    merged with the pairwise update of Chan et al., which stays accurate
+    where raw sums of squares would cancel out.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MetricPartial":
+        timestamps = df["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, format="ISO8601")
+
+        return cls(
+            {
+                "rows": len(df),
+                "stations": sorted(df["stationId"].dropna().astype(str).unique()),
+                "busiest": cls._busiest(timestamps),
+                "temperature": cls._temperature_extremes(df, timestamps),
+                "weekend": cls._weekend(df),
+                "hourly": cls._hourly(df, timestamps),
+                "correlation": cls._correlation(df),
+            }
+        )
+
+    @staticmethod
+    def _timestamp(value: pd.Timestamp) -> dict:
+        return {"ns": int(value.value), "text": f"{value}"}
+
+    @classmethod
+    def _busiest(cls, timestamps: pd.Series) -> dict | None:
+        counts = timestamps.value_counts(sort=False)
+        if counts.empty:
+            return None
+        top = counts.max()
+        busiest = counts.index[counts.to_numpy() == top].min()
+        return {**cls._timestamp(busiest), "count": int(top)}
+
+    @classmethod
+    def _temperature_extremes(cls, df: pd.DataFrame, timestamps: pd.Series):
+        temperatures = df["Temperature"].to_numpy(dtype=np.float64)
+        if np.isnan(temperatures).all():
+            return None
+        extremes = {}
+        for name, position in [
+            ("min", int(np.nanargmin(temperatures))),
+            ("max", int(np.nanargmax(temperatures))),
+        ]:
+            extremes[name] = {
+                "value": float(temperatures[position]),
+                # Formatted in the column's own dtype, as the metric reports it
+                "text": f"{df['Temperature'].iloc[position]}",
+                "timestamp": cls._timestamp(timestamps.iloc[position]),
+            }
+        return extremes
+
+    @staticmethod
+    def _weekend(df: pd.DataFrame) -> dict:
+        weekend = df["IsWeekend"].to_numpy(dtype=np.float64)
+        bikes = df["AvailableBikes"].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(weekend) & ~np.isnan(bikes)
+        groups = weekend[valid].astype(np.int64)
+        return {
+            "sums": np.bincount(groups, weights=bikes[valid], minlength=2).tolist(),
+            "counts": np.bincount(groups, minlength=2).tolist(),
+        }
+
+    @staticmethod
+    def _hourly(df: pd.DataFrame, timestamps: pd.Series) -> dict | None:
+        rows = timestamps.notna().to_numpy()
+        if not rows.any():
+            return None
+        keys = hour_keys(timestamps)[rows]
+        first_hour = int(keys.min())
+        buckets = keys - first_hour
+        hours = int(buckets.max()) + 1
+
+        hourly = {
+            "first_hour": first_hour,
+            "sums": {},
+            "counts": {},
+            "integer_sums": [
+                column for column in HOURLY_SUM_COLUMNS if df[column].dtype.kind in "iu"
+            ],
+        }
+        for column in HOURLY_MEAN_COLUMNS + HOURLY_SUM_COLUMNS:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+            valid = ~np.isnan(values)
+            hourly["sums"][column] = np.bincount(
+                buckets[valid], weights=values[valid], minlength=hours
+            ).tolist()
+            if column in HOURLY_MEAN_COLUMNS:
+                hourly["counts"][column] = np.bincount(
+                    buckets[valid], minlength=hours
+                ).tolist()
+        return hourly
+
+    @staticmethod
+    def _correlation(df: pd.DataFrame) -> dict:
+        """Pairwise complete moments, the same observations pandas' corr uses.
+
+        Entry [i, j] of every matrix only covers the rows where both column i
+        and column j are set: `counts` is their number, `means` and `squares`
+        the mean and centered sum of squares of column i over them, and
+        `comoments` the centered cross-product of i and j. Columns are
+        shifted by their mean first so the raw sums don't cancel out.
+        """
+        values = df[CORRELATION_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        # Column means, 0 for columns without any value
+        totals = np.where(present, values, 0.0).sum(axis=0)
+        shifts = totals / np.maximum(present.sum(axis=0), 1)
+        shifted = np.where(present, values - shifts, 0.0)
+        weights = present.astype(np.float64)
+
+        counts = weights.T @ weights
+        sums = shifted.T @ weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(counts > 0, sums / counts, 0.0)
+        squares = (shifted**2).T @ weights - means * sums
+        comoments = shifted.T @ shifted - means * sums.T
+        return {
+            "counts": counts.tolist(),
+            "means": (means + shifts[:, None]).tolist(),
+            "squares": squares.tolist(),
+            "comoments": comoments.tolist(),
+        }
+
+    def merge(self, other: "MetricPartial") -> "MetricPartial":
+        a, b = self.data, other.data
+        return MetricPartial(
+            {
+                "rows": a["rows"] + b["rows"],
+                "stations": sorted(set(a["stations"]) | set(b["stations"])),
+                "busiest": self._merge_busiest(a["busiest"], b["busiest"]),
+                "temperature": self._merge_temperatures(
+                    a["temperature"], b["temperature"]
+                ),
+                "weekend": {
+                    key: np.add(a["weekend"][key], b["weekend"][key]).tolist()
+                    for key in ["sums", "counts"]
+                },
+                "hourly": self._merge_hourly(a["hourly"], b["hourly"]),
+                "correlation": self._merge_correlation(
+                    a["correlation"], b["correlation"]
+                ),
+            }
+        )
+
+    @staticmethod
+    def _merge_busiest(a: dict | None, b: dict | None) -> dict | None:
+        candidates = [busiest for busiest in [a, b] if busiest is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda busiest: (-busiest["count"], busiest["ns"]))
+
+    @staticmethod
+    def _merge_temperatures(a: dict | None, b: dict | None) -> dict | None:
+        if a is None or b is None:
+            return a or b
+
+        def earliest(extreme):
+            return extreme["timestamp"]["ns"]
+
+        return {
+            "min": min(a["min"], b["min"], key=lambda e: (e["value"], earliest(e))),
+            "max": min(a["max"], b["max"], key=lambda e: (-e["value"], earliest(e))),
+        }
+
+    @staticmethod
+    def _merge_hourly(a: dict | None, b: dict | None) -> dict | None:
+        if a is None or b is None:
+            return a or b
+
+        first_hour = min(a["first_hour"], b["first_hour"])
+        hours = (
+            max(
+                a["first_hour"] + len(a["sums"][HOURLY_SUM_COLUMNS[0]]),
+                b["first_hour"] + len(b["sums"][HOURLY_SUM_COLUMNS[0]]),
+            )
+            - first_hour
+        )
+
+        def combine(left: list, left_first: int, right: list, right_first: int):
+            combined = np.zeros(hours)
+            combined[left_first - first_hour :][: len(left)] += left
+            combined[right_first - first_hour :][: len(right)] += right
+            return combined.tolist()
+
+        merged = {
+            "first_hour": first_hour,
+            "sums": {},
+            "counts": {},
+            "integer_sums": sorted(set(a["integer_sums"]) & set(b["integer_sums"])),
+        }
+        for key in ["sums", "counts"]:
+            for column in a[key]:
+                merged[key][column] = combine(
+                    a[key][column], a["first_hour"], b[key][column], b["first_hour"]
+                )
+        return merged
+
+    @staticmethod
+    def _merge_correlation(a: dict, b: dict) -> dict:
+        # Chan et al.'s pairwise update, entry by entry
+        count_a, count_b = np.array(a["counts"]), np.array(b["counts"])
+        means_a, means_b = np.array(a["means"]), np.array(b["means"])
+        counts = count_a + count_b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(
+                counts > 0, (means_a * count_a + means_b * count_b) / counts, 0.0
+            )
+            weight = np.where(counts > 0, count_a * count_b / counts, 0.0)
+        delta = means_b - means_a
+        return {
+            "counts": counts.tolist(),
+            "means": means.tolist(),
+            "squares": (
+                np.add(a["squares"], b["squares"]) + delta**2 * weight
+            ).tolist(),
+            "comoments": (
+                np.add(a["comoments"], b["comoments"]) + delta * delta.T * weight
+            ).tolist(),
+        }
+
+    def metrics(self, metrics: tuple = METRICS) -> dict:
+        """Builds the MetricsEngine results out of the merged aggregates."""
+        logger.info(f"Building {len(metrics)} metrics from partial aggregates")
+        data = self.data
+        temperature = data["temperature"]
+
+        def extreme(name: str, *path: str) -> str | None:
+            # A window without temperature readings has no extremes
+            if temperature is None:
+                return None
+            value = temperature[name]
+            for key in path:
+                value = value[key]
+            return value
+
+        builders = {
+            "number_of_bikes_available": lambda: f"{len(data['stations'])}",
+            "warmest_temperature": lambda: extreme("max", "text"),
+            "coldest_temperature": lambda: extreme("min", "text"),
+            "coldest_day": lambda: extreme("min", "timestamp", "text"),
+            "warmest_day": lambda: extreme("max", "timestamp", "text"),
+            "day_with_most_used_bikes": lambda: data["busiest"]["text"],
+            "correlation_matrix": self._correlation_matrix,
+            "weekend_vs_weekday": self._weekend_vs_weekday,
+            "weather_over_timestamp": self._weather_over_timestamp,
+        }
+        return {metric: builders[metric]() for metric in metrics}
+
+    def _correlation_matrix(self) -> pd.DataFrame:
+        correlation = self.data["correlation"]
+        squares = np.array(correlation["squares"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.array(correlation["comoments"]) / np.sqrt(squares * squares.T)
+        matrix = np.clip(matrix, -1, 1)
+        # A column correlates perfectly with itself, whatever the rounding says
+        diagonal = np.diag_indices_from(matrix)
+        matrix[diagonal] = np.where(np.isnan(matrix[diagonal]), np.nan, 1.0)
+        return pd.DataFrame(
+            matrix, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS
+        )
+
+    def _weekend_vs_weekday(self) -> pd.DataFrame:
+        sums = np.array(self.data["weekend"]["sums"])
+        counts = np.array(self.data["weekend"]["counts"])
+        present = np.flatnonzero(counts)
+        return pd.DataFrame(
+            {
+                "IsWeekend": np.array(["Weekdays", "Weekend"])[present],
+                "AvailableBikes": sums[present] / counts[present],
+            }
+        )
+
+    def _weather_over_timestamp(self) -> pd.DataFrame:
+        hourly = self.data["hourly"]
+        hours = len(hourly["sums"][HOURLY_SUM_COLUMNS[0]])
+        result = {
+            "timestamp": (hourly["first_hour"] + np.arange(hours))
+            .astype("datetime64[h]")
+            .astype("datetime64[ns]")
+        }
+        for column in HOURLY_MEAN_COLUMNS:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result[column] = np.divide(
+                    hourly["sums"][column], hourly["counts"][column]
+                )
+        for column in HOURLY_SUM_COLUMNS:
+            sums = np.array(hourly["sums"][column])
+            if column in hourly["integer_sums"]:
+                sums = sums.astype(np.int64)
+            result[column] = sums
+        return pd.DataFrame(result)
+
+
+class MetricPartialStore:
+    """The daily MetricPartials of a dataset, cached in one JSON manifest.
+
+    The manifest at `{prefix}/{sub_path}/manifest.json` maps every cached
+    day to its partial and to the key of the rows it was built from, so a
+    run reads all of them with a single GET.
+    """
+
+    def __init__(self, s3_handler, bucket_name: str, prefix: str):
+        self.s3_handler = s3_handler
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+
+    def _key(self, sub_path: str) -> str:
+        return f"{self.prefix}/{sub_path}/manifest.json"
+
+    def load(self, sub_path: str) -> dict:
+        """Day -> {"key": ..., "partial": ...} of every cached day."""
+        data = self.s3_handler.get_json_from_s3(self.bucket_name, self._key(sub_path))
+        return {} if data is None else data["days"]
+
+    def save(self, sub_path: str, days: dict):
+        self.s3_handler.put_json_to_s3(
+            {"days": days}, self.bucket_name, self._key(sub_path)
+        )
+
+
+def day_keys(df: pd.DataFrame, day_starts: pd.Series) -> dict:
+    """Row count, first and last timestamp and column sums of every day.
+
+    Two grouped passes over the frame, and a rewritten day (a backfill or
+    a reprocessing) changes at least one of them: rows come or go, or
+    values such as a backfilled temperature change in place.
+    """
+    grouped = df.groupby(day_starts, sort=True)
+    spans = grouped["timestamp"].agg(["size", "min", "max"])
+    numeric = [
+        column
+        for column in df.columns
+        if column != "timestamp" and pd.api.types.is_numeric_dtype(df[column])
+    ]
+    sums = grouped[numeric].sum().astype(np.float64)
+    return {
+        f"{day_start:%Y-%m-%d}": {
+            "rows": int(span["size"]),
+            "first": int(span["min"].value),
+            "last": int(span["max"].value),
+            "sums": dict(zip(numeric, sums.loc[day_start].tolist())),
+        }
+        for day_start, span in spans.iterrows()
+    }
+
+
+def incremental_metrics(
+    df: pd.DataFrame, sub_path: str, store: MetricPartialStore
+) -> dict:
+    """Metrics of `df` from cached daily partials plus the days not seen yet.
+
+    Days without a cached partial under the same key are aggregated from
+    their rows. Their partials are cached, except for the latest day of the
+    frame, which may still be filling up and is always recomputed. The
+    manifest only keeps the days of the frame and is only written when one
+    of them changed.
+    """
+    timestamps = df["timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, format="ISO8601")
+        df = df.assign(timestamp=timestamps)
+    day_starts = timestamps.dt.normalize()
+    keys = day_keys(df, day_starts)
+    latest = max(keys)
+
+    cached = store.load(sub_path)
+    days = {}
+    merged = None
+    computed = 0
+    for day, key in keys.items():
+        entry = cached.get(day)
+        if day != latest and entry is not None and entry["key"] == key:
+            partial = MetricPartial(entry["partial"])
+        else:
+            partial = MetricPartial.from_frame(df[day_starts == pd.Timestamp(day)])
+            computed += 1
+        if day != latest:
+            days[day] = {"key": key, "partial": partial.data}
+        merged = partial if merged is None else merged.merge(partial)
+
+    if days != cached:
+        store.save(sub_path, days)
+    logger.info(
+        f"Computed {computed} of {len(keys)} days of {sub_path} from rows, "
+        f"the rest came from cached partials"
+    )
+    return merged.metrics()
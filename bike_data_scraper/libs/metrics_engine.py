@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.weather_join import hour_keys
+
+CORRELATION_COLUMNS = [
+    "AvailableBikes",
+    "Distance",
+    "Long",
+    "Lat",
+    "Year",
+    "Month",
+    "Day",
+    "Hour",
+    "Temperature",
+    "Humidity",
+    "Wind_Speed",
+    "Precipitation",
+    "Visibility",
+    "Snowfall",
+    "IsWeekend",
+]
+HOURLY_MEAN_COLUMNS = ["Humidity", "Wind_Speed", "Temperature"]
+HOURLY_SUM_COLUMNS = ["TotalAvailableBikes"]
+
+METRICS = (
+    "number_of_bikes_available",
+    "warmest_temperature",
+    "coldest_temperature",
+    "coldest_day",
+    "warmest_day",
+    "day_with_most_used_bikes",
+    "correlation_matrix",
+    "weekend_vs_weekday",
+    "weather_over_timestamp",
+)
+
+
+class MetricsEngine:
+    """Computes the graph metrics of a bikes dataset in as few passes as possible.
+
+    Intermediate results are computed at most once per frame and shared by
+    every metric that needs them: the temperature extremes serve the four
+    temperature metrics, and the hour bucket index serves the hourly weather
+    series. Results have the same shape and formatting as the original per
+    metric functions, except that ties for the busiest timestamp go to the
+    earliest one.
+    """
+
+    def __init__(self, metrics: tuple = METRICS):
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        self.metrics = metrics
+
+    def compute(self, df: pd.DataFrame) -> dict:
+        logger.info(f"Calculating {len(self.metrics)} metrics for dataset")
+        shared = {}
+        results = {}
+        for metric in self.metrics:
+            try:
+                results[metric] = getattr(self, f"_{metric}")(df, shared)
+            except Exception as e:
+                logger.error(f"Error calculating {metric}: {e}")
+                raise e
+        logger.info("Finished calculating metrics for dataset")
+        return results
+
+    @staticmethod
+    def _share(shared: dict, name: str, compute):
+        if name not in shared:
+            shared[name] = compute()
+        return shared[name]
+
+    def _timestamps(self, df: pd.DataFrame, shared: dict) -> pd.Series:
+        def parse():
+            timestamps = df["timestamp"]
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps, format="ISO8601")
+            return timestamps
+
+        return self._share(shared, "timestamps", parse)
+
+    def _temperature_extremes(self, df: pd.DataFrame, shared: dict) -> dict:
+        def scan():
+            temperatures = df["Temperature"].to_numpy(dtype=np.float64)
+            coldest = int(np.nanargmin(temperatures))
+            warmest = int(np.nanargmax(temperatures))
+            return {
+                "coldest": coldest,
+                "warmest": warmest,
+                "min": df["Temperature"].iloc[coldest],
+                "max": df["Temperature"].iloc[warmest],
+            }
+
+        return self._share(shared, "temperature_extremes", scan)
+
+    def _hour_buckets(self, df: pd.DataFrame, shared: dict) -> tuple:
+        def index():
+            rows = self._timestamps(df, shared).notna().to_numpy()
+            keys = hour_keys(self._timestamps(df, shared))[rows]
+            first_hour = keys.min()
+            hours = int(keys.max() - first_hour) + 1
+            return rows, keys - first_hour, int(first_hour), hours
+
+        return self._share(shared, "hour_buckets", index)
+
+    def _number_of_bikes_available(self, df: pd.DataFrame, shared: dict) -> str:
+        return f"{df['stationId'].nunique()}"
+
+    def _warmest_temperature(self, df: pd.DataFrame, shared: dict) -> str:
+        return f"{self._temperature_extremes(df, shared)['max']}"
+
+    def _coldest_temperature(self, df: pd.DataFrame, shared: dict) -> str:
+        return f"{self._temperature_extremes(df, shared)['min']}"
+
+    def _coldest_day(self, df: pd.DataFrame, shared: dict) -> str:
+        position = self._temperature_extremes(df, shared)["coldest"]
+        return f"{self._timestamps(df, shared).iloc[position]}"
+
+    def _warmest_day(self, df: pd.DataFrame, shared: dict) -> str:
+        position = self._temperature_extremes(df, shared)["warmest"]
+        return f"{self._timestamps(df, shared).iloc[position]}"
+
+    def _day_with_most_used_bikes(self, df: pd.DataFrame, shared: dict) -> str:
+        counts = self._timestamps(df, shared).value_counts(sort=False)
+        return f"{counts.index[counts.to_numpy() == counts.max()].min()}"
+
+    def _correlation_matrix(self, df: pd.DataFrame, shared: dict) -> pd.DataFrame:
+        columns = df[CORRELATION_COLUMNS]
+        values = columns.to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(values).any():
+            # Pairwise complete observations need pandas' per pair masking
+            return columns.corr()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.corrcoef(values, rowvar=False)
+        return pd.DataFrame(
+            matrix, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS
+        )
+
+    def _weekend_vs_weekday(self, df: pd.DataFrame, shared: dict) -> pd.DataFrame:
+        weekend = df["IsWeekend"].to_numpy(dtype=np.float64)
+        bikes = df["AvailableBikes"].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(weekend) & ~np.isnan(bikes)
+        groups = weekend[valid].astype(np.int64)
+
+        sums = np.bincount(groups, weights=bikes[valid], minlength=2)
+        counts = np.bincount(groups, minlength=2)
+        present = np.flatnonzero(counts)
+        return pd.DataFrame(
+            {
+                "IsWeekend": np.array(["Weekdays", "Weekend"])[present],
+                "AvailableBikes": sums[present] / counts[present],
+            }
+        )
+
+    def _weather_over_timestamp(self, df: pd.DataFrame, shared: dict) -> pd.DataFrame:
+        rows, buckets, first_hour, hours = self._hour_buckets(df, shared)
+        hourly = {"timestamp": (first_hour + np.arange(hours)).astype("datetime64[h]")}
+
+        for column in HOURLY_MEAN_COLUMNS + HOURLY_SUM_COLUMNS:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+            valid = ~np.isnan(values)
+            sums = np.bincount(buckets[valid], weights=values[valid], minlength=hours)
+            if column in HOURLY_SUM_COLUMNS:
+                if df[column].dtype.kind in "iu":
+                    sums = sums.astype(np.int64)
+                hourly[column] = sums
+                continue
+            counts = np.bincount(buckets[valid], minlength=hours)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                hourly[column] = sums / counts
+
+        grouped_df = pd.DataFrame(hourly)
+        grouped_df["timestamp"] = grouped_df["timestamp"].astype("datetime64[ns]")
+        return grouped_df
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+
+def train_test_split(*arrays, test_size: float = 0.25, random_state=None):
+    """Shuffles the rows of every array the same way and splits them in two.
+
+    A NumPy-only stand-in for sklearn.model_selection.train_test_split, so
+    the Lambda doesn't load scikit-learn for a permutation. It draws the same
+    permutation as sklearn's ShuffleSplit, so an int `random_state` gives
+    the same split. Frames and series are split with iloc and keep their
+    index. Returns train and test of every array in turn.
+    """
+    if not arrays:
+        raise ValueError("At least one array is required")
+    n_samples = len(arrays[0])
+    if any(len(array) != n_samples for array in arrays):
+        raise ValueError("All arrays must have the same number of rows")
+
+    n_test = (
+        math.ceil(test_size * n_samples) if isinstance(test_size, float) else test_size
+    )
+    n_train = n_samples - n_test
+    if n_test <= 0 or n_train <= 0:
+        raise ValueError(
+            f"test_size={test_size} leaves an empty split of {n_samples} rows"
+        )
+
+    rng = (
+        random_state
+        if isinstance(random_state, np.random.RandomState)
+        else np.random.RandomState(random_state)
+    )
+    permutation = rng.permutation(n_samples)
+    test = permutation[:n_test]
+    train = permutation[n_test : n_test + n_train]
+
+    splits = []
+    for array in arrays:
+        splits.extend((_take_rows(array, train), _take_rows(array, test)))
+    return splits
+
+
+def _take_rows(array, positions: np.ndarray):
+    if hasattr(array, "iloc"):
+        return array.iloc[positions]
+    return np.asarray(array)[positions]
@@ -0,0 +1,210 @@
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.functions import (
+    count_list_items,
+    get_min_and_max_dates_from_dataframe,
+)
+from bike_data_scraper.libs.time_features import derive_time_features
+from bike_data_scraper.libs.timing import stage_timer
+from bike_data_scraper.libs.weather_join import join_hourly_weather
+
+SINGLE_BIKE_PREFIX = "BIKE"
+
+
+class PreprocessingStage:
+    """A named step of the pipeline.
+
+    `run` gets the frames by name ("weather", "bikes", and "df" once they
+    are joined) and updates the dict, changing frames in place wherever
+    pandas allows it.
+    """
+
+    def __init__(self, name: str, run: Callable[[dict], None]):
+        self.name = name
+        self.run = run
+
+
+def convert_time_to_more_features(
+    weather_data: pd.DataFrame, bikes_data: pd.DataFrame
+) -> tuple:
+    logger.info("Converting time to more features")
+
+    data_frames = {"weather": weather_data, "bikes": bikes_data}
+    df_dict = {}
+
+    for name, df in data_frames.items():
+        logger.info(f"Processing {name} data")
+
+        if df is None:
+            logger.warning(f"{name} Data is empty.")
+            continue
+
+        if "Time" in df.columns and "timestamp" not in df.columns:
+            df.rename(columns={"Time": "timestamp"}, inplace=True)
+
+        df_dict[name] = derive_time_features(df)
+
+    return tuple(df_dict.values())
+
+
+def merge_both_datasets(data_dict: dict) -> pd.DataFrame:
+    logger.info("Joining the weather of each hour onto the bikes dataset")
+    return join_hourly_weather(data_dict["bikes"], data_dict["weather"])
+
+
+def drop_incomplete_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Drops rows with any NaN, without copying a frame that has none.
+
+    The export writes every station column, so a column no sample has a
+    value for is empty throughout. Such columns are dropped instead.
+    """
+    present = df.notna().to_numpy()
+    empty_columns = ~present.any(axis=0)
+    if empty_columns.any() and len(df):
+        logger.info(f"Dropping empty columns {df.columns[empty_columns].tolist()}")
+        df = df.take(np.flatnonzero(~empty_columns), axis=1)
+        present = present[:, ~empty_columns]
+    complete = present.all(axis=1)
+    if complete.all():
+        return df
+    logger.info(f"Dropping {(~complete).sum()} rows with missing values")
+    # take() gives a frame of its own, so later stages can add columns to it
+    return df.take(np.flatnonzero(complete))
+
+
+def derive_weekend_feature(df: pd.DataFrame) -> pd.DataFrame:
+    logger.info("Deriving weekend feature")
+    if "timestamp" in df.columns:
+        return derive_time_features(df, features=("IsWeekend",))
+
+    logger.warning(
+        "There is no timestamp column in the DataFrame, so we can't derive the weekend feature"
+    )
+    return df
+
+
+def add_total_available_bikes_column(df: pd.DataFrame) -> pd.DataFrame:
+    if "BikeCount" in df.columns:
+        # Typed exports carry the count, older ones only the list of IDs
+        counts = df.pop("BikeCount")
+        if counts.isna().any():
+            if "BikeIds" in df.columns:
+                counts = counts.fillna(count_list_items(df["BikeIds"]))
+            counts = counts.fillna(0)
+        df["TotalAvailableBikes"] = counts.astype("int64")
+        logger.info("Added new column: TotalAvailableBikes")
+    elif "BikeIds" in df.columns:
+        df["TotalAvailableBikes"] = count_list_items(df["BikeIds"])
+        logger.info("Added new column: TotalAvailableBikes")
+    else:
+        logger.warning(
+            "The DataFrame doesn't have a 'BikeIds' column. Skipping this step."
+        )
+    return df
+
+
+def _time_features(frames: dict):
+    frames["weather"], frames["bikes"] = convert_time_to_more_features(
+        frames["weather"], frames["bikes"]
+    )
+
+
+def _join_weather(frames: dict):
+    frames["df"] = merge_both_datasets(frames)
+    # The joined frame is the bikes frame, grown by the weather columns
+    del frames["bikes"], frames["weather"]
+
+
+def _drop_incomplete_rows(frames: dict):
+    frames["df"] = drop_incomplete_rows(frames["df"])
+
+
+def _total_available_bikes(frames: dict):
+    frames["df"] = add_total_available_bikes_column(frames["df"])
+
+
+def _weekend(frames: dict):
+    frames["df"] = derive_weekend_feature(frames["df"])
+
+
+PREPROCESSING_STAGES = (
+    PreprocessingStage("time_features", _time_features),
+    PreprocessingStage("join_weather", _join_weather),
+    PreprocessingStage("drop_incomplete_rows", _drop_incomplete_rows),
+    PreprocessingStage("total_available_bikes", _total_available_bikes),
+    PreprocessingStage("weekend", _weekend),
+)
+
+
+class PreprocessingPipeline:
+    """Turns raw weather and bikes into the processed bikes dataset.
+
+    The Lambdas, the backfill and the SageMaker scripts all run this, so a
+    change to a stage lands everywhere. The input frames are reused rather
+    than copied; pass copies if they are still needed afterwards. The wall
+    time of every stage of the last run is kept in `timings` (in ms).
+    """
+
+    def __init__(self, stages: tuple = PREPROCESSING_STAGES):
+        self.stages = stages
+        self.timings = {}
+
+    def run(self, weather_data: pd.DataFrame, bikes_data: pd.DataFrame) -> pd.DataFrame:
+        frames = {"weather": weather_data, "bikes": bikes_data}
+        self.timings = {}
+        for stage in self.stages:
+            with stage_timer(stage.name, self.timings):
+                stage.run(frames)
+        return frames["df"]
+
+
+def preprocess(weather_data: pd.DataFrame, bikes_data: pd.DataFrame) -> pd.DataFrame:
+    """Bikes with the weather of their hour and the model's features."""
+    return PreprocessingPipeline().run(weather_data, bikes_data)
+
+
+def save_processed_datasets(
+    df: pd.DataFrame,
+    s3_handler,
+    bucket: str,
+    path: str,
+    file_format: str = "csv",
+    compression: str = "snappy",
+) -> list[str]:
+    """Saves single bikes and stations apart, under the dates they span.
+
+    Returns the keys that were written.
+    """
+    single_bikes = df["stationId"].str.startswith(SINGLE_BIKE_PREFIX)
+    datasets = [
+        ("single_bikes", "SingleBikes", df[single_bikes]),
+        ("station_bikes", "StationaryStations", df[~single_bikes]),
+    ]
+
+    keys = []
+    for sub_path, filename, dataset in datasets:
+        if dataset.empty:
+            logger.warning(f"No {filename} rows to save")
+            continue
+        dates = get_min_and_max_dates_from_dataframe(dataset)
+        keys.append(
+            s3_handler.save_dataframe_to_s3(
+                df=dataset,
+                bucket_name=bucket,
+                path_name=path,
+                sub_path=sub_path,
+                current_date=f"{dates['min_date']}-{dates['max_date']}",
+                filename=filename,
+                file_format=file_format,
+                compression=compression,
+            )
+        )
+
+    logger.info(
+        f"Successfully saved to Single and Stations bike data to S3 {bucket}/{path}."
+    )
+    return keys
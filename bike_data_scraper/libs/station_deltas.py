@@ -0,0 +1,94 @@
+import hashlib
+from typing import Iterable, Iterator
+
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
+
+# Written once per scrape in delta mode, so the export knows every scrape time
+SCRAPE_MARKER_STATION_ID = "#scrapes"
+FINGERPRINT_FIELDS = ("AvailableBikes", "BikeIds", "IsOpen")
+FORWARD_FILL_PAGE_SIZE = 1000
+
+
+def station_fingerprint(station: dict) -> str:
+    """A short hash of the fields whose change is worth a new sample."""
+    digest = hashlib.blake2b(digest_size=8)
+    for field in FINGERPRINT_FIELDS:
+        digest.update(f"{field}={station.get(field)}\x1f".encode())
+    return digest.hexdigest()
+
+
+def forward_fill_station_samples(pages: Iterable[list[dict]]) -> Iterator[list[dict]]:
+    """Rebuilds the full series of every scrape out of delta mode samples.
+
+    Pages must come in timestamp order, as the day index queries return
+    them. At a timestamp with a scrape marker, every station seen so far is
+    emitted, with the last sample of the unchanged ones carried forward;
+    a keyframe marker starts over from the stations it wrote, so stations
+    that left the API stop being filled. Samples written without a marker
+    (before delta mode) pass through unchanged. Markers are dropped.
+    """
+    latest = {}
+    pending = []
+    marker = None
+    current = None
+    output = []
+
+    def flush():
+        if marker is None:
+            output.extend(pending)
+            for item in pending:
+                latest[item["stationId"]] = item
+            return
+        if marker.get("keyframe"):
+            latest.clear()
+        for item in pending:
+            latest[item["stationId"]] = item
+        output.extend(
+            item if item["timestamp"] == current else {**item, "timestamp": current}
+            for item in latest.values()
+        )
+
+    for page in pages:
+        for item in page:
+            if item["timestamp"] != current:
+                flush()
+                pending, marker, current = [], None, item["timestamp"]
+            if item["stationId"] == SCRAPE_MARKER_STATION_ID:
+                marker = item
+            else:
+                pending.append(item)
+
+        if len(output) >= FORWARD_FILL_PAGE_SIZE:
+            yield output
+            output = []
+
+    flush()
+    if output:
+        yield output
+
+
+def drop_scrape_markers(pages: Iterable[list[dict]]) -> Iterator[list[dict]]:
+    """Passes samples through as written, for reads that are not in time order."""
+    for page in pages:
+        yield [item for item in page if item["stationId"] != SCRAPE_MARKER_STATION_ID]
+
+
+def restore_scraped_series(
+    pages: Iterable[list[dict]], delta_samples: bool, time_ordered: bool
+) -> Iterator[list[dict]]:
+    """The pages of a read as every scrape saw them.
+
+    Without delta mode samples the pages are returned as they are. Delta mode
+    samples can only be forward filled when the pages are in time order
+    (read through the day index); otherwise they are passed on as written.
+    """
+    if not delta_samples:
+        return iter(pages)
+    if time_ordered:
+        return forward_fill_station_samples(pages)
+    logger.warning(
+        "Scans are not in time order, delta mode samples are exported as written"
+    )
+    return drop_scrape_markers(pages)
@@ -0,0 +1,208 @@
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+# Keys of the DynamoDB item, not fields of the station
+KEY_FIELDS = ("stationId", "timestamp", "dayBucket")
+TYPED_FIELDS = (
+    "StationId",
+    "Name",
+    "AvailableBikes",
+    "BikeIds",
+    "BikeCount",
+    "IsOpen",
+    "Lat",
+    "Long",
+)
+# Every export row has these columns, empty where the sample lacks a value
+ROW_FIELDS = ("stationId", "timestamp", *TYPED_FIELDS)
+# How the scraper wrote missing values as strings before the schema
+MISSING_STRINGS = ("", "none", "nan")
+
+
+class StationSample:
+    """One station as one scrape saw it, with typed fields.
+
+    Counts are ints, coordinates floats and IsOpen a bool, instead of the
+    strings the scraper used to write. BikeIds are kept as a tuple and
+    stored packed, as a comma separated string next to their count, so
+    nothing downstream has to parse a stringified list. API fields without
+    a type here are kept in `attributes` as they came.
+    """
+
+    __slots__ = (
+        "station_id",
+        "timestamp",
+        "api_station_id",
+        "name",
+        "available_bikes",
+        "is_open",
+        "lat",
+        "long",
+        "bike_ids",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        station_id: str,
+        timestamp: str,
+        api_station_id: int | None = None,
+        name: str | None = None,
+        available_bikes: int | None = None,
+        is_open: bool | None = None,
+        lat: float | None = None,
+        long: float | None = None,
+        bike_ids: tuple = (),
+        attributes: dict | None = None,
+    ):
+        self.station_id = station_id
+        self.timestamp = timestamp
+        self.api_station_id = api_station_id
+        self.name = name
+        self.available_bikes = available_bikes
+        self.is_open = is_open
+        self.lat = lat
+        self.long = long
+        self.bike_ids = bike_ids
+        self.attributes = attributes or {}
+
+    @property
+    def bike_count(self) -> int:
+        return len(self.bike_ids)
+
+    @classmethod
+    def from_api(cls, station: dict, timestamp: str) -> "StationSample":
+        """A station of the API response, keyed like the scraper always has."""
+        return cls._from_fields(
+            station.get("Name") or station.get("StationId"), timestamp, station
+        )
+
+    @classmethod
+    def _from_fields(cls, station_id: str, timestamp: str, fields: dict):
+        attributes = {
+            key: value
+            for key, value in fields.items()
+            if key not in TYPED_FIELDS and key not in KEY_FIELDS
+        }
+        return cls(
+            station_id=station_id,
+            timestamp=timestamp,
+            api_station_id=_to_station_number(fields.get("StationId")),
+            name=fields.get("Name"),
+            available_bikes=_to_int(fields.get("AvailableBikes")),
+            is_open=_to_bool(fields.get("IsOpen")),
+            lat=_to_float(fields.get("Lat")),
+            long=_to_float(fields.get("Long")),
+            bike_ids=unpack_bike_ids(fields.get("BikeIds")),
+            attributes=attributes,
+        )
+
+    def fields(self) -> dict:
+        """The station fields, typed, in the order they are stored and exported."""
+        return {
+            "StationId": self.api_station_id,
+            "Name": self.name,
+            "AvailableBikes": self.available_bikes,
+            "BikeIds": pack_bike_ids(self.bike_ids),
+            "BikeCount": self.bike_count,
+            "IsOpen": self.is_open,
+            "Lat": self.lat,
+            "Long": self.long,
+            **self.attributes,
+        }
+
+    def to_item(self) -> dict:
+        """The fields as DynamoDB takes them: floats as Decimal, no None."""
+        return {
+            key: _to_dynamodb_value(value)
+            for key, value in self.fields().items()
+            if value is not None
+        }
+
+    def to_row(self) -> dict:
+        """A flat row for the CSV export, keys first, with every typed field."""
+        row = dict.fromkeys(ROW_FIELDS)
+        row["stationId"] = self.station_id
+        row["timestamp"] = self.timestamp
+        row.update(self.fields())
+        # Bracketed, so a station without bikes is not an empty (NaN) cell
+        row["BikeIds"] = f"[{row['BikeIds']}]"
+        return row
+
+
+def decode_item(item: dict) -> StationSample:
+    """Reads a stored sample, typed or from before the schema.
+
+    Older items hold every field as a string ("3", "True", "['B1', 'B2']");
+    typed ones hold DynamoDB numbers (Decimal) and booleans. Both decode to
+    the same sample.
+    """
+    return StationSample._from_fields(item["stationId"], item["timestamp"], item)
+
+
+def decode_station_pages(pages: Iterable[list[dict]]) -> Iterator[list[dict]]:
+    """Stored samples as export rows, one page at a time."""
+    for page in pages:
+        yield [decode_item(item).to_row() for item in page]
+
+
+def pack_bike_ids(bike_ids: tuple) -> str:
+    return ",".join(bike_ids)
+
+
+def unpack_bike_ids(value) -> tuple:
+    """Bike IDs out of a packed string, a stringified list or a list."""
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple, set)):
+        return tuple(str(bike_id) for bike_id in value)
+    text = str(value).strip("[] ")
+    if not text:
+        return ()
+    return tuple(bike_id.strip(" '\"") for bike_id in text.split(","))
+
+
+def _is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in MISSING_STRINGS
+    # NaN is the only value that is not equal to itself
+    return value != value
+
+
+def _to_int(value) -> int | None:
+    if _is_missing(value):
+        return None
+    return int(value)
+
+
+def _to_station_number(value):
+    # Not every station API has numeric IDs, those are kept as they are
+    try:
+        return _to_int(value)
+    except ValueError:
+        return value
+
+
+def _to_float(value) -> float | None:
+    if _is_missing(value):
+        return None
+    return float(value)
+
+
+def _to_bool(value) -> bool | None:
+    if _is_missing(value):
+        return None
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+def _to_dynamodb_value(value):
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if isinstance(value, (str, bool, int, Decimal)):
+        return value
+    # Lists and dicts of the API (closing periods) stay as they were stored
+    return str(value)
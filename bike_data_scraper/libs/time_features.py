@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+TIME_FEATURE_DTYPES = {
+    "Year": "int16",
+    "Month": "int8",
+    "Day": "int8",
+    "Hour": "int8",
+    "Minute": "int8",
+    "Weekday": "int8",
+    "IsWeekend": "int8",
+}
+DEFAULT_TIME_FEATURES = ("Year", "Month", "Day", "Hour", "Minute")
+
+
+def derive_time_features(
+    df: pd.DataFrame,
+    features: tuple = DEFAULT_TIME_FEATURES,
+    column: str = "timestamp",
+) -> pd.DataFrame:
+    """Adds calendar features of `column` in one pass over its datetime64 array.
+
+    Every feature is plain integer arithmetic on the day, month and year
+    truncations of the array, so no row is formatted or parsed as a string.
+    Weekday counts from Monday = 0. Rows whose timestamp can't be parsed are
+    dropped, as they could never be matched to anything downstream.
+    """
+    unknown = set(features) - set(TIME_FEATURE_DTYPES)
+    if unknown:
+        raise ValueError(f"Unknown time features: {sorted(unknown)}")
+
+    timestamps = df[column]
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, format="ISO8601", errors="coerce")
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        timestamps = timestamps.dt.tz_localize(None)
+    df[column] = timestamps
+
+    missing = timestamps.isna().to_numpy()
+    if missing.any():
+        logger.warning(f"Dropping {missing.sum()} rows without a valid {column}")
+        df = df.loc[~missing].copy()
+
+    values = df[column].to_numpy(dtype="datetime64[ns]")
+    days = values.astype("datetime64[D]")
+    months = values.astype("datetime64[M]")
+    years = values.astype("datetime64[Y]")
+    minute_of_day = (values - days).astype("timedelta64[m]").astype(np.int64)
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+
+    derived = {
+        "Year": lambda: years.astype(np.int64) + 1970,
+        "Month": lambda: (months - years).astype(np.int64) + 1,
+        "Day": lambda: (days - months).astype(np.int64) + 1,
+        "Hour": lambda: minute_of_day // 60,
+        "Minute": lambda: minute_of_day % 60,
+        "Weekday": lambda: weekday,
+        "IsWeekend": lambda: weekday >= 5,
+    }
+    for feature in features:
+        df[feature] = derived[feature]().astype(TIME_FEATURE_DTYPES[feature])
+
+    return df
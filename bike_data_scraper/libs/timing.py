@@ -0,0 +1,17 @@
+import time
+from contextlib import contextmanager
+
+from bike_data_scraper.libs.lazy_imports import lazy_attribute
+
+logger = lazy_attribute("loguru", "logger")
+
+
+@contextmanager
+def stage_timer(stage: str, timings: dict):
+    """Logs the wall time of the block and records it in `timings` (in ms)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"Stage {stage} took {timings[stage]} ms")
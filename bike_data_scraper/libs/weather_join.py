@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from bike_data_scraper.libs.time_features import TIME_FEATURE_DTYPES
+
+# Columns of the weather frame that describe its time rather than the weather
+WEATHER_TIME_COLUMNS = {"timestamp", "Time", *TIME_FEATURE_DTYPES}
+
+
+def hour_keys(timestamps: pd.Series) -> np.ndarray:
+    """Hours since the epoch of every timestamp, floored to the hour."""
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, format="ISO8601", errors="coerce")
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        timestamps = timestamps.dt.tz_localize(None)
+    values = timestamps.to_numpy(dtype="datetime64[ns]")
+    return values.astype("datetime64[h]").astype(np.int64)
+
+
+def join_hourly_weather(
+    bikes: pd.DataFrame,
+    weather: pd.DataFrame,
+    columns: list | None = None,
+    timestamp_column: str = "timestamp",
+) -> pd.DataFrame:
+    """Left joins the weather of each bike row's hour onto `bikes`.
+
+    Weather is hourly and dense, so its rows are laid out in an array
+    indexed by hour key and every bike row finds its weather with one array
+    lookup. Only the weather `columns` (by default every column that isn't
+    a time column) are added, in place, to `bikes`; rows without weather
+    for their hour get NaN. If weather holds an hour twice, the last row
+    wins.
+    """
+    if columns is None:
+        columns = [c for c in weather.columns if c not in WEATHER_TIME_COLUMNS]
+
+    weather_keys = hour_keys(weather[timestamp_column])
+    bike_keys = hour_keys(bikes[timestamp_column])
+
+    known = weather_keys >= 0
+    rows = np.full(len(bike_keys), -1, dtype=np.int64)
+    if known.any():
+        first_hour = weather_keys[known].min()
+        lookup = np.full(weather_keys[known].max() - first_hour + 1, -1, np.int64)
+        lookup[weather_keys[known] - first_hour] = np.flatnonzero(known)
+
+        offsets = bike_keys - first_hour
+        in_range = (offsets >= 0) & (offsets < len(lookup))
+        rows[in_range] = lookup[offsets[in_range]]
+    missing = rows < 0
+
+    for column in columns:
+        if not known.any():
+            bikes[column] = np.nan
+            continue
+        values = weather[column].to_numpy()
+        if missing.any() and values.dtype.kind in "iub":
+            values = values.astype(np.float64)
+        joined = values[rows]
+        if missing.any():
+            joined[missing] = np.nan
+        bikes[column] = joined
+
+    return bikes
@@ -0,0 +1,67 @@
+import datetime as dt
+import urllib.parse
+
+from bike_data_scraper.concurrent_fetch import ConcurrentFetcher, FetchTarget
+
+API_ENDPOINT = "api.open-meteo.com"
+PATH = "/v1/forecast"
+# The forecast API only goes this far back, older days come from the archive
+FORECAST_PAST_DAYS = 92
+ARCHIVE_API_ENDPOINT = "archive-api.open-meteo.com"
+ARCHIVE_PATH = "/v1/archive"
+HOURLY_VARIABLES = (
+    "temperature_2m,relativehumidity_2m,windspeed_10m,precipitation,visibility,snowfall"
+)
+
+
+def weather_url(
+    point: dict, start_date: dt.date, end_date: dt.date, archive: bool = False
+) -> str:
+    params = {
+        "latitude": point["latitude"],
+        "longitude": point["longitude"],
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "hourly": HOURLY_VARIABLES,
+    }
+    endpoint, path = (
+        (ARCHIVE_API_ENDPOINT, ARCHIVE_PATH) if archive else (API_ENDPOINT, PATH)
+    )
+    return f"https://{endpoint}{path}?{urllib.parse.urlencode(params)}"
+
+
+def fetch_missing_weather(
+    store,
+    fetcher: ConcurrentFetcher,
+    points: list[dict],
+    start_date: dt.date,
+    end_date: dt.date,
+    today: dt.date,
+) -> dict:
+    """Fetches the days of the window the store lacks and saves them.
+
+    Every point gets a request for the span of its missing days, split in
+    two where the span crosses the oldest day the forecast API serves: the
+    older days come from the archive. Returns the keys written per point.
+    """
+    cutoff = today - dt.timedelta(days=FORECAST_PAST_DAYS)
+    targets = []
+    for point in points:
+        missing = store.missing_days(point["name"], start_date, end_date)
+        archived = [day for day in missing if day < cutoff]
+        recent = [day for day in missing if day >= cutoff]
+        for days, archive in ((archived, True), (recent, False)):
+            if days:
+                url = weather_url(point, days[0], days[-1], archive=archive)
+                targets.append(FetchTarget(point["name"], url))
+
+    written = {}
+    for result in fetcher.fetch_all(targets):
+        if result.payload is None:
+            raise Exception(
+                f"Weather data could not be fetched from API for {result.target.name}!"
+            )
+        written.setdefault(result.target.name, []).extend(
+            store.save(result.target.name, result.payload, today=today)
+        )
+    return written
@@ -0,0 +1,67 @@
+WEATHER_DTYPES = {
+    "Temperature": "float32",
+    "Humidity": "float32",
+    "Wind_Speed": "float32",
+    "Precipitation": "float32",
+    "Visibility": "float32",
+    "Snowfall": "float32",
+}
+
+PROCESSED_BIKES_DTYPES = {
+    "stationId": "category",
+    "StationId": "category",
+    "Name": "category",
+    # Nullable, so a sample without a count or state still loads
+    "IsOpen": "boolean",
+    "AvailableBikes": "Int16",
+    "TotalAvailableBikes": "Int16",
+    "Distance": "float32",
+    "Lat": "float64",
+    "Long": "float64",
+    "Year": "int16",
+    "Month": "int8",
+    "Day": "int8",
+    "Hour": "int8",
+    "Minute": "int8",
+    "IsWeekend": "int8",
+    **WEATHER_DTYPES,
+}
+
+
+class DatasetSchema:
+    """Column types of a dataset we keep in S3.
+
+    Types are the narrowest ones that hold the values we produce, so a
+    reader only pays for the width it needs. Columns that are not listed are
+    left to the parser.
+    """
+
+    def __init__(self, name: str, dtypes: dict, parse_dates: list):
+        self.name = name
+        self.dtypes = dtypes
+        self.parse_dates = parse_dates
+
+    def read_options(self, columns: list | None = None) -> dict:
+        """dtypes and parse_dates hints, narrowed to `columns` when given."""
+        if columns is None:
+            return {"dtypes": dict(self.dtypes), "parse_dates": list(self.parse_dates)}
+        return {
+            "dtypes": {k: v for k, v in self.dtypes.items() if k in columns},
+            "parse_dates": [column for column in self.parse_dates if column in columns],
+        }
+
+
+DATASET_SCHEMAS = {
+    "StationaryStations": DatasetSchema(
+        "StationaryStations", PROCESSED_BIKES_DTYPES, ["timestamp"]
+    ),
+    "SingleBikes": DatasetSchema("SingleBikes", PROCESSED_BIKES_DTYPES, ["timestamp"]),
+    "weather": DatasetSchema("weather", WEATHER_DTYPES, ["Time"]),
+}
+
+
+def get_dataset_schema(name: str) -> DatasetSchema:
+    try:
+        return DATASET_SCHEMAS[name]
+    except KeyError:
+        raise ValueError(f"Unknown dataset schema: {name}")
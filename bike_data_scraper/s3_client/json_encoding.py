@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+from bike_data_scraper.libs.lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed up
+    orjson = None
+
+RECORDS_LAYOUT = "records"
+COLUMNS_LAYOUT = "columns"
+JSON_LAYOUTS = (RECORDS_LAYOUT, COLUMNS_LAYOUT)
+CONTENT_ENCODINGS = ("gzip", "br")
+
+
+def encode_frame_columns(df: pd.DataFrame) -> dict:
+    """Lays a frame out column by column, with each column's type once.
+
+    Floats are sent at float32 precision, which is plenty for a chart and
+    takes half the digits. Datetimes are epoch milliseconds, or a
+    start/step/length range when they are evenly spaced (as hourly series
+    are). A non default index, such as the column names of a correlation
+    matrix, is kept under "index".
+    """
+    encoded = {"columns": [], "dtypes": [], "data": []}
+    for column in df.columns:
+        values, dtype = _encode_values(df[column])
+        encoded["columns"].append(str(column))
+        encoded["dtypes"].append(dtype)
+        encoded["data"].append(values)
+
+    if not isinstance(df.index, pd.RangeIndex):
+        encoded["index"], encoded["index_dtype"] = _encode_values(df.index)
+    return encoded
+
+
+def _encode_values(values: pd.Series | pd.Index) -> tuple:
+    """Encodes a column or an index, nullable ones (Int16, boolean) included.
+
+    Nullable floats are encoded as floats, with their gaps as NaN. Nullable
+    ints and booleans with gaps keep their dtype name and come out as a
+    list with None (null) for every pd.NA.
+    """
+    dtype = values.dtype
+    if pd.api.types.is_extension_array_dtype(dtype) and dtype.kind in "iufb":
+        if dtype.kind == "f":
+            return _encode_array(values.to_numpy(dtype=np.float64, na_value=np.nan))
+        if values.hasnans:
+            return values.to_numpy(dtype=object, na_value=None).tolist(), str(dtype)
+        return _encode_array(values.to_numpy(dtype=dtype.numpy_dtype))
+    return _encode_array(values.to_numpy())
+
+
+def _encode_array(values: np.ndarray) -> tuple:
+    if np.issubdtype(values.dtype, np.datetime64):
+        milliseconds = values.astype("datetime64[ms]").astype(np.int64)
+        steps = np.diff(milliseconds)
+        if len(milliseconds) > 2 and (steps == steps[0]).all():
+            return {
+                "start": int(milliseconds[0]),
+                "step": int(steps[0]),
+                "length": len(milliseconds),
+            }, "datetime64[ms]"
+        return milliseconds, "datetime64[ms]"
+    if values.dtype.kind == "f":
+        return values.astype(np.float32), "float32"
+    if values.dtype.kind in "iub":
+        return values, str(values.dtype)
+    return values.tolist(), "object"
+
+
+def _to_builtin(value):
+    """Makes encoded numpy arrays plain lists for the standard json module."""
+    if isinstance(value, dict):
+        return {key: _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_builtin(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype == np.float32:
+            # str() of a float32 is its shortest round trip form
+            return [None if np.isnan(v) else float(str(v)) for v in value]
+        return [_to_builtin(item) for item in value.tolist()]
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def dumps(data) -> bytes:
+    """Serialises with orjson when it is installed, else with json."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(_to_builtin(data), allow_nan=False).encode()
+
+
+def encode_graph_data(data: dict, layout: str = RECORDS_LAYOUT) -> bytes:
+    if layout not in JSON_LAYOUTS:
+        raise ValueError(f"Unsupported JSON layout: {layout}")
+
+    encoded = {}
+    for key, value in data.items():
+        if isinstance(value, pd.DataFrame):
+            if layout == COLUMNS_LAYOUT:
+                value = encode_frame_columns(value)
+            else:
+                value = value.assign(
+                    **{
+                        column: value[column].astype(str)
+                        for column in value.columns
+                        if pd.api.types.is_datetime64_any_dtype(value[column])
+                    }
+                ).to_dict(orient="records")
+        encoded[key] = value
+    if layout == COLUMNS_LAYOUT:
+        encoded["layout"] = COLUMNS_LAYOUT
+    return dumps(encoded)
+
+
+def compress(body: bytes, content_encoding: str | None) -> bytes:
+    if content_encoding is None:
+        return body
+    if content_encoding == "gzip":
+        return gzip.compress(body)
+    if content_encoding == "br":
+        try:
+            import brotli
+        except ImportError:
+            raise ValueError("br content encoding needs the brotli package")
+        return brotli.compress(body)
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
@@ -1,17 +1,49 @@
+from __future__ import annotations
+
 from datetime import datetime
-from io import StringIO
-import boto3
-import pandas as pd
-from loguru import logger
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable
 import json
 
+from bike_data_scraper.aws_clients import get_client
+from bike_data_scraper.libs.lazy_imports import lazy_attribute, lazy_module
+from bike_data_scraper.s3_client.dataset_schemas import get_dataset_schema
+from bike_data_scraper.s3_client.json_encoding import (
+    RECORDS_LAYOUT,
+    compress,
+    encode_graph_data,
+)
+
+logger = lazy_attribute("loguru", "logger")
+# Only loaded by the methods that read or write frames
+pd = lazy_module("pandas")
+
+# S3 rejects parts below 5 MiB (except the last one)
+MULTIPART_MIN_PART_SIZE = 5 * 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Objects are buffered in memory up to this size, on local disk above it
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+PARQUET_COMPRESSIONS = ("snappy", "zstd")
+
 
 class S3Handler:
-    def __init__(self) -> None:
-        self.s3_client = boto3.client("s3")
-        self.s3_resource = boto3.resource("s3")
+    def __init__(self, s3_client=None) -> None:
+        # None takes the process's shared client, when it is first needed
+        self._s3_client = s3_client
         self.current_date = datetime.now().strftime("%d-%m-%Y")
 
+    @property
+    def s3_client(self):
+        return self._s3_client or get_client("s3")
+
+    @s3_client.setter
+    def s3_client(self, s3_client):
+        self._s3_client = s3_client
+
     def save_dataframe_to_s3(
         self,
         df: pd.DataFrame,
@@ -20,32 +52,225 @@ class S3Handler:
         current_date: str,
         filename: str,
         sub_path: str,
-    ):
-        with StringIO() as csv_buffer:
-            df.to_csv(csv_buffer, index=False)
-            self.s3_resource.Object(
-                bucket_name, f"{path_name}/{current_date}/{sub_path}/{filename}.csv"
-            ).put(Body=csv_buffer.getvalue())
+        file_format: str = CSV_FORMAT,
+        compression: str = "snappy",
+    ) -> str:
+        """Saves the frame as CSV or as typed, compressed Parquet.
+
+        The format is encoded in the key suffix, which is what readers use to
+        pick the parser. Parquet needs pyarrow in the Lambda layer.
+        """
+        key = f"{path_name}/{current_date}/{sub_path}/{filename}.{file_format}"
+        return self.write_dataframe(df, bucket_name, key, file_format, compression)
+
+    def write_dataframe(
+        self,
+        df: pd.DataFrame,
+        bucket_name: str,
+        key: str,
+        file_format: str = CSV_FORMAT,
+        compression: str = "snappy",
+    ) -> str:
+        """Encodes the frame straight to bytes in a spooled file and uploads it.
+
+        The encoded object is never copied into a str or a second buffer;
+        large ones spill to disk and go up as a multipart upload.
+        """
+        if file_format not in (CSV_FORMAT, PARQUET_FORMAT):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        if file_format == PARQUET_FORMAT and compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"Unsupported Parquet compression: {compression}")
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+
+        with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            if file_format == CSV_FORMAT:
+                df.to_csv(spool, index=False, encoding="utf-8")
+            else:
+                df.to_parquet(spool, index=False, compression=compression)
+            spool.seek(0)
+            self.upload_fileobj(spool, bucket_name, key)
+        return key
+
+    def upload_fileobj(
+        self, fileobj: BinaryIO, bucket_name: str, key: str, extra_args: dict = None
+    ) -> str:
+        """Uploads a binary file object, in parts when it is large."""
+        self.s3_client.upload_fileobj(fileobj, bucket_name, key, ExtraArgs=extra_args)
+        return key
+
+    def open_object(self, bucket_name: str, key: str):
+        """The object's body as a stream, read as it is consumed."""
+        return self.s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+
+    def download_to_spooled_file(
+        self, bucket_name: str, key: str
+    ) -> SpooledTemporaryFile:
+        """The object in a seekable file, for readers such as Parquet that seek.
+
+        The caller closes the file.
+        """
+        spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.s3_client.download_fileobj(bucket_name, key, spool)
+        spool.seek(0)
+        return spool
+
+    def read_csv(self, bucket_name: str, key: str, **read_csv_kwargs) -> pd.DataFrame:
+        """Parses a CSV object while it streams in, without a copy of the body."""
+        return pd.read_csv(self.open_object(bucket_name, key), **read_csv_kwargs)
 
     def save_data_as_string_to_csv(
         self, csv_str: str, end_date: str, bucket_name: str
     ) -> dict:
         object_key = f"weather-data-{end_date}.csv"
-        self.s3_resource.Object(bucket_name, object_key).put(Body=csv_str)
+        self.s3_client.put_object(Bucket=bucket_name, Key=object_key, Body=csv_str)
         return {"weather_bucket_name": bucket_name, "object_key": object_key}
 
-    def get_data_from_s3(self, bucket_name: str, key: str) -> pd.DataFrame:
-        obj = self.s3_client.get_object(Bucket=bucket_name, Key=key)
-        df = pd.read_csv(obj["Body"])
+    def get_data_from_s3(
+        self,
+        bucket_name: str,
+        key: str,
+        columns: list | None = None,
+        dtypes: dict | None = None,
+        parse_dates: list | None = None,
+        dataset: str | None = None,
+    ) -> pd.DataFrame:
+        """Loads a CSV or Parquet object (picked by key suffix) into a frame.
+
+        `columns` limits what is parsed at all. `dataset` names an entry in
+        DATASET_SCHEMAS whose dtypes and date columns are used as defaults;
+        explicit `dtypes` and `parse_dates` take precedence over it.
+        """
+        hints = {"dtypes": {}, "parse_dates": []}
+        if dataset is not None:
+            hints = get_dataset_schema(dataset).read_options(columns)
+        if dtypes is not None:
+            hints["dtypes"].update(dtypes)
+        if parse_dates is not None:
+            hints["parse_dates"] = parse_dates
+
+        if key.endswith(f".{PARQUET_FORMAT}"):
+            # Parquet needs a seekable file, the streaming body is not one
+            with self.download_to_spooled_file(bucket_name, key) as parquet_file:
+                df = pd.read_parquet(parquet_file, columns=columns)
+            df = df.astype(
+                {k: v for k, v in hints["dtypes"].items() if k in df.columns}
+            )
+        else:
+            df = self.read_csv(bucket_name, key, usecols=columns, dtype=hints["dtypes"])
+
+        for column in hints["parse_dates"]:
+            if column in df.columns and not pd.api.types.is_datetime64_any_dtype(
+                df[column]
+            ):
+                df[column] = pd.to_datetime(df[column], format="ISO8601")
+
         if df.empty:
             logger.error(f"No data found for bucket {bucket_name} and key {key}")
             raise Exception("No data found in S3 bucket")
         return df
 
+    def get_json_from_s3(self, bucket_name: str, key: str) -> dict | None:
+        """Loads a JSON object, or returns None when the key doesn't exist."""
+        try:
+            obj = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return json.loads(obj["Body"].read())
+
+    def put_json_to_s3(self, data: dict, bucket_name: str, key: str):
+        self.s3_client.put_object(Body=json.dumps(data), Bucket=bucket_name, Key=key)
+        return key
+
     def put_in_s3_bucket(self, filename: str, data_to_save, bucket_name: str):
         self.s3_client.put_object(Bucket=bucket_name, Key=filename, Body=data_to_save)
         return filename
 
+    def upload_stream_to_s3(
+        self,
+        chunks: Iterable[bytes],
+        bucket_name: str,
+        key: str,
+        part_size: int = MULTIPART_PART_SIZE,
+    ) -> dict:
+        """Uploads a stream of byte chunks without holding the whole object.
+
+        Chunks are gathered into parts of `part_size` bytes and sent with a
+        multipart upload, so at most one part is buffered at a time. Streams
+        smaller than one part go up with a single put_object, and an empty
+        stream writes nothing.
+        """
+        if part_size < MULTIPART_MIN_PART_SIZE:
+            raise ValueError(
+                f"part_size must be at least {MULTIPART_MIN_PART_SIZE} bytes"
+            )
+
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        total_bytes = 0
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                total_bytes += len(chunk)
+                if len(buffer) < part_size:
+                    continue
+
+                if upload_id is None:
+                    upload_id = self.s3_client.create_multipart_upload(
+                        Bucket=bucket_name, Key=key
+                    )["UploadId"]
+                parts.append(
+                    self._upload_part(
+                        bucket_name, key, upload_id, len(parts) + 1, buffer
+                    )
+                )
+                buffer = bytearray()
+
+            if upload_id is None:
+                if total_bytes:
+                    self.s3_client.put_object(
+                        Bucket=bucket_name, Key=key, Body=bytes(buffer)
+                    )
+                return {"key": key, "bytes": total_bytes, "parts": int(total_bytes > 0)}
+
+            if buffer:
+                parts.append(
+                    self._upload_part(
+                        bucket_name, key, upload_id, len(parts) + 1, buffer
+                    )
+                )
+            self.s3_client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception as e:
+            logger.error(f"Error uploading stream to s3://{bucket_name}/{key}: {e}")
+            if upload_id is not None:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=bucket_name, Key=key, UploadId=upload_id
+                )
+            raise e
+
+        logger.info(
+            f"Uploaded {total_bytes} bytes in {len(parts)} parts to s3://{bucket_name}/{key}"
+        )
+        return {"key": key, "bytes": total_bytes, "parts": len(parts)}
+
+    def _upload_part(
+        self, bucket_name: str, key: str, upload_id: str, part_number: int, buffer
+    ) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=bytes(buffer),
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
     def convert_dataframe_to_dict(self, data: dict) -> dict:
         try:
             for key, value in data.items():
@@ -71,16 +296,30 @@ class S3Handler:
         path_name: str,
         sub_path: str,
         current_date: str,
+        layout: str = RECORDS_LAYOUT,
+        content_encoding: str | None = None,
     ) -> None:
+        """Saves graph results as data.json.
+
+        `layout` is "records" (a list of row objects per frame) or "columns"
+        (see encode_frame_columns). With a `content_encoding` of "gzip" or
+        "br" the body is compressed and the object carries the matching
+        Content-Encoding, so browsers decode it transparently.
+        """
         try:
-            logger.info(f"Converting {sub_path} dataframe data to dict")
-            data = self.convert_dataframe_to_dict(data)
+            logger.info(f"Encoding {sub_path} graph data as {layout} JSON")
+            body = compress(encode_graph_data(data, layout), content_encoding)
 
             logger.info(f"Saving {sub_path} graph json data to S3")
+            extra_args = (
+                {"ContentEncoding": content_encoding} if content_encoding else {}
+            )
             self.s3_client.put_object(
-                Body=json.dumps(data),
+                Body=body,
                 Bucket=bucket_name,
                 Key=f"{path_name}/{sub_path}/{current_date}/data.json",
+                ContentType="application/json",
+                **extra_args,
             )
             logger.info("Successfully saved data to S3")
         except Exception as e:
@@ -0,0 +1,144 @@
+import datetime as dt
+
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.csv_client.weather_encoder import WeatherEncoder
+from bike_data_scraper.s3_client.s3_handler import CSV_FORMAT, PARQUET_FORMAT
+
+HOURS_PER_DAY = 24
+
+
+def split_by_day(weather_data: dict) -> dict:
+    """Splits an Open-Meteo response into one response per day of its hours."""
+    hourly = weather_data["hourly"]
+    days = {}
+    for position, time in enumerate(hourly["time"]):
+        day = time[:10]
+        if day not in days:
+            days[day] = [position, position]
+        days[day][1] = position + 1
+    return {
+        day: {"hourly": {name: values[start:end] for name, values in hourly.items()}}
+        for day, (start, end) in days.items()
+    }
+
+
+def _every_hour_has_values(hourly: dict) -> bool:
+    """Whether every variable has a value for every hour of the day."""
+    # The archive sends nulls for the hours it has not caught up on yet
+    return all(
+        value is not None
+        for name, values in hourly.items()
+        if name != "time"
+        for value in values
+    )
+
+
+class WeatherDayStore:
+    """Hourly weather kept as one object per day and point, plus a manifest.
+
+    Objects live under `{prefix}/{point}/{day}.{format}`. The manifest at
+    `{prefix}/{point}/manifest.json` lists every saved day with its hour
+    count and whether it is complete: all 24 hours of a day that is over,
+    with values.
+    Complete days never have to be fetched again.
+    """
+
+    def __init__(
+        self,
+        s3_handler,
+        bucket_name: str,
+        prefix: str,
+        file_format: str = CSV_FORMAT,
+        encoder: WeatherEncoder | None = None,
+    ):
+        if file_format not in (CSV_FORMAT, PARQUET_FORMAT):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        self.s3_handler = s3_handler
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.file_format = file_format
+        self.encoder = encoder or WeatherEncoder()
+
+    def _manifest_key(self, point: str) -> str:
+        return f"{self.prefix}/{point}/manifest.json"
+
+    def _day_key(self, point: str, day: str) -> str:
+        return f"{self.prefix}/{point}/{day}.{self.file_format}"
+
+    def load_manifest(self, point: str) -> dict:
+        manifest = self.s3_handler.get_json_from_s3(
+            self.bucket_name, self._manifest_key(point)
+        )
+        return manifest or {"point": point, "days": {}}
+
+    def missing_days(
+        self, point: str, start_date: dt.date, end_date: dt.date
+    ) -> list[dt.date]:
+        """The days of [start_date, end_date] that are not complete yet."""
+        saved = self.load_manifest(point)["days"]
+        days = pd.date_range(start_date, end_date, freq="D").date
+        return [
+            day
+            for day in days
+            if not saved.get(day.isoformat(), {}).get("complete", False)
+        ]
+
+    def save(self, point: str, weather_data: dict, today: dt.date) -> list[str]:
+        """Saves every day of the response and records them in the manifest.
+
+        Days that are already complete are not written again. Returns the
+        keys that were written.
+        """
+        manifest = self.load_manifest(point)
+        written = []
+        for day, day_data in split_by_day(weather_data).items():
+            if manifest["days"].get(day, {}).get("complete", False):
+                continue
+
+            key = self._day_key(point, day)
+            if self.file_format == PARQUET_FORMAT:
+                body = self.encoder.to_parquet(day_data)
+            else:
+                body = self.encoder.to_csv(day_data)
+            self.s3_handler.put_in_s3_bucket(key, body, self.bucket_name)
+
+            hours = len(day_data["hourly"]["time"])
+            manifest["days"][day] = {
+                "key": key,
+                "hours": hours,
+                "complete": hours == HOURS_PER_DAY
+                and day < today.isoformat()
+                and _every_hour_has_values(day_data["hourly"]),
+            }
+            written.append(key)
+
+        if written:
+            self.s3_handler.put_json_to_s3(
+                manifest, self.bucket_name, self._manifest_key(point)
+            )
+        return written
+
+    def load_window(
+        self, point: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        """Assembles the hourly weather of [start_date, end_date] from its days."""
+        saved = self.load_manifest(point)["days"]
+        frames = []
+        for day in pd.date_range(start_date, end_date, freq="D").date:
+            entry = saved.get(day.isoformat())
+            if entry is None:
+                logger.warning(f"No weather saved for {point} on {day}")
+                continue
+            frames.append(
+                self.s3_handler.get_data_from_s3(
+                    self.bucket_name, entry["key"], dataset="weather"
+                )
+            )
+
+        if not frames:
+            raise Exception(
+                f"No weather saved for {point} in {start_date} - {end_date}"
+            )
+        return pd.concat(frames, ignore_index=True)
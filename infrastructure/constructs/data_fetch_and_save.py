@@ -54,9 +54,10 @@ class SaveTwoWeeksBikeDataToCsv(Construct):
 
         lambda_role.add_to_policy(
             aws_iam.PolicyStatement(
-                actions=["dynamodb:Scan", "dynamodb:GetItem"],
+                actions=["dynamodb:Scan", "dynamodb:GetItem", "dynamodb:Query"],
                 resources=[
-                    f"arn:aws:dynamodb:eu-north-1:796717305864:table/{stage_name}-{service_short_name}-bike-data-table"
+                    f"arn:aws:dynamodb:eu-north-1:796717305864:table/{stage_name}-{service_short_name}-bike-data-table",
+                    f"arn:aws:dynamodb:eu-north-1:796717305864:table/{stage_name}-{service_short_name}-bike-data-table/index/*",
                 ],
             )
         )
@@ -118,6 +119,8 @@ class SaveTwoWeeksBikeDataToCsv(Construct):
             "STAGE_NAME": stage_name,
             "S3_BUCKET_NAME": f"{stage_name}-{service_short_name}-raw-weather-data",
             "BIKE_TABLE_NAME": f"{stage_name}-{service_short_name}-bike-data-table",
+            "BIKE_DATA_DAY_INDEX_NAME": "dayBucket-timestamp-index",
+            "BIKE_DATA_SCAN_WORKERS": "8",
             "LOG_LEVEL": "DEBUG",
             "SERVICE_NAME": service_name,
         }
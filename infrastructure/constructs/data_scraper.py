@@ -61,6 +61,7 @@ class DataScraper(Construct):
         return {
             "STAGE_NAME": stage_name,
             "BIKE_DATA_TABLE_NAME": bike_data_table_name,
+            "SCRAPER_DELTA_MODE": "true",
             "POWERTOOLS_SERVICE_NAME": f"{service_name}",
             "LOG_LEVEL": "DEBUG",
         }
@@ -97,7 +98,7 @@ class DataScraper(Construct):
         return lambda_function
 
     def _create_dynamodb_table(self, table_name: str) -> aws_dynamodb.Table:
-        return aws_dynamodb.Table(
+        table = aws_dynamodb.Table(
             self,
             table_name,
             table_name=table_name,
@@ -112,6 +113,18 @@ class DataScraper(Construct):
             billing_mode=aws_dynamodb.BillingMode.PAY_PER_REQUEST,
             deletion_protection=True,
         )
+        # Lets the two weeks export issue one Query per day instead of a Scan
+        table.add_global_secondary_index(
+            index_name="dayBucket-timestamp-index",
+            partition_key=aws_dynamodb.Attribute(
+                name="dayBucket", type=aws_dynamodb.AttributeType.STRING
+            ),
+            sort_key=aws_dynamodb.Attribute(
+                name="timestamp", type=aws_dynamodb.AttributeType.STRING
+            ),
+            projection_type=aws_dynamodb.ProjectionType.ALL,
+        )
+        return table
 
     def _build_lambda_role(self, role_name: str) -> aws_iam.Role:
         return aws_iam.Role(
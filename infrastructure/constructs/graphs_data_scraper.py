@@ -61,6 +61,13 @@ class GraphsDataScraper(Construct):
             "GRAPHS_DESTINATION_BUCKET": s3_destination_bucket,
             "STATION_BIKE_DATA": "processed/2023-09-10-2023-09-24/station_bikes/StationaryStations.csv",
             "SINGLE_BIKE_DATA": "processed/2023-09-10-2023-09-24/single_bikes/SingleBikes.csv",
+            "GRAPHS_EXECUTION_MODE": "parallel",
+            # Off until tests/benchmarks/test_incremental_metrics.py shows
+            # cached partials beat a full recompute
+            "GRAPHS_INCREMENTAL_METRICS": "false",
+            # data.json is read as records; columns and gzip wait until
+            # its reader understands the columnar layout
+            "GRAPHS_JSON_LAYOUT": "records",
             "LOG_LEVEL": "DEBUG",
         }
 
@@ -79,6 +79,7 @@ class WeatherDataScraper(Construct):
         return {
             "STAGE_NAME": stage_name,
             "S3_BUCKET_NAME": f"{stage_name}-{service_short_name}-raw-weather-data",
+            "WEATHER_STORE_PREFIX": "weather",
             "LOG_LEVEL": "DEBUG",
             "SERVICE_NAME": service_name,
         }
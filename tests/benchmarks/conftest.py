@@ -0,0 +1,18 @@
+import time
+
+import pytest
+
+
+@pytest.fixture()
+def timed():
+    """Returns (result, seconds) of the best of `repeat` calls."""
+
+    def run(function, *args, repeat: int = 3, **kwargs):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function(*args, **kwargs)
+            best = min(best, time.perf_counter() - started)
+        return result, best
+
+    return run
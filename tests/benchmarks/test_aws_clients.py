@@ -0,0 +1,50 @@
+import boto3
+import pytest
+from loguru import logger
+
+from bike_data_scraper import aws_clients
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+
+@pytest.fixture(autouse=True)
+def aws_region(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-north-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    yield
+    aws_clients.reset_clients()
+
+
+def legacy_cold_start():
+    # graphs_data_scraper's import: S3_CLIENT, S3_RESOURCE and an S3Handler
+    # that built its own client and resource, all on a fresh process
+    session = boto3.Session()
+    return [
+        session.client("s3"),
+        session.resource("s3"),
+        session.client("s3"),
+        session.resource("s3"),
+    ]
+
+
+def cold_start():
+    aws_clients.reset_clients()
+    return warm_invocation()
+
+
+def warm_invocation():
+    return [S3Handler().s3_client, S3Handler().s3_client, aws_clients.get_client("s3")]
+
+
+def test_warm_invocations_reuse_the_clients(timed):
+    _, legacy_seconds = timed(legacy_cold_start)
+    _, cold_seconds = timed(cold_start)
+    _, warm_seconds = timed(warm_invocation, repeat=100)
+
+    logger.info(
+        f"S3 clients of the graphs handler: legacy cold start "
+        f"{legacy_seconds * 1000:.1f} ms, shared cold start "
+        f"{cold_seconds * 1000:.1f} ms, warm invocation {warm_seconds * 1000:.3f} ms"
+    )
+    assert cold_seconds < legacy_seconds
+    assert warm_seconds < cold_seconds / 100
@@ -0,0 +1,95 @@
+import importlib
+import tracemalloc
+
+import pytest
+
+from bike_data_scraper import aws_clients
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    BikeDataDynamoDbHandler,
+)
+from bike_data_scraper.s3_client.s3_handler import MULTIPART_PART_SIZE, S3Handler
+
+MiB = 1024 * 1024
+
+
+class DiscardingS3Client:
+    """Counts uploaded bytes without keeping them, unlike moto's in-memory store."""
+
+    def __init__(self):
+        self.uploaded_bytes = 0
+        self.parts = 0
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-id"}
+
+    def upload_part(self, Body, PartNumber, **kwargs):
+        self.uploaded_bytes += len(Body)
+        self.parts += 1
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        return {}
+
+    def put_object(self, Body, **kwargs):
+        self.uploaded_bytes += len(Body)
+        self.parts += 1
+
+
+@pytest.fixture()
+def export_lambda(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-north-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("BIKE_TABLE_NAME", "bike-table")
+    monkeypatch.setenv("S3_BUCKET_NAME", "bucket")
+    module = importlib.import_module(
+        "bike_data_scraper.handlers.data_fetch_and_save_lambda"
+    )
+    yield importlib.reload(module)
+    aws_clients.reset_clients()
+
+
+def test_export_memory_stays_flat_for_a_million_items(export_lambda, mocker):
+    item_count = 1_000_000
+    page_size = 1000
+
+    def synthetic_pages(self, starting_date):
+        timestamp = starting_date.isoformat()
+        for start in range(0, item_count, page_size):
+            yield [
+                {
+                    "stationId": f"station{i}",
+                    "timestamp": timestamp,
+                    "StationId": str(i % 300),
+                    "Name": f"Station {i % 300}",
+                    "AvailableBikes": str(i % 17),
+                    "BikeIds": "['BIKE1', 'BIKE2']",
+                    "IsOpen": "True",
+                    "Lat": "57.7089",
+                    "Long": "11.9746",
+                }
+                for i in range(start, start + page_size)
+            ]
+
+    mocker.patch.object(
+        BikeDataDynamoDbHandler,
+        "iter_bike_data_last_two_weeks_from_datetime",
+        synthetic_pages,
+    )
+    mocker.patch.object(BikeDataDynamoDbHandler, "get_scraper_state", return_value=None)
+    s3_handler = S3Handler()
+    s3_handler.s3_client = DiscardingS3Client()
+    mocker.patch.object(export_lambda, "S3Handler", return_value=s3_handler)
+
+    # A warm invocation: the clients (and their service models) already exist
+    aws_clients.get_resource("dynamodb")
+    tracemalloc.start()
+    try:
+        export_lambda.lambda_handler(None, None)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert s3_handler.s3_client.uploaded_bytes > 80 * MiB
+    assert s3_handler.s3_client.parts > 10
+    assert peak < 3 * MULTIPART_PART_SIZE
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budget (ms) of every handler, with room for slower
+# machines. Which modules the handlers load is checked by the unit tests in
+# tests/unit/handlers/test_handler_imports.py.
+HANDLER_BUDGETS = {
+    "check_ec2_status": 60,
+    "shut_down_ec2_training_instance": 60,
+    "start_ec_2_instance": 60,
+    "data_scraper": 400,
+    "data_fetch_and_save_lambda": 150,
+    "data_preprocessing_2weeks": 1500,
+    "graphs_data_scraper": 1500,
+    "train_test_split_for_training": 1500,
+    "weather_data_handler": 2000,
+}
+HANDLER_ENV = {
+    "BIKE_DATA_TABLE_NAME": "bike-table",
+    "BIKE_TABLE_NAME": "bike-table",
+    "S3_BUCKET_NAME": "bucket",
+    "BIKES_KEY": "bikes.csv",
+    "S3_DESTINATION_BUCKET": "destination",
+    "S3_SOURCE_BUCKET": "source",
+    "AWS_DEFAULT_REGION": "eu-north-1",
+}
+
+
+def import_handler(handler: str) -> float:
+    """Imports the handler in a fresh interpreter, as a cold start does.
+
+    Returns its cumulative import time in ms.
+    """
+    module = f"bike_data_scraper.handlers.{handler}"
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {module}",
+        ],
+        env={**os.environ, **HANDLER_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise AssertionError(f"No import time reported for {module}")
+
+
+@pytest.mark.parametrize("handler", sorted(HANDLER_BUDGETS))
+def test_handler_imports_within_budget(handler):
+    budget_ms = HANDLER_BUDGETS[handler]
+
+    # The first run may compile bytecode, which a deployed package ships
+    import_handler(handler)
+    import_ms = import_handler(handler)
+
+    assert import_ms < budget_ms, f"{handler} took {import_ms:.0f} ms to import"
@@ -0,0 +1,42 @@
+import json
+
+from loguru import logger
+
+from bike_data_scraper.libs.metric_partials import incremental_metrics
+from bike_data_scraper.libs.metrics_engine import MetricsEngine
+
+from .test_metrics_engine import a_month_of_stations
+
+
+class MemoryPartialStore:
+    """Keeps the manifest as JSON, like S3 does, without the GET and PUT."""
+
+    def __init__(self):
+        self.manifest = None
+
+    def load(self, sub_path):
+        return {} if self.manifest is None else json.loads(self.manifest)
+
+    def save(self, sub_path, days):
+        self.manifest = json.dumps(days)
+
+
+def test_warm_incremental_metrics_against_a_full_recompute(timed):
+    df = a_month_of_stations()
+    df = df[df["timestamp"] < "2023-10-15"].reset_index(drop=True)
+    store = MemoryPartialStore()
+    incremental_metrics(df, "station_bikes", store)
+
+    expected, engine_seconds = timed(MetricsEngine().compute, df)
+    metrics, incremental_seconds = timed(
+        incremental_metrics, df, "station_bikes", store
+    )
+
+    # No speed assertion: the stack keeps GRAPHS_INCREMENTAL_METRICS off until
+    # this, plus a GET of the manifest, shows a gain worth the cache
+    logger.info(
+        f"{len(df)} rows: engine {engine_seconds:.3f} s, warm incremental "
+        f"{incremental_seconds:.3f} s, manifest {len(store.manifest)} bytes"
+    )
+    assert metrics["warmest_temperature"] == expected["warmest_temperature"]
+    assert metrics["day_with_most_used_bikes"] == expected["day_with_most_used_bikes"]
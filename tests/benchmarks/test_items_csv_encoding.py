@@ -0,0 +1,61 @@
+import csv
+import io
+
+import pytest
+from loguru import logger
+
+from bike_data_scraper.csv_client.csv_handler import union_columns, write_items_csv
+
+
+def legacy_items_to_csv(items: list[dict], columns: list) -> bytes:
+    csv_file = io.StringIO()
+    csv_writer = csv.DictWriter(csv_file, fieldnames=columns)
+    csv_writer.writeheader()
+    for item in items:
+        csv_writer.writerow(item)
+    return csv_file.getvalue().encode()
+
+
+def write_to_bytes(items: list[dict]) -> bytes:
+    with io.BytesIO() as stream:
+        write_items_csv(items, stream)
+        return stream.getvalue()
+
+
+def synthetic_station_items(count: int) -> list[dict]:
+    items = []
+    for i in range(count):
+        item = {
+            "stationId": f"station{i % 300}",
+            "timestamp": f"2023-10-{10 + i // 300 % 5}T10:{i % 60:02}:00",
+            "StationId": i % 300,
+            "Name": f"Station {i % 300}",
+            "AvailableBikes": i % 17,
+            "BikeIds": "BIKE1,BIKE2",
+            "BikeCount": 2,
+            "IsOpen": True,
+            "Lat": 57.7089,
+            "Long": 11.9746,
+        }
+        if i % 1000 == 999:
+            # Attributes only some stations have
+            item["Distance"] = 120.5
+        items.append(item)
+    return items
+
+
+@pytest.mark.parametrize("count", [100_000, 1_000_000])
+def test_chunked_encoder_matches_dict_writer_and_is_faster(timed, count):
+    items = synthetic_station_items(count)
+
+    expected, legacy_seconds = timed(
+        legacy_items_to_csv, items, union_columns(items), repeat=1
+    )
+    encoded, chunked_seconds = timed(write_to_bytes, items, repeat=1)
+
+    logger.info(
+        f"{count} items: DictWriter {count / legacy_seconds:,.0f} rows/s, "
+        f"chunked {count / chunked_seconds:,.0f} rows/s"
+    )
+    assert encoded == expected
+    assert chunked_seconds < legacy_seconds / 1.5
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.metrics_engine import CORRELATION_COLUMNS, MetricsEngine
+
+
+def legacy_calculate_metrics(df: pd.DataFrame) -> dict:
+    """The per metric functions graphs_data_scraper used before the engine."""
+    metrics = {
+        "number_of_bikes_available": f"{df['stationId'].nunique()}",
+        "warmest_temperature": f"{df['Temperature'].max()}",
+        "coldest_temperature": f"{df['Temperature'].min()}",
+        "coldest_day": f"{df['timestamp'].loc[df['Temperature'].idxmin()]}",
+        "warmest_day": f"{df['timestamp'].loc[df['Temperature'].idxmax()]}",
+        "day_with_most_used_bikes": f"{df['timestamp'].value_counts().idxmax()}",
+        "correlation_matrix": df[CORRELATION_COLUMNS].corr(),
+    }
+    weekend = df.groupby("IsWeekend")["AvailableBikes"].mean().reset_index()
+    weekend["IsWeekend"] = weekend["IsWeekend"].replace({0: "Weekdays", 1: "Weekend"})
+    metrics["weekend_vs_weekday"] = weekend
+    metrics["weather_over_timestamp"] = (
+        df.resample("h", on="timestamp")
+        .agg(
+            {
+                "Humidity": "mean",
+                "Wind_Speed": "mean",
+                "Temperature": "mean",
+                "TotalAvailableBikes": "sum",
+            }
+        )
+        .reset_index()
+    )
+    return metrics
+
+
+def a_month_of_stations() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    stations = 150
+    scrapes = pd.date_range("2023-10-01", periods=31 * 24 * 6, freq="10min")
+    rows = stations * len(scrapes)
+    timestamps = np.repeat(scrapes.to_numpy(), stations)
+    # One busy scrape so the busiest timestamp is unambiguous
+    timestamps[-stations // 2 :] = scrapes[100].to_datetime64()
+    df = pd.DataFrame(
+        {
+            "stationId": pd.Categorical(
+                np.tile([f"station{i}" for i in range(stations)], len(scrapes))
+            ),
+            "timestamp": timestamps,
+            "AvailableBikes": rng.integers(0, 20, rows).astype("int16"),
+            "TotalAvailableBikes": rng.integers(0, 20, rows).astype("int16"),
+            "Distance": rng.random(rows).astype("float32"),
+            "Lat": 57.7 + rng.random(rows) / 10,
+            "Long": 11.9 + rng.random(rows) / 10,
+            "Temperature": rng.normal(10, 5, rows).astype("float32"),
+            "Humidity": rng.uniform(40, 100, rows).astype("float32"),
+            "Wind_Speed": rng.uniform(0, 20, rows).astype("float32"),
+            "Precipitation": rng.random(rows).astype("float32"),
+            "Visibility": rng.uniform(1000, 50000, rows).astype("float32"),
+            "Snowfall": np.zeros(rows, dtype="float32"),
+        }
+    )
+    # A single hottest and coldest reading, as ties are broken differently
+    df.loc[1234, "Temperature"] = 40
+    df.loc[4321, "Temperature"] = -30
+    df["Snowfall"] = df["Snowfall"].where(df.index % 97 != 0, 0.5).astype("float32")
+    ts = df["timestamp"].dt
+    df["Year"] = ts.year.astype("int16")
+    df["Month"] = ts.month.astype("int8")
+    df["Day"] = ts.day.astype("int8")
+    df["Hour"] = ts.hour.astype("int8")
+    df["IsWeekend"] = (ts.dayofweek >= 5).astype("int8")
+    return df
+
+
+def test_metrics_engine_matches_the_per_metric_functions_and_is_faster(timed):
+    df = a_month_of_stations()
+
+    expected, legacy_seconds = timed(legacy_calculate_metrics, df)
+    metrics, engine_seconds = timed(MetricsEngine().compute, df)
+
+    logger.info(
+        f"{len(df)} rows: per metric functions {legacy_seconds:.3f} s, "
+        f"engine {engine_seconds:.3f} s"
+    )
+    for name, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(
+                metrics[name], value, check_dtype=False, rtol=1e-5
+            )
+        else:
+            assert metrics[name] == value, name
+    assert engine_seconds < legacy_seconds
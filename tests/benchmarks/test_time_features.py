@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.time_features import derive_time_features
+
+FEATURES = ["Year", "Month", "Day", "Hour", "Minute"]
+
+
+def legacy_time_features(df: pd.DataFrame) -> pd.DataFrame:
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601", errors="coerce")
+    df["Year"] = df["timestamp"].dt.year
+    df["Month"] = df["timestamp"].dt.month
+    df["Day"] = df["timestamp"].dt.day
+    df["Time_of_Day"] = df["timestamp"].dt.strftime("%H:%M:%S")
+    df["Time_of_Day"] = pd.to_datetime(df["Time_of_Day"], format="%H:%M:%S")
+    df["Hour"] = df["Time_of_Day"].dt.hour
+    df["Minute"] = df["Time_of_Day"].dt.minute
+    df["IsWeekend"] = (df["timestamp"].dt.dayofweek >= 5).astype(int)
+    return df
+
+
+def two_weeks_of_scrapes() -> pd.DataFrame:
+    # 150 stations scraped every ten minutes, with a few seconds of jitter
+    scrapes = pd.date_range("2023-10-01", periods=14 * 24 * 6, freq="10min")
+    timestamps = np.repeat(scrapes.to_numpy(), 150)
+    jitter = np.random.default_rng(3).integers(0, 59, len(timestamps))
+    return pd.DataFrame({"timestamp": timestamps + jitter.astype("timedelta64[s]")})
+
+
+def test_time_features_match_the_string_round_trip_and_are_faster(timed):
+    frame = two_weeks_of_scrapes()
+
+    expected, legacy_seconds = timed(lambda: legacy_time_features(frame.copy()))
+    derived, vectorised_seconds = timed(
+        lambda: derive_time_features(frame.copy(), features=(*FEATURES, "IsWeekend"))
+    )
+
+    logger.info(
+        f"{len(frame)} rows: string round trip {legacy_seconds:.3f} s, "
+        f"vectorised {vectorised_seconds:.3f} s"
+    )
+    for feature in [*FEATURES, "IsWeekend"]:
+        np.testing.assert_array_equal(derived[feature], expected[feature])
+    assert vectorised_seconds * 3 < legacy_seconds
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.functions import count_list_items
+
+STATIONS = 150
+# One scrape every ten minutes for two weeks
+SCRAPES = 14 * 24 * 6
+
+
+def legacy_count(values: pd.Series) -> pd.Series:
+    return values.apply(lambda x: len(eval(x)))
+
+
+def two_weeks_bike_ids() -> pd.Series:
+    rng = np.random.default_rng(7)
+    sizes = rng.integers(0, 25, STATIONS * SCRAPES)
+    return pd.Series([str([f"BIKE{i:05d}" for i in range(size)]) for size in sizes])
+
+
+def test_vectorised_count_matches_eval_and_is_faster(timed):
+    bike_ids = two_weeks_bike_ids()
+
+    expected, legacy_seconds = timed(legacy_count, bike_ids, repeat=1)
+    counted, vectorised_seconds = timed(count_list_items, bike_ids)
+
+    logger.info(
+        f"{len(bike_ids)} rows: eval {legacy_seconds:.3f} s, "
+        f"vectorised {vectorised_seconds:.3f} s"
+    )
+    pd.testing.assert_series_equal(counted, expected)
+    assert vectorised_seconds * 3 < legacy_seconds
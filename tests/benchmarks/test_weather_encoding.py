@@ -0,0 +1,54 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.csv_client.weather_encoder import WeatherEncoder
+
+
+def legacy_convert_to_csv(weather_data: dict) -> str:
+    hourly_data = weather_data["hourly"]
+    fieldnames = list(hourly_data)
+    csv_data = []
+    for i in range(len(hourly_data["time"])):
+        row = {field: hourly_data[field][i] for field in fieldnames}
+        csv_data.append(row)
+
+    csv_buffer = io.StringIO()
+    writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in csv_data:
+        writer.writerow(row)
+    return csv_buffer.getvalue()
+
+
+def three_years_of_weather(variables: int = 30) -> dict:
+    rng = np.random.default_rng(5)
+    hours = 3 * 365 * 24
+    times = pd.date_range("2020-01-01", periods=hours, freq="h")
+    hourly = {"time": times.strftime("%Y-%m-%dT%H:%M").tolist()}
+    for i in range(variables):
+        values = np.round(rng.normal(10, 5, hours), 1).tolist()
+        if i % 3 == 0:
+            # Integer variables, such as the relative humidity
+            values = [round(value) for value in values]
+        values[i] = None
+        hourly[f"variable_{i}"] = values
+    return {"hourly": hourly}
+
+
+def test_columnar_csv_matches_the_row_writer_and_is_faster(timed):
+    weather_data = three_years_of_weather()
+    encoder = WeatherEncoder(renames={})
+
+    expected, legacy_seconds = timed(legacy_convert_to_csv, weather_data)
+    encoded, columnar_seconds = timed(encoder.to_csv, weather_data)
+
+    logger.info(
+        f"{len(weather_data['hourly']['time'])} hours: DictWriter "
+        f"{legacy_seconds:.3f} s, columnar {columnar_seconds:.3f} s"
+    )
+    assert encoded == expected
+    assert columnar_seconds < legacy_seconds / 2
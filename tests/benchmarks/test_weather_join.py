@@ -0,0 +1,71 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bike_data_scraper.libs.time_features import derive_time_features
+from bike_data_scraper.libs.weather_join import join_hourly_weather
+
+WEATHER_COLUMNS = ["Temperature", "Humidity", "Wind_Speed", "Precipitation"]
+
+
+def legacy_merge(bikes: pd.DataFrame, weather: pd.DataFrame) -> pd.DataFrame:
+    df = pd.merge(
+        bikes,
+        weather,
+        how="left",
+        left_on=["Year", "Month", "Day", "Hour"],
+        right_on=["Year", "Month", "Day", "Hour"],
+    )
+    df.drop(columns=["Minute_y", "timestamp_y"], inplace=True)
+    df.rename(columns={"Minute_x": "Minute", "timestamp_x": "timestamp"}, inplace=True)
+    return df
+
+
+def two_weeks_frames() -> tuple:
+    rng = np.random.default_rng(11)
+    scrapes = pd.date_range("2023-10-01", periods=14 * 24 * 6, freq="10min")
+    bikes = pd.DataFrame(
+        {
+            "stationId": np.tile([f"station{i}" for i in range(150)], len(scrapes)),
+            "timestamp": np.repeat(scrapes.to_numpy(), 150),
+            "AvailableBikes": rng.integers(0, 20, 150 * len(scrapes)),
+        }
+    )
+    hours = pd.date_range("2023-10-01", periods=14 * 24, freq="h")
+    weather = pd.DataFrame(
+        {
+            "timestamp": hours,
+            **{c: rng.normal(size=len(hours)) for c in WEATHER_COLUMNS},
+        }
+    )
+    return derive_time_features(bikes), derive_time_features(weather)
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_hour_key_join_matches_the_merge_with_less_time_and_memory(timed):
+    bikes, weather = two_weeks_frames()
+
+    expected, merge_seconds = timed(lambda: legacy_merge(bikes, weather))
+    joined, join_seconds = timed(lambda: join_hourly_weather(bikes.copy(), weather))
+    _, merge_peak = peak_memory(lambda: legacy_merge(bikes, weather))
+    # The join writes into the frame it is given, so copy outside the trace
+    bikes_copy = bikes.copy()
+    _, join_peak = peak_memory(lambda: join_hourly_weather(bikes_copy, weather))
+
+    logger.info(
+        f"{len(bikes)} rows: merge {merge_seconds:.3f} s / {merge_peak >> 20} MiB, "
+        f"hour key join {join_seconds:.3f} s / {join_peak >> 20} MiB"
+    )
+    pd.testing.assert_frame_equal(joined, expected[list(joined.columns)])
+    assert join_seconds < merge_seconds
+    assert join_peak < merge_peak
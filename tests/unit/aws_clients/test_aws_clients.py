@@ -0,0 +1,48 @@
+from bike_data_scraper import aws_clients
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+
+def test_clients_are_created_once_per_process():
+    client = aws_clients.get_client("s3")
+
+    assert aws_clients.get_client("s3") is client
+    assert S3Handler().s3_client is client
+    assert "client s3" in aws_clients.creation_timings
+
+
+def test_clients_are_configured_for_pooling_and_adaptive_retries():
+    config = aws_clients.get_client("s3").meta.config
+
+    assert config.max_pool_connections == aws_clients.AWS_MAX_POOL_CONNECTIONS
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive is True
+
+
+def test_reset_creates_new_clients():
+    client = aws_clients.get_client("s3")
+
+    aws_clients.reset_clients()
+
+    assert aws_clients.get_client("s3") is not client
+
+
+def test_forked_process_gets_its_own_clients(monkeypatch):
+    client = aws_clients.get_client("s3")
+    resource = aws_clients.get_resource("dynamodb")
+
+    monkeypatch.setattr(aws_clients.os, "getpid", lambda: -1)
+
+    assert aws_clients.get_client("s3") is not client
+    assert aws_clients.get_resource("dynamodb") is not resource
+
+
+def test_worker_resources_are_not_shared():
+    assert aws_clients.new_resource("dynamodb") is not aws_clients.get_resource(
+        "dynamodb"
+    )
+
+
+def test_injected_client_takes_precedence():
+    stub = object()
+
+    assert S3Handler(s3_client=stub).s3_client is stub
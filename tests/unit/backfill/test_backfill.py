@@ -0,0 +1,159 @@
+import datetime as dt
+import importlib
+
+import boto3
+import pandas as pd
+import pytest
+from freezegun import freeze_time
+
+from bike_data_scraper.backfill import BackfillConfig, Checkpoint, run_backfill
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    DAY_BUCKET_INDEX_NAME,
+    BikeDataDynamoDbHandler,
+)
+from bike_data_scraper.libs.preprocessing import preprocess
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+from bike_data_scraper.s3_client.weather_store import WeatherDayStore
+
+DAYS = [dt.date(2023, 10, 15), dt.date(2023, 10, 16), dt.date(2023, 10, 17)]
+
+
+def scrape_items(day: dt.date) -> list[dict]:
+    items = []
+    for scrape in range(0, 24 * 6, 7):
+        timestamp = (
+            dt.datetime.combine(day, dt.time()) + dt.timedelta(minutes=10 * scrape)
+        ).isoformat()
+        for station in ["Central", "Harbour", "BIKE42"]:
+            bikes = (scrape + len(station)) % 5
+            items.append(
+                BikeDataDynamoDbHandler.create_dynamodb_item(
+                    pk=station,
+                    sk=timestamp,
+                    item={
+                        "Name": station,
+                        "AvailableBikes": str(bikes),
+                        "BikeIds": str([f"B{i}" for i in range(bikes)]),
+                        "IsOpen": "True",
+                        "Lat": "57.7",
+                        "Long": "11.9",
+                    },
+                )
+            )
+    return items
+
+
+def save_weather(store: WeatherDayStore, days: list[dt.date]):
+    for day in days:
+        times = pd.date_range(day, periods=24, freq="h")
+        store.save(
+            "default",
+            {
+                "hourly": {
+                    "time": times.strftime("%Y-%m-%dT%H:%M").tolist(),
+                    "temperature_2m": [round(0.5 * hour, 1) for hour in range(24)],
+                    "relativehumidity_2m": [70 + hour for hour in range(24)],
+                    "windspeed_10m": [3.5] * 24,
+                    "precipitation": [0.0] * 24,
+                    "visibility": [24000.0] * 24,
+                    "snowfall": [0.0] * 24,
+                }
+            },
+            today=dt.date(2023, 10, 18),
+        )
+
+
+@pytest.fixture()
+def backfill_setup(bike_table, s3_bucket, tmp_path):
+    BikeDataDynamoDbHandler(bike_table).create_bike_data_items(
+        [item for day in DAYS for item in scrape_items(day)]
+    )
+    config = BackfillConfig(
+        table_name=bike_table,
+        weather_bucket=s3_bucket,
+        destination_bucket=s3_bucket,
+    )
+    store = config.weather_store(S3Handler())
+    return config, store, str(tmp_path / "checkpoint.json")
+
+
+def read_processed(bucket: str, prefix: str) -> pd.DataFrame:
+    s3_handler = S3Handler()
+    keys = [
+        obj["Key"]
+        for obj in boto3.client("s3").list_objects_v2(Bucket=bucket, Prefix=prefix)[
+            "Contents"
+        ]
+    ]
+    return pd.concat(
+        [s3_handler.get_data_from_s3(bucket, key) for key in keys], ignore_index=True
+    )
+
+
+def sorted_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
+    return df.sort_values(["stationId", "timestamp"]).reset_index(drop=True)
+
+
+def test_backfill_matches_the_scheduled_lambdas(backfill_setup, monkeypatch):
+    config, store, checkpoint_path = backfill_setup
+    save_weather(store, DAYS)
+
+    summary = run_backfill(
+        DAYS[0], DAYS[-1], config, checkpoint_path, fetch_weather=False
+    )
+
+    # The export and preprocessing Lambdas over the same window
+    monkeypatch.setenv("BIKE_TABLE_NAME", config.table_name)
+    monkeypatch.setenv("S3_BUCKET_NAME", config.destination_bucket)
+    monkeypatch.setenv("BIKE_DATA_DAY_INDEX_NAME", DAY_BUCKET_INDEX_NAME)
+    export_lambda = importlib.reload(
+        importlib.import_module("bike_data_scraper.handlers.data_fetch_and_save_lambda")
+    )
+    with freeze_time("2023-10-18 01:00:00"):
+        message = export_lambda.lambda_handler(None, None)["message"]
+    export_key = message.rsplit("/", 1)[1]
+    bikes = S3Handler().get_data_from_s3(config.destination_bucket, export_key)
+    weather = store.load_window("default", DAYS[0], DAYS[-1])
+    expected = preprocess(weather, bikes)
+
+    assert summary["failed"] == {}
+    assert sum(result["rows"] for result in summary["results"].values()) == len(
+        expected
+    )
+    backfilled = read_processed(config.destination_bucket, "processed/")
+    pd.testing.assert_frame_equal(
+        sorted_frame(backfilled), sorted_frame(expected), check_dtype=False
+    )
+
+
+def test_a_failed_day_is_retried_by_the_next_run(backfill_setup):
+    config, store, checkpoint_path = backfill_setup
+    save_weather(store, DAYS[:2])
+
+    first = run_backfill(
+        DAYS[0], DAYS[-1], config, checkpoint_path, fetch_weather=False
+    )
+
+    assert list(first["failed"]) == ["2023-10-17"]
+    assert Checkpoint(checkpoint_path).days.keys() == {"2023-10-15", "2023-10-16"}
+
+    save_weather(store, DAYS[2:])
+    second = run_backfill(
+        DAYS[0], DAYS[-1], config, checkpoint_path, fetch_weather=False
+    )
+
+    assert list(second["results"]) == ["2023-10-17"]
+    assert second["failed"] == {}
+
+
+def test_days_run_in_a_process_pool(backfill_setup):
+    config, store, checkpoint_path = backfill_setup
+    save_weather(store, DAYS)
+
+    summary = run_backfill(
+        DAYS[0], DAYS[-1], config, checkpoint_path, workers=2, fetch_weather=False
+    )
+
+    assert sorted(summary["results"]) == [day.isoformat() for day in DAYS]
+    assert all(len(result["keys"]) == 2 for result in summary["results"].values())
@@ -0,0 +1,69 @@
+import boto3
+import moto
+import pytest
+
+from bike_data_scraper import aws_clients
+from bike_data_scraper.data_access_layer.dynamodb_handler import DAY_BUCKET_INDEX_NAME
+
+BIKE_TABLE_NAME = "test-dscrap-bike-data-table"
+BUCKET_NAME = "test-dscrap-bucket"
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    """Fake credentials so boto3 never reaches a real AWS account under moto."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-north-1")
+    # moto 4 can't decode the aws-chunked checksum trailers newer botocore sends
+    monkeypatch.setenv("AWS_REQUEST_CHECKSUM_CALCULATION", "when_required")
+
+
+@pytest.fixture(autouse=True)
+def fresh_aws_clients():
+    """Every test creates its clients under its own mocks and credentials."""
+    aws_clients.reset_clients()
+    yield
+    aws_clients.reset_clients()
+
+
+@pytest.fixture()
+def bike_table():
+    with moto.mock_dynamodb():
+        client = boto3.client("dynamodb")
+        client.create_table(
+            AttributeDefinitions=[
+                {"AttributeName": "stationId", "AttributeType": "S"},
+                {"AttributeName": "timestamp", "AttributeType": "S"},
+                {"AttributeName": "dayBucket", "AttributeType": "S"},
+            ],
+            TableName=BIKE_TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "stationId", "KeyType": "HASH"},
+                {"AttributeName": "timestamp", "KeyType": "RANGE"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": DAY_BUCKET_INDEX_NAME,
+                    "KeySchema": [
+                        {"AttributeName": "dayBucket", "KeyType": "HASH"},
+                        {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield BIKE_TABLE_NAME
+
+
+@pytest.fixture()
+def s3_bucket():
+    with moto.mock_s3():
+        boto3.client("s3").create_bucket(
+            Bucket=BUCKET_NAME,
+            CreateBucketConfiguration={"LocationConstraint": "eu-north-1"},
+        )
+        yield BUCKET_NAME
@@ -0,0 +1,76 @@
+import csv
+import io
+
+from bike_data_scraper.csv_client.csv_handler import (
+    IncrementalCSVEncoder,
+    UniversalCSVConverter,
+    write_items_csv,
+)
+
+ITEMS = [
+    {"stationId": "station1", "timestamp": "2023-10-18T15:10:35", "IsOpen": "True"},
+    {"stationId": "station2", "timestamp": "2023-10-18T15:10:35", "IsOpen": "False"},
+    {"stationId": "station3", "timestamp": "2023-10-18T15:20:35", "IsOpen": "True"},
+]
+
+
+def test_encode_matches_universal_csv_converter():
+    encoder = IncrementalCSVEncoder()
+
+    chunks = list(encoder.encode([ITEMS[:2], [], ITEMS[2:]]))
+
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode() == UniversalCSVConverter(data=ITEMS).to_csv()
+    assert encoder.rows == 3
+
+
+def test_encode_takes_header_from_first_page_union():
+    pages = [[{"stationId": "station1"}, {"stationId": "station2", "Distance": "3"}]]
+
+    csv_data = b"".join(IncrementalCSVEncoder().encode(pages)).decode()
+
+    assert csv_data == "stationId,Distance\r\nstation1,\r\nstation2,3\r\n"
+
+
+def test_encode_drops_columns_first_seen_in_later_pages():
+    pages = [[{"stationId": "station1"}], [{"stationId": "station2", "Extra": "x"}]]
+
+    csv_data = b"".join(IncrementalCSVEncoder().encode(pages)).decode()
+
+    assert csv_data == "stationId\r\nstation1\r\nstation2\r\n"
+
+
+def test_encode_without_rows_yields_nothing():
+    encoder = IncrementalCSVEncoder()
+
+    assert list(encoder.encode([[], []])) == []
+    assert encoder.rows == 0
+
+
+def test_write_items_csv_uses_the_union_of_every_items_keys():
+    items = [{"stationId": "station1"}, {"stationId": "station2", "Distance": 3}]
+    stream = io.BytesIO()
+
+    rows = write_items_csv(items, stream, chunk_rows=1)
+
+    assert rows == 2
+    assert stream.getvalue() == b"stationId,Distance\r\nstation1,\r\nstation2,3\r\n"
+
+
+def test_write_items_csv_matches_dict_writer():
+    expected = io.StringIO()
+    dict_writer = csv.DictWriter(expected, fieldnames=list(ITEMS[0]))
+    dict_writer.writeheader()
+    dict_writer.writerows(ITEMS)
+    stream = io.BytesIO()
+
+    write_items_csv(ITEMS, stream)
+
+    assert stream.getvalue().decode() == expected.getvalue()
+
+
+def test_write_items_csv_writes_the_header_of_given_columns_only():
+    stream = io.BytesIO()
+
+    assert write_items_csv([], stream, columns=["stationId"]) == 0
+    assert stream.getvalue() == b"stationId\r\n"
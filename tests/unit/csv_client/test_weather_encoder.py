@@ -0,0 +1,66 @@
+import csv
+import io
+
+import pandas as pd
+import pytest
+
+from bike_data_scraper.csv_client.weather_encoder import WeatherEncoder
+
+WEATHER_DATA = {
+    "hourly": {
+        "time": ["2023-10-01T00:00", "2023-10-01T01:00", "2023-10-01T02:00"],
+        "temperature_2m": [10.5, None, -0.3],
+        "relativehumidity_2m": [80, 81, 81],
+        "windspeed_10m": [3.2, 3.2, 4.0],
+        "precipitation": [0.0, 0.1, 0.0],
+        "visibility": [24140.0, 24140.0, 20000.0],
+        "snowfall": [0.0, 0.0, 0.0],
+    }
+}
+
+
+def test_csv_is_renamed_and_keeps_the_api_values():
+    csv_str = WeatherEncoder().to_csv(WEATHER_DATA)
+
+    assert csv_str.splitlines() == [
+        "Time,Temperature,Humidity,Wind_Speed,Precipitation,Visibility,Snowfall",
+        "2023-10-01T00:00,10.5,80,3.2,0.0,24140.0,0.0",
+        "2023-10-01T01:00,,81,3.2,0.1,24140.0,0.0",
+        "2023-10-01T02:00,-0.3,81,4.0,0.0,20000.0,0.0",
+    ]
+
+
+def test_csv_is_what_csv_writer_writes():
+    hourly = {
+        **WEATHER_DATA["hourly"],
+        "relativehumidity_2m": [80, None, 81],
+        "cloud, cover": [1, 2, 3],
+    }
+    expected = io.StringIO()
+    writer = csv.writer(expected)
+    writer.writerow(hourly)
+    writer.writerows(zip(*hourly.values()))
+
+    encoded = WeatherEncoder(renames={}).to_csv({"hourly": hourly})
+
+    assert encoded == expected.getvalue()
+    assert "\r\n2023-10-01T01:00,,,3.2" in encoded
+
+
+def test_csv_matches_pandas():
+    weather_data = {"hourly": {**WEATHER_DATA["hourly"], "cloud, cover": [1, 2, 3]}}
+
+    df = pd.read_csv(io.StringIO(WeatherEncoder().to_csv(weather_data)))
+    expected = pd.DataFrame(WeatherEncoder().columns(weather_data))
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_parquet_is_typed():
+    pytest.importorskip("pyarrow")
+
+    df = pd.read_parquet(io.BytesIO(WeatherEncoder().to_parquet(WEATHER_DATA)))
+
+    assert df["Time"].dtype == "datetime64[ns]"
+    assert df["Temperature"].dtype == "float32"
+    assert df["Humidity"].tolist() == [80, 81, 81]
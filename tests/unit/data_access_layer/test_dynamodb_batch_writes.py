@@ -0,0 +1,89 @@
+import boto3
+import pytest
+
+from bike_data_scraper.data_access_layer import dynamodb_handler
+from bike_data_scraper.data_access_layer.dynamodb_handler import BikeDataDynamoDbHandler
+
+
+def station_items(count: int, timestamp: str = "2023-10-18T15:10:35.982498"):
+    return [
+        {
+            "stationId": f"station{i}",
+            "timestamp": timestamp,
+            "AvailableBikes": str(i % 20),
+            "BikeIds": "[]",
+        }
+        for i in range(count)
+    ]
+
+
+def scan_all(table_name: str) -> list:
+    table = boto3.resource("dynamodb").Table(table_name)
+    response = table.scan()
+    items = response["Items"]
+    while "LastEvaluatedKey" in response:
+        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
+        items.extend(response["Items"])
+    return items
+
+
+def test_create_bike_data_items_writes_thousands_of_stations(bike_table):
+    handler = BikeDataDynamoDbHandler(bike_table)
+
+    metrics = handler.create_bike_data_items(station_items(3000))
+
+    assert metrics["items"] == 3000
+    assert metrics["batches"] == 120
+    assert metrics["retries"] == 0
+    assert metrics["latency_ms"] >= 0
+    assert len(scan_all(bike_table)) == 3000
+
+
+def test_create_bike_data_items_collapses_duplicate_keys(bike_table):
+    handler = BikeDataDynamoDbHandler(bike_table)
+    items = station_items(3) + [dict(station_items(1)[0], AvailableBikes="7")]
+
+    metrics = handler.create_bike_data_items(items)
+
+    assert metrics["items"] == 3
+    stored = {item["stationId"]: item for item in scan_all(bike_table)}
+    assert stored["station0"]["AvailableBikes"] == "7"
+
+
+def test_create_bike_data_items_retries_unprocessed_items(bike_table, mocker):
+    handler = BikeDataDynamoDbHandler(bike_table)
+    sleep = mocker.patch.object(dynamodb_handler.time, "sleep")
+    batch_write_item = handler.dynamodb.batch_write_item
+    calls = []
+
+    def flaky_batch_write_item(RequestItems):
+        calls.append(RequestItems)
+        if len(calls) == 1:
+            requests = RequestItems[bike_table]
+            batch_write_item(RequestItems={bike_table: requests[:10]})
+            return {"UnprocessedItems": {bike_table: requests[10:]}}
+        return batch_write_item(RequestItems=RequestItems)
+
+    mocker.patch.object(
+        handler.dynamodb, "batch_write_item", side_effect=flaky_batch_write_item
+    )
+
+    metrics = handler.create_bike_data_items(station_items(25))
+
+    assert metrics["retries"] == 1
+    assert len(calls[1][bike_table]) == 15
+    sleep.assert_called_once()
+    assert len(scan_all(bike_table)) == 25
+
+
+def test_create_bike_data_items_gives_up_after_max_retries(bike_table, mocker):
+    handler = BikeDataDynamoDbHandler(bike_table)
+    mocker.patch.object(dynamodb_handler.time, "sleep")
+    mocker.patch.object(
+        handler.dynamodb,
+        "batch_write_item",
+        side_effect=lambda RequestItems: {"UnprocessedItems": RequestItems},
+    )
+
+    with pytest.raises(Exception, match="after 8 retries"):
+        handler.create_bike_data_items(station_items(5))
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from freezegun import freeze_time
+
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    DAY_BUCKET_ATTRIBUTE,
+    DAY_BUCKET_INDEX_NAME,
+    BikeDataDynamoDbHandler,
+)
+
+TIMESTAMPS = [
+    "2023-09-25T14:50:34.453006",
+    "2023-10-05T15:00:34.581457",
+    "2023-10-12T15:10:35.982498",
+    "2023-10-18T15:10:35.982498",
+    "2023-10-18T23:59:59.999999",
+    "2023-10-19T00:00:00.000000",
+]
+
+
+def write_items(table_name: str):
+    handler = BikeDataDynamoDbHandler(table_name)
+    handler.create_bike_data_items(
+        [
+            BikeDataDynamoDbHandler.create_dynamodb_item(
+                pk=f"station{i}", sk=timestamp, item={"AvailableBikes": str(i)}
+            )
+            for i, timestamp in enumerate(TIMESTAMPS, start=1)
+        ]
+    )
+
+
+def test_create_dynamodb_item_adds_day_bucket():
+    item = BikeDataDynamoDbHandler.create_dynamodb_item(
+        pk="station1", sk="2023-10-18T15:10:35.982498", item={"IsOpen": "True"}
+    )
+
+    assert item == {
+        "stationId": "station1",
+        "timestamp": "2023-10-18T15:10:35.982498",
+        "IsOpen": "True",
+        "dayBucket": "2023-10-18",
+    }
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_day_index_query_returns_the_two_weeks_window(bike_table):
+    write_items(bike_table)
+    handler = BikeDataDynamoDbHandler(bike_table, day_index_name=DAY_BUCKET_INDEX_NAME)
+
+    items = handler.get_bike_data_last_two_weeks_from_datetime(datetime.now())
+
+    assert sorted(item["AvailableBikes"] for item in items) == ["2", "3", "4", "5"]
+    assert all(DAY_BUCKET_ATTRIBUTE not in item for item in items)
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_day_index_query_matches_scan_fallback(bike_table):
+    write_items(bike_table)
+    starting_date = datetime.now()
+
+    queried = BikeDataDynamoDbHandler(
+        bike_table, day_index_name=DAY_BUCKET_INDEX_NAME
+    ).get_bike_data_last_two_weeks_from_datetime(starting_date)
+    scanned = BikeDataDynamoDbHandler(
+        bike_table
+    ).get_bike_data_last_two_weeks_from_datetime(starting_date)
+
+    def by_key(items):
+        return sorted(items, key=lambda item: (item["stationId"], item["timestamp"]))
+
+    assert by_key(queried) == by_key(scanned)
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_day_index_query_issues_one_query_per_day(bike_table, mocker):
+    write_items(bike_table)
+    handler = BikeDataDynamoDbHandler(bike_table, day_index_name=DAY_BUCKET_INDEX_NAME)
+    query = mocker.spy(handler.bike_table, "query")
+    scan = mocker.spy(handler.bike_table, "scan")
+
+    handler.get_bike_data_last_two_weeks_from_datetime(datetime.now())
+
+    assert query.call_count == 15
+    assert scan.call_count == 0
+
+
+def test_day_index_query_without_items_returns_message(bike_table):
+    handler = BikeDataDynamoDbHandler(bike_table, day_index_name=DAY_BUCKET_INDEX_NAME)
+
+    response = handler.get_bike_data_last_two_weeks_from_datetime(datetime(2023, 1, 1))
+
+    assert response == {"message": "No items found in DynamoDB for the last two weeks."}
@@ -0,0 +1,101 @@
+import zlib
+from datetime import datetime
+
+import boto3
+import pytest
+from freezegun import freeze_time
+
+from bike_data_scraper.data_access_layer.dynamodb_handler import BikeDataDynamoDbHandler
+
+IN_WINDOW = "2023-10-12T15:10:35.982498"
+OUT_OF_WINDOW = "2023-09-01T15:10:35.982498"
+
+
+@pytest.fixture()
+def large_bike_table(bike_table):
+    """~3 MB of items so every scan spans several 1 MB pages."""
+    padding = "x" * 1000
+    items = [
+        {
+            "stationId": f"station{i}",
+            "timestamp": IN_WINDOW if i % 2 else OUT_OF_WINDOW,
+            "AvailableBikes": str(i),
+            "Padding": padding,
+        }
+        for i in range(3000)
+    ]
+    BikeDataDynamoDbHandler(bike_table).create_bike_data_items(items)
+    return bike_table
+
+
+@pytest.fixture()
+def segmented_scan(mocker):
+    """moto 4 ignores Segment/TotalSegments, so split pages by partition key hash
+    the way DynamoDB does, and record which segments were scanned."""
+    scanned_segments = []
+    session_class = boto3.session.Session
+
+    class SegmentedTable:
+        def __init__(self, table):
+            self.table = table
+
+        def scan(self, Segment, TotalSegments, **kwargs):
+            scanned_segments.append(Segment)
+            response = self.table.scan(**kwargs)
+            response["Items"] = [
+                item
+                for item in response["Items"]
+                if zlib.crc32(item["stationId"].encode()) % TotalSegments == Segment
+            ]
+            return response
+
+    class SegmentedResource:
+        def __init__(self, resource):
+            self.resource = resource
+
+        def Table(self, name):
+            return SegmentedTable(self.resource.Table(name))
+
+    class SegmentedSession:
+        def resource(self, service_name, **kwargs):
+            return SegmentedResource(session_class().resource(service_name, **kwargs))
+
+    mocker.patch.object(boto3.session, "Session", SegmentedSession)
+    return scanned_segments
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_serial_scan_keeps_filter_on_every_page(large_bike_table):
+    handler = BikeDataDynamoDbHandler(large_bike_table)
+
+    items = handler.get_bike_data_last_two_weeks_from_datetime(datetime.now())
+
+    assert len(items) == 1500
+    assert {item["timestamp"] for item in items} == {IN_WINDOW}
+
+
+@freeze_time("2023-10-18 12:00:00")
+@pytest.mark.parametrize("scan_workers", [2, 4, 7])
+def test_parallel_scan_matches_serial_scan(
+    large_bike_table, segmented_scan, scan_workers
+):
+    serial = BikeDataDynamoDbHandler(
+        large_bike_table
+    ).get_bike_data_last_two_weeks_from_datetime(datetime.now())
+    parallel = BikeDataDynamoDbHandler(
+        large_bike_table, scan_workers=scan_workers
+    ).get_bike_data_last_two_weeks_from_datetime(datetime.now())
+
+    assert len(parallel) == 1500
+    assert set(segmented_scan) == set(range(scan_workers))
+    assert sorted(item["stationId"] for item in parallel) == sorted(
+        item["stationId"] for item in serial
+    )
+
+
+def test_parallel_scan_without_items_returns_message(bike_table, segmented_scan):
+    handler = BikeDataDynamoDbHandler(bike_table, scan_workers=4)
+
+    response = handler.get_bike_data_last_two_weeks_from_datetime(datetime(2023, 1, 1))
+
+    assert response == {"message": "No items found in DynamoDB for the last two weeks."}
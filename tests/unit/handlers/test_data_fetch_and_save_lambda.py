@@ -0,0 +1,155 @@
+import csv
+import functools
+import importlib
+import io
+import tracemalloc
+from datetime import datetime, timedelta
+
+import boto3
+import pytest
+from freezegun import freeze_time
+
+from bike_data_scraper import aws_clients
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    DAY_BUCKET_INDEX_NAME,
+    BikeDataDynamoDbHandler,
+)
+from bike_data_scraper.s3_client import s3_handler as s3_handler_module
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+
+@pytest.fixture()
+def export_lambda(bike_table, s3_bucket, monkeypatch):
+    monkeypatch.setenv("BIKE_TABLE_NAME", bike_table)
+    monkeypatch.setenv("S3_BUCKET_NAME", s3_bucket)
+    monkeypatch.setenv("BIKE_DATA_DAY_INDEX_NAME", DAY_BUCKET_INDEX_NAME)
+    module = importlib.import_module(
+        "bike_data_scraper.handlers.data_fetch_and_save_lambda"
+    )
+    return importlib.reload(module)
+
+
+def synthetic_station(i: int, timestamp: str) -> dict:
+    return {
+        "StationId": str(i % 300),
+        "Name": f"Station {i % 300}",
+        "AvailableBikes": str(i % 17),
+        "BikeIds": "['BIKE1', 'BIKE2']",
+        "IsOpen": "True",
+        "Lat": "57.7089",
+        "Long": "11.9746",
+    }
+
+
+def read_exported_rows(bucket: str) -> list[dict]:
+    s3_client = boto3.client("s3")
+    key = s3_client.list_objects_v2(Bucket=bucket)["Contents"][0]["Key"]
+    body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read().decode()
+    return list(csv.DictReader(io.StringIO(body)))
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_lambda_handler_exports_two_weeks_to_s3(export_lambda, bike_table, s3_bucket):
+    start = datetime(2023, 10, 10)
+    items = [
+        BikeDataDynamoDbHandler.create_dynamodb_item(
+            pk=f"station{i % 300}",
+            sk=(start + timedelta(minutes=10 * (i // 300))).isoformat(),
+            item=synthetic_station(i, ""),
+        )
+        for i in range(2000)
+    ]
+    BikeDataDynamoDbHandler(bike_table).create_bike_data_items(items)
+
+    response = export_lambda.lambda_handler(None, None)
+
+    rows = read_exported_rows(s3_bucket)
+    assert response["message"].startswith("Data from the last two weeks saved")
+    assert len(rows) == 2000
+    assert "dayBucket" not in rows[0]
+    assert {row["AvailableBikes"] for row in rows} == {str(i) for i in range(17)}
+
+
+@freeze_time("2023-10-18 12:00:00")
+def test_lambda_handler_without_items_writes_nothing(export_lambda, s3_bucket):
+    response = export_lambda.lambda_handler(None, None)
+
+    assert response == {"message": "No items found in DynamoDB for the last two weeks."}
+    assert "Contents" not in boto3.client("s3").list_objects_v2(Bucket=s3_bucket)
+
+
+class DiscardingS3Client:
+    """Counts uploaded bytes without keeping them, unlike moto's in-memory store."""
+
+    def __init__(self):
+        self.uploaded_bytes = 0
+        self.parts = 0
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-id"}
+
+    def upload_part(self, Body, PartNumber, **kwargs):
+        self.uploaded_bytes += len(Body)
+        self.parts += 1
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        return {}
+
+    def put_object(self, Body, **kwargs):
+        self.uploaded_bytes += len(Body)
+        self.parts += 1
+
+
+def export_peak_memory(export_lambda, mocker, item_count: int, page_size: int):
+    """Runs the export over synthetic pages, returns (peak bytes, S3 client)."""
+
+    def synthetic_pages(self, starting_date):
+        timestamp = starting_date.isoformat()
+        for start in range(0, item_count, page_size):
+            yield [
+                {"stationId": f"station{i}", "timestamp": timestamp}
+                | synthetic_station(i, timestamp)
+                for i in range(start, start + page_size)
+            ]
+
+    mocker.patch.object(
+        BikeDataDynamoDbHandler,
+        "iter_bike_data_last_two_weeks_from_datetime",
+        synthetic_pages,
+    )
+    s3_handler = S3Handler()
+    s3_handler.s3_client = DiscardingS3Client()
+    mocker.patch.object(export_lambda, "S3Handler", return_value=s3_handler)
+
+    # A warm invocation: the clients (and their service models) already exist
+    aws_clients.get_resource("dynamodb")
+    tracemalloc.start()
+    try:
+        export_lambda.lambda_handler(None, None)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, s3_handler.s3_client
+
+
+def test_lambda_handler_memory_stays_flat_across_pages(
+    export_lambda, bike_table, mocker, monkeypatch
+):
+    # Small parts, so a few thousand rows already take a multipart upload
+    part_size = 64 * 1024
+    monkeypatch.setattr(s3_handler_module, "MULTIPART_MIN_PART_SIZE", part_size)
+    mocker.patch.object(
+        S3Handler,
+        "upload_stream_to_s3",
+        functools.partialmethod(S3Handler.upload_stream_to_s3, part_size=part_size),
+    )
+
+    small_peak, _ = export_peak_memory(export_lambda, mocker, 5_000, page_size=500)
+    large_peak, s3_client = export_peak_memory(
+        export_lambda, mocker, 20_000, page_size=500
+    )
+
+    assert s3_client.parts > 10
+    # Four times the rows, not four times the memory
+    assert large_peak < 1.5 * small_peak
@@ -0,0 +1,60 @@
+import importlib
+import sys
+
+import boto3
+import pandas as pd
+import pytest
+
+MODULE = "bike_data_scraper.handlers.data_preprocessing_2weeks"
+
+
+@pytest.fixture()
+def preprocessing_env(s3_bucket, monkeypatch):
+    monkeypatch.setenv("S3_SOURCE_BUCKET", s3_bucket)
+    monkeypatch.setenv("S3_DESTINATION_BUCKET", s3_bucket)
+    monkeypatch.setenv("BIKES_KEY", "bikes.csv")
+    monkeypatch.setenv("WEATHER_KEY", "weather.csv")
+    monkeypatch.delitem(sys.modules, MODULE, raising=False)
+    return s3_bucket
+
+
+def object_keys(bucket: str) -> list[str]:
+    response = boto3.client("s3").list_objects_v2(Bucket=bucket)
+    return sorted(obj["Key"] for obj in response.get("Contents", []))
+
+
+def test_import_does_not_run_the_handler(preprocessing_env):
+    # The handler would fail on the missing source objects
+    importlib.import_module(MODULE)
+
+    assert object_keys(preprocessing_env) == []
+
+
+def test_handler_saves_processed_datasets(preprocessing_env):
+    times = pd.date_range("2023-10-14", periods=24, freq="h")
+    weather = pd.DataFrame(
+        {"Time": times.strftime("%Y-%m-%dT%H:%M"), "Temperature": 12.5}
+    )
+    bikes = pd.DataFrame(
+        {
+            "stationId": ["Central", "BIKE1"],
+            "timestamp": ["2023-10-14T10:05:00", "2023-10-14T11:05:00"],
+            "BikeIds": ["['A']", "[]"],
+        }
+    )
+    s3_client = boto3.client("s3")
+    for key, df in [("weather.csv", weather), ("bikes.csv", bikes)]:
+        s3_client.put_object(
+            Bucket=preprocessing_env, Key=key, Body=df.to_csv(index=False)
+        )
+
+    result = importlib.import_module(MODULE).lambda_handler(None, None)
+
+    assert result["rows"] == 2
+    assert "join_weather" in result["timings_ms"]
+    assert object_keys(preprocessing_env) == [
+        "bikes.csv",
+        "processed/2023-10-14-2023-10-14/single_bikes/SingleBikes.csv",
+        "processed/2023-10-14-2023-10-14/station_bikes/StationaryStations.csv",
+        "weather.csv",
+    ]
@@ -0,0 +1,80 @@
+import importlib
+from datetime import datetime
+
+import pytest
+from freezegun import freeze_time
+
+from bike_data_scraper.data_access_layer.dynamodb_handler import (
+    DAY_BUCKET_INDEX_NAME,
+    BikeDataDynamoDbHandler,
+)
+from bike_data_scraper.libs.station_deltas import forward_fill_station_samples
+from bike_data_scraper.libs.station_samples import decode_station_pages
+
+
+def stations(bikes: list[int]) -> list[dict]:
+    return [
+        {"StationId": i, "Name": f"station{i}", "AvailableBikes": n, "IsOpen": True}
+        for i, n in enumerate(bikes)
+    ]
+
+
+@pytest.fixture()
+def scraper(bike_table, monkeypatch):
+    monkeypatch.setenv("BIKE_DATA_TABLE_NAME", bike_table)
+    monkeypatch.setenv("SCRAPER_DELTA_MODE", "true")
+    module = importlib.reload(
+        importlib.import_module("bike_data_scraper.handlers.data_scraper")
+    )
+
+    def scrape(at: str, bikes: list[int]) -> dict:
+        monkeypatch.setattr(module, "fetch_stations", lambda: (stations(bikes), {}))
+        with freeze_time(at):
+            return module.lambda_handler(None, None)
+
+    return scrape
+
+
+def export(table_name: str, at: str) -> list[dict]:
+    handler = BikeDataDynamoDbHandler(table_name, day_index_name=DAY_BUCKET_INDEX_NAME)
+    with freeze_time(at):
+        pages = handler.iter_bike_data_last_two_weeks_from_datetime(datetime.now())
+        pages = decode_station_pages(forward_fill_station_samples(pages))
+        return [row for page in pages for row in page]
+
+
+def test_delta_mode_writes_changed_stations_only(scraper, bike_table):
+    assert scraper("2023-10-18 10:00:00", [1, 2, 3])["skipped"] == 0
+    metrics = scraper("2023-10-18 10:10:00", [1, 5, 3])
+
+    # The changed station and the scrape marker
+    assert metrics["items"] == 2
+    assert metrics["skipped"] == 2
+
+
+def test_first_scrape_of_a_day_is_a_keyframe(scraper):
+    scraper("2023-10-18 23:50:00", [1, 2])
+
+    assert scraper("2023-10-19 00:00:00", [1, 2])["skipped"] == 0
+
+
+def test_export_rebuilds_the_full_series(scraper, bike_table):
+    scrapes = [
+        ("2023-10-18 10:00:00", [1, 2, 3]),
+        ("2023-10-18 10:10:00", [1, 5, 3]),
+        ("2023-10-18 10:20:00", [1, 5, 3]),
+        ("2023-10-18 10:30:00", [0, 5]),
+    ]
+    for at, bikes in scrapes:
+        scraper(at, bikes)
+
+    rows = export(bike_table, "2023-10-18 12:00:00")
+
+    expected = [
+        (datetime.fromisoformat(at).isoformat(), f"station{i}", n)
+        for at, bikes in scrapes
+        for i, n in enumerate(bikes)
+    ]
+    assert sorted(
+        (row["timestamp"], row["stationId"], row["AvailableBikes"]) for row in rows
+    ) == sorted(expected)
@@ -0,0 +1,136 @@
+import importlib
+import json
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.metrics_engine import CORRELATION_COLUMNS
+
+STATION_KEY = "processed/station_bikes/StationaryStations.csv"
+SINGLE_KEY = "processed/single_bikes/SingleBikes.csv"
+
+
+def processed_frame(prefix: str, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = 600
+    df = pd.DataFrame(
+        {
+            "stationId": [f"{prefix}{i % 20}" for i in range(rows)],
+            "timestamp": pd.date_range("2023-10-01", periods=rows, freq="7min"),
+            "TotalAvailableBikes": rng.integers(0, 10, rows),
+        }
+    )
+    for column in CORRELATION_COLUMNS:
+        df[column] = rng.integers(0, 30, rows)
+    df["IsWeekend"] = df["timestamp"].dt.dayofweek >= 5
+    df["IsWeekend"] = df["IsWeekend"].astype(int)
+    return df
+
+
+@pytest.fixture()
+def graphs_lambda(s3_bucket, monkeypatch):
+    s3_client = boto3.client("s3")
+    for key, prefix, seed in [(STATION_KEY, "station", 1), (SINGLE_KEY, "BIKE", 2)]:
+        body = processed_frame(prefix, seed).to_csv(index=False)
+        s3_client.put_object(Bucket=s3_bucket, Key=key, Body=body)
+
+    monkeypatch.setenv("GRAPHS_SOURCE_BUCKET", s3_bucket)
+    monkeypatch.setenv("GRAPHS_DESTINATION_BUCKET", s3_bucket)
+    monkeypatch.setenv("STATION_BIKE_DATA", STATION_KEY)
+    monkeypatch.setenv("SINGLE_BIKE_DATA", SINGLE_KEY)
+
+    def load(mode: str, incremental: bool = False):
+        monkeypatch.setenv("GRAPHS_EXECUTION_MODE", mode)
+        monkeypatch.setenv("GRAPHS_INCREMENTAL_METRICS", str(incremental).lower())
+        module = importlib.import_module(
+            "bike_data_scraper.handlers.graphs_data_scraper"
+        )
+        return importlib.reload(module)
+
+    return load
+
+
+def read_results(bucket: str) -> dict:
+    s3_client = boto3.client("s3")
+    results = {}
+    for sub_path in ["station_bikes", "single_bikes"]:
+        key = f"graphs_data/{sub_path}/2023-10-01-2023-10-03/data.json"
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        results[sub_path] = json.loads(body)
+    return results
+
+
+def test_parallel_mode_saves_the_same_results_as_sequential(graphs_lambda, s3_bucket):
+    response = graphs_lambda("sequential").lambda_handler(None, None)
+    sequential = read_results(s3_bucket)
+
+    parallel_response = graphs_lambda("parallel").lambda_handler(None, None)
+    parallel = read_results(s3_bucket)
+
+    assert parallel == sequential
+    assert sequential["station_bikes"]["number_of_bikes_available"] == "20"
+    assert response["mode"] == "sequential"
+    assert parallel_response["mode"] == "parallel"
+    assert set(parallel_response["timings_ms"]) == {
+        "download",
+        "metrics",
+        "upload",
+        "total",
+    }
+
+
+def test_parallel_mode_falls_back_when_workers_cannot_start(
+    graphs_lambda, s3_bucket, monkeypatch
+):
+    module = graphs_lambda("parallel")
+
+    def no_processes(datasets):
+        raise OSError("Function not implemented")
+
+    monkeypatch.setattr(module, "calculate_metrics_in_processes", no_processes)
+    response = module.lambda_handler(None, None)
+
+    assert response["mode"] == "parallel"
+    assert read_results(s3_bucket)["single_bikes"]["number_of_bikes_available"]
+
+
+def test_incremental_metrics_cache_all_but_the_latest_day(graphs_lambda, s3_bucket):
+    graphs_lambda("sequential").lambda_handler(None, None)
+    expected = read_results(s3_bucket)
+
+    for mode in ["sequential", "parallel"]:
+        graphs_lambda(mode, incremental=True).lambda_handler(None, None)
+        results = read_results(s3_bucket)
+        for sub_path in results:
+            # Rebuilt from moments, so equal up to floating point rounding
+            assert results[sub_path].pop("correlation_matrix") == [
+                pytest.approx(row, abs=1e-12)
+                for row in expected[sub_path]["correlation_matrix"]
+            ]
+            assert results[sub_path] == {
+                k: v for k, v in expected[sub_path].items() if k != "correlation_matrix"
+            }
+
+    cached = boto3.client("s3").list_objects_v2(
+        Bucket=s3_bucket, Prefix="graphs_data/partials/"
+    )
+    assert sorted(obj["Key"] for obj in cached["Contents"]) == [
+        f"graphs_data/partials/{sub_path}/manifest.json"
+        for sub_path in ["single_bikes", "station_bikes"]
+    ]
+
+
+def test_incremental_metrics_follow_a_reprocessed_day(graphs_lambda, s3_bucket):
+    graphs_lambda("sequential", incremental=True).lambda_handler(None, None)
+
+    # A reprocessing rewrites the first day of the station data
+    df = processed_frame("station", 1)
+    df.loc[df["timestamp"] < "2023-10-02", "Temperature"] = 40
+    boto3.client("s3").put_object(
+        Bucket=s3_bucket, Key=STATION_KEY, Body=df.to_csv(index=False)
+    )
+    graphs_lambda("sequential", incremental=True).lambda_handler(None, None)
+
+    assert read_results(s3_bucket)["station_bikes"]["warmest_temperature"] == "40.0"
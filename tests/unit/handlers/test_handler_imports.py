@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The heavy modules every handler must not load on import; they are what a
+# regression usually brings back. The import time itself is measured in
+# tests/benchmarks/test_handler_import_time.py.
+HANDLER_FORBIDDEN_MODULES = {
+    "check_ec2_status": ("boto3", "loguru", "pandas"),
+    "shut_down_ec2_training_instance": ("boto3", "loguru", "pandas"),
+    "start_ec_2_instance": ("boto3", "loguru", "pandas"),
+    "data_scraper": ("boto3", "loguru", "pandas", "numpy"),
+    "data_fetch_and_save_lambda": ("boto3", "loguru", "pandas", "numpy"),
+    "data_preprocessing_2weeks": ("boto3", "sklearn"),
+    "graphs_data_scraper": ("boto3", "sklearn"),
+    "train_test_split_for_training": ("boto3", "sklearn"),
+    "weather_data_handler": ("boto3",),
+}
+HANDLER_ENV = {
+    "BIKE_DATA_TABLE_NAME": "bike-table",
+    "BIKE_TABLE_NAME": "bike-table",
+    "S3_BUCKET_NAME": "bucket",
+    "BIKES_KEY": "bikes.csv",
+    "S3_DESTINATION_BUCKET": "destination",
+    "S3_SOURCE_BUCKET": "source",
+    "AWS_DEFAULT_REGION": "eu-north-1",
+}
+
+
+def loaded_modules(handler: str) -> set:
+    """The modules a fresh interpreter has loaded after importing the handler."""
+    module = f"bike_data_scraper.handlers.{handler}"
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+        env={**os.environ, **HANDLER_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize("handler", sorted(HANDLER_FORBIDDEN_MODULES))
+def test_handler_does_not_import_heavy_modules(handler):
+    forbidden = set(HANDLER_FORBIDDEN_MODULES[handler])
+
+    imported = loaded_modules(handler) & forbidden
+
+    assert not imported, f"{handler} imports {imported}"
@@ -0,0 +1,132 @@
+import datetime as dt
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+from freezegun import freeze_time
+
+from bike_data_scraper import open_meteo
+from bike_data_scraper.concurrent_fetch import FetchResult
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+from bike_data_scraper.s3_client.weather_store import WeatherDayStore
+
+
+class StubOpenMeteo:
+    """Answers /?start_date=..&end_date=.. with every hour of those days."""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                start, end = query["start_date"][0], query["end_date"][0]
+                stub.requests.append((start, end))
+                body = json.dumps(hourly_response(start, end)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def hourly_response(start: str, end: str) -> dict:
+    times = pd.date_range(start, f"{end}T23:00", freq="h")
+    return {
+        "hourly": {
+            "time": times.strftime("%Y-%m-%dT%H:%M").tolist(),
+            "temperature_2m": [10.0] * len(times),
+        }
+    }
+
+
+class RecordingFetcher:
+    """Answers every target with all hours of the days its URL asks for."""
+
+    def __init__(self):
+        self.urls = []
+
+    def fetch_all(self, targets):
+        for target in targets:
+            self.urls.append(target.url)
+            query = parse_qs(urlsplit(target.url).query)
+            payload = hourly_response(query["start_date"][0], query["end_date"][0])
+            yield FetchResult(target, payload, {})
+
+
+@pytest.fixture()
+def weather_lambda(s3_bucket, monkeypatch):
+    stub = StubOpenMeteo()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setenv("S3_BUCKET_NAME", s3_bucket)
+    module = importlib.reload(
+        importlib.import_module("bike_data_scraper.handlers.weather_data_handler")
+    )
+    monkeypatch.setattr(
+        open_meteo,
+        "weather_url",
+        lambda point, start_date, end_date, archive=False: (
+            f"http://127.0.0.1:{server.server_address[1]}/"
+            f"?start_date={start_date}&end_date={end_date}"
+        ),
+    )
+    yield module, stub
+    server.shutdown()
+    server.server_close()
+
+
+def test_only_missing_days_are_fetched(weather_lambda):
+    module, stub = weather_lambda
+
+    with freeze_time("2023-10-15 01:00:00"):
+        first = module.lambda_handler(None, None)
+    with freeze_time("2023-10-16 01:00:00"):
+        second = module.lambda_handler(None, None)
+
+    assert stub.requests == [
+        ("2023-10-01", "2023-10-15"),
+        ("2023-10-15", "2023-10-16"),
+    ]
+    assert len(first["s3_info"]["written"]["default"]) == 15
+    assert second["s3_info"]["written"]["default"] == [
+        "weather/default/2023-10-15.csv",
+        "weather/default/2023-10-16.csv",
+    ]
+
+
+def test_missing_days_are_split_between_the_archive_and_the_forecast(s3_bucket):
+    store = WeatherDayStore(S3Handler(), s3_bucket, "weather")
+    fetcher = RecordingFetcher()
+    today = dt.date(2024, 1, 31)
+    point = {"name": "goteborg", "latitude": 57.7, "longitude": 11.97}
+
+    written = open_meteo.fetch_missing_weather(
+        store, fetcher, [point], dt.date(2023, 10, 25), dt.date(2023, 11, 5), today
+    )
+
+    cutoff = today - dt.timedelta(days=open_meteo.FORECAST_PAST_DAYS)
+    assert [
+        (
+            urlsplit(url).hostname,
+            parse_qs(urlsplit(url).query)["start_date"][0],
+            parse_qs(urlsplit(url).query)["end_date"][0],
+        )
+        for url in fetcher.urls
+    ] == [
+        (open_meteo.ARCHIVE_API_ENDPOINT, "2023-10-25", str(cutoff - dt.timedelta(1))),
+        (open_meteo.API_ENDPOINT, str(cutoff), "2023-11-05"),
+    ]
+    assert len(written["goteborg"]) == 12
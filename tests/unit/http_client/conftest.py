@@ -0,0 +1,33 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture()
+def stub_server():
+    """Serves a GET handler on a local port and returns the server's URL.
+
+    The handler is called with the BaseHTTPRequestHandler of every request.
+    Servers are shut down when the test ends.
+    """
+    servers = []
+
+    def serve(do_get, protocol_version: str = "HTTP/1.0") -> str:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                do_get(self)
+
+            def log_message(self, *args):
+                pass
+
+        Handler.protocol_version = protocol_version
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
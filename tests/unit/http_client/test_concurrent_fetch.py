@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from bike_data_scraper.concurrent_fetch import ConcurrentFetcher, FetchTarget
+
+
+class StubRegions:
+    """Answers GET /?region=<name>&delay=<seconds> with the region's stations."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_ports = set()
+
+    def do_get(self, request):
+        query = parse_qs(urlsplit(request.path).query)
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.client_ports.add(request.client_address[1])
+        time.sleep(float(query["delay"][0]))
+        with self.lock:
+            self.in_flight -= 1
+
+        body = json.dumps([{"Name": query["region"][0]}]).encode()
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+@pytest.fixture()
+def stub_regions(stub_server):
+    stub = StubRegions()
+    # Keep-alive, so reused connections show up as one client port
+    stub.url = stub_server(stub.do_get, protocol_version="HTTP/1.1")
+    return stub
+
+
+def target(stub: StubRegions, name: str, delay: float, **kwargs) -> FetchTarget:
+    return FetchTarget(name, f"{stub.url}?region={name}&delay={delay}", **kwargs)
+
+
+def test_results_come_back_as_they_complete(stub_regions):
+    targets = [
+        target(stub_regions, "slow", 0.3),
+        target(stub_regions, "fast", 0.0),
+        target(stub_regions, "medium", 0.1),
+    ]
+
+    results = ConcurrentFetcher().fetch_all(targets)
+
+    assert [result.target.name for result in results] == ["fast", "medium", "slow"]
+    assert [result.payload for result in results] == [
+        [{"Name": "fast"}],
+        [{"Name": "medium"}],
+        [{"Name": "slow"}],
+    ]
+
+
+def test_concurrency_is_limited(stub_regions):
+    targets = [target(stub_regions, f"region{i}", 0.05) for i in range(8)]
+
+    started = time.perf_counter()
+    results = ConcurrentFetcher(max_concurrency=2).fetch_all(targets)
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 8
+    assert stub_regions.max_in_flight == 2
+    assert elapsed >= 4 * 0.05
+
+
+def test_connections_to_a_host_are_reused(stub_regions):
+    fetcher = ConcurrentFetcher(max_concurrency=1)
+    targets = [target(stub_regions, f"region{i}", 0.0) for i in range(4)]
+
+    fetcher.fetch_all(targets)
+    fetcher.fetch_all(targets)
+
+    assert len(stub_regions.client_ports) == 1
+
+
+def test_a_target_timing_out_does_not_fail_the_others(stub_regions):
+    targets = [
+        target(stub_regions, "stuck", 1.0, timeout=(1, 0.1)),
+        target(stub_regions, "ok", 0.0),
+    ]
+
+    results = ConcurrentFetcher(max_retries=0).fetch_all(targets)
+
+    by_name = {result.target.name: result for result in results}
+    assert by_name["ok"].payload == [{"Name": "ok"}]
+    assert by_name["stuck"].payload is None
+    assert by_name["stuck"].metrics["error"] in ("ReadTimeout", "ConnectionError")
@@ -0,0 +1,90 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from bike_data_scraper.http_client import HttpClient, build_session
+
+STATIONS = [{"StationId": 1, "Name": "Central", "AvailableBikes": 3}]
+
+
+class StubApi:
+    """Answers GET / with the queued responses, then with the stations."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+
+    def do_get(self, request):
+        self.requests.append(dict(request.headers))
+        status, delay = self.responses.pop(0) if self.responses else (200, 0)
+        time.sleep(delay)
+        if request.headers.get("If-None-Match") == '"v1"':
+            request.send_response(304)
+            request.end_headers()
+            return
+        body = json.dumps(STATIONS).encode()
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            request.send_response(status)
+            request.send_header("Content-Encoding", "gzip")
+        else:
+            request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.send_header("ETag", '"v1"')
+        request.end_headers()
+        request.wfile.write(body)
+
+
+@pytest.fixture()
+def stub_api(stub_server):
+    api = StubApi()
+    api.url = stub_server(api.do_get)
+    return api
+
+
+@pytest.fixture()
+def client():
+    return HttpClient(session=build_session(backoff_factor=0), timeout=(1, 0.3))
+
+
+def test_gzip_payload_is_decoded_and_measured(stub_api, client):
+    assert client.get_data(stub_api.url) == STATIONS
+
+    assert client.metrics["status"] == 200
+    assert client.metrics["content_encoding"] == "gzip"
+    assert client.metrics["bytes"] == len(json.dumps(STATIONS))
+    assert client.metrics["wire_bytes"] < 200
+    assert client.metrics["latency_ms"] > 0
+
+
+def test_conditional_request_returns_the_cached_payload(stub_api, client):
+    client.get_data(stub_api.url)
+
+    assert client.get_data(stub_api.url) == STATIONS
+    assert stub_api.requests[-1]["If-None-Match"] == '"v1"'
+    assert client.metrics["not_modified"] is True
+
+
+def test_server_errors_and_timeouts_are_retried(stub_api, client):
+    stub_api.responses = [(503, 0), (200, 1), (502, 0)]
+
+    assert client.get_data(stub_api.url) == STATIONS
+    assert client.metrics["retries"] == 3
+    assert len(stub_api.requests) == 4
+
+
+def test_retries_are_bounded(stub_api, client):
+    stub_api.responses = [(500, 0)] * 10
+
+    assert client.get_data(stub_api.url) is None
+    # The first attempt and three retries
+    assert len(stub_api.requests) == 4
+    assert client.metrics["status"] == 500
+
+
+def test_unreachable_host_returns_none(client):
+    assert client.get_data("http://127.0.0.1:9/") is None
+    assert client.metrics["error"] == "ConnectionError"
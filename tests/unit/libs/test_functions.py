@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.functions import count_list_items
+
+
+def test_count_list_items_counts_stringified_lists():
+    values = pd.Series(
+        ["[]", "['BIKE1']", "['BIKE1', 'BIKE2', 'BIKE3']", " [ 'BIKE1' ] ", "[1, 2]"],
+        index=[10, 11, 12, 13, 14],
+    )
+
+    counted = count_list_items(values)
+
+    assert counted.tolist() == [0, 1, 3, 1, 2]
+    assert counted.index.tolist() == [10, 11, 12, 13, 14]
+
+
+def test_count_list_items_treats_missing_values_as_empty():
+    assert count_list_items(pd.Series([None, "['BIKE1']"])).tolist() == [0, 1]
+
+
+def test_count_list_items_handles_an_empty_column():
+    assert count_list_items(pd.Series([], dtype=object)).empty
+
+
+def test_count_list_items_rejects_line_breaks():
+    with pytest.raises(ValueError):
+        count_list_items(pd.Series(["['BIKE1',\n'BIKE2']"]))
@@ -0,0 +1,19 @@
+import sys
+
+from bike_data_scraper.libs.lazy_imports import lazy_attribute, lazy_module
+
+
+def test_module_is_imported_on_first_use(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    rgb_to_hsv = lazy_attribute("colorsys", "rgb_to_hsv")
+
+    assert "colorsys" not in sys.modules
+    assert rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_lazy_module_forwards_attributes(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    colorsys = lazy_module("colorsys")
+
+    assert colorsys.hsv_to_rgb(0.0, 0.0, 1.0) == (1.0, 1.0, 1.0)
@@ -0,0 +1,142 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.metric_partials import (
+    MetricPartial,
+    incremental_metrics,
+)
+from bike_data_scraper.libs.metrics_engine import CORRELATION_COLUMNS, MetricsEngine
+
+
+@pytest.fixture()
+def three_days():
+    rng = np.random.default_rng(9)
+    scrapes = pd.date_range("2023-10-06", periods=3 * 24 * 6, freq="10min")
+    stations = 40
+    rows = stations * len(scrapes)
+    df = pd.DataFrame(
+        {
+            "stationId": np.tile(
+                [f"station{i}" for i in range(stations)], len(scrapes)
+            ),
+            "timestamp": np.repeat(scrapes.to_numpy(), stations),
+            "TotalAvailableBikes": rng.integers(0, 10, rows).astype("int16"),
+        }
+    )
+    for column in CORRELATION_COLUMNS:
+        df[column] = rng.normal(1000, 50, rows).astype("float32")
+    df["Temperature"] = rng.normal(10, 5, rows).round(1).astype("float32")
+    df["IsWeekend"] = (df["timestamp"].dt.dayofweek >= 5).astype("int8")
+    # Leave an hour without weather
+    df.loc[df["timestamp"].dt.hour == 5, "Humidity"] = np.nan
+    return df
+
+
+def assert_same_metrics(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for name, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(actual[name], value, rtol=1e-9)
+        else:
+            assert actual[name] == value, name
+
+
+def daily_partials(df: pd.DataFrame) -> list:
+    return [
+        MetricPartial.from_frame(rows)
+        for _, rows in df.groupby(df["timestamp"].dt.normalize())
+    ]
+
+
+def test_merged_daily_partials_give_the_engine_results(three_days):
+    partials = daily_partials(three_days)
+    merged = partials[0].merge(partials[1]).merge(partials[2])
+
+    assert_same_metrics(merged.metrics(), MetricsEngine().compute(three_days))
+
+
+def test_partials_survive_a_json_round_trip(three_days):
+    partials = [
+        MetricPartial(json.loads(json.dumps(partial.data)))
+        for partial in daily_partials(three_days)
+    ]
+    # Merge order doesn't matter either
+    merged = partials[2].merge(partials[0]).merge(partials[1])
+
+    assert_same_metrics(merged.metrics(), MetricsEngine().compute(three_days))
+
+
+def test_correlation_is_rebuilt_exactly_from_the_moments(three_days):
+    partials = daily_partials(three_days)
+    merged = partials[0].merge(partials[1]).merge(partials[2])
+
+    expected = three_days[CORRELATION_COLUMNS].astype("float64").corr().to_numpy()
+    np.testing.assert_allclose(
+        merged.metrics(("correlation_matrix",))["correlation_matrix"].to_numpy(),
+        expected,
+        atol=1e-12,
+    )
+
+
+class MemoryPartialStore:
+    """Keeps the manifests as JSON, like S3 does."""
+
+    def __init__(self):
+        self.manifests = {}
+        self.saves = 0
+
+    def load(self, sub_path):
+        manifest = self.manifests.get(sub_path)
+        return {} if manifest is None else json.loads(manifest)
+
+    def save(self, sub_path, days):
+        self.manifests[sub_path] = json.dumps(days)
+        self.saves += 1
+
+
+def test_incremental_metrics_only_aggregate_uncached_days(three_days, mocker):
+    store = MemoryPartialStore()
+    expected = MetricsEngine().compute(three_days)
+
+    first = incremental_metrics(three_days, "station_bikes", store)
+    # The latest day may still be filling up, so it is never cached
+    assert sorted(store.load("station_bikes")) == ["2023-10-06", "2023-10-07"]
+
+    from_frame = mocker.spy(MetricPartial, "from_frame")
+    second = incremental_metrics(three_days, "station_bikes", store)
+
+    assert from_frame.call_count == 1
+    # Nothing cached changed, so the manifest isn't written again
+    assert store.saves == 1
+    assert_same_metrics(first, expected)
+    assert_same_metrics(second, expected)
+
+
+def test_rewritten_days_are_aggregated_again(three_days, mocker):
+    store = MemoryPartialStore()
+    incremental_metrics(three_days, "station_bikes", store)
+
+    # A reprocessing rewrites the first day
+    rewritten = three_days.copy()
+    first_day = rewritten["timestamp"] < "2023-10-07"
+    rewritten.loc[first_day, "TotalAvailableBikes"] += 1
+    from_frame = mocker.spy(MetricPartial, "from_frame")
+    metrics = incremental_metrics(rewritten, "station_bikes", store)
+
+    # The rewritten day and the latest one
+    assert from_frame.call_count == 2
+    assert_same_metrics(metrics, MetricsEngine().compute(rewritten))
+
+
+def test_a_window_without_temperatures_has_no_extremes(three_days):
+    three_days["Temperature"] = np.nan
+    partials = daily_partials(three_days)
+
+    metrics = partials[0].merge(partials[1]).metrics()
+
+    assert metrics["warmest_temperature"] is None
+    assert metrics["coldest_day"] is None
+    assert metrics["number_of_bikes_available"] == "40"
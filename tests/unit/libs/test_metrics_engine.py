@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.metrics_engine import CORRELATION_COLUMNS, MetricsEngine
+
+
+@pytest.fixture()
+def bikes():
+    df = pd.DataFrame(
+        {
+            "stationId": ["a", "b", "a", "c"],
+            "timestamp": pd.to_datetime(
+                [
+                    "2023-10-06 10:05:00",
+                    "2023-10-06 10:05:00",
+                    "2023-10-07 12:30:00",
+                    "2023-10-07 12:30:00",
+                ]
+            ),
+            "AvailableBikes": [2, 4, 6, 9],
+            "TotalAvailableBikes": [1, 2, 3, 4],
+            "Temperature": [10.0, 12.0, 8.0, 12.0],
+            "Humidity": [80.0, 90.0, 70.0, np.nan],
+            "Wind_Speed": [1.0, 3.0, 5.0, 7.0],
+            "IsWeekend": [0, 0, 1, 1],
+        }
+    )
+    for column in CORRELATION_COLUMNS:
+        if column not in df:
+            df[column] = np.arange(len(df), dtype=float) ** 2
+    return df
+
+
+def test_temperature_and_counting_metrics(bikes):
+    metrics = MetricsEngine().compute(bikes)
+
+    assert metrics["number_of_bikes_available"] == "3"
+    assert metrics["warmest_temperature"] == "12.0"
+    assert metrics["coldest_temperature"] == "8.0"
+    assert metrics["warmest_day"] == "2023-10-06 10:05:00"
+    assert metrics["coldest_day"] == "2023-10-07 12:30:00"
+    # Both timestamps are seen twice; the earliest wins
+    assert metrics["day_with_most_used_bikes"] == "2023-10-06 10:05:00"
+
+
+def test_weekend_vs_weekday_averages(bikes):
+    weekend = MetricsEngine().compute(bikes)["weekend_vs_weekday"]
+
+    assert weekend.to_dict(orient="records") == [
+        {"IsWeekend": "Weekdays", "AvailableBikes": 3.0},
+        {"IsWeekend": "Weekend", "AvailableBikes": 7.5},
+    ]
+
+
+def test_weather_over_timestamp_fills_every_hour(bikes):
+    hourly = MetricsEngine().compute(bikes)["weather_over_timestamp"]
+
+    assert len(hourly) == 27
+    assert hourly["timestamp"].iloc[0] == pd.Timestamp("2023-10-06 10:00")
+    first, last = hourly.iloc[0], hourly.iloc[-1]
+    assert (first["Humidity"], first["TotalAvailableBikes"]) == (85.0, 3)
+    # The NaN humidity is left out of the mean, like resample().mean()
+    assert (last["Humidity"], last["Wind_Speed"]) == (70.0, 6.0)
+    assert hourly["Humidity"].iloc[1:-1].isna().all()
+    assert (hourly["TotalAvailableBikes"].iloc[1:-1] == 0).all()
+
+
+def test_nullable_counts_leave_their_gaps_out(bikes):
+    bikes["AvailableBikes"] = pd.array([2, 4, None, 9], dtype="Int16")
+    bikes["TotalAvailableBikes"] = pd.array([1, None, 3, 4], dtype="Int16")
+
+    metrics = MetricsEngine().compute(bikes)
+
+    weekend = metrics["weekend_vs_weekday"].to_dict(orient="records")
+    assert weekend[1] == {"IsWeekend": "Weekend", "AvailableBikes": 9.0}
+    assert metrics["weather_over_timestamp"]["TotalAvailableBikes"].iloc[0] == 1
+
+
+def test_selected_metrics_only(bikes):
+    metrics = MetricsEngine(metrics=("coldest_temperature",)).compute(bikes)
+
+    assert metrics == {"coldest_temperature": "8.0"}
+
+
+def test_unknown_metrics_are_rejected():
+    with pytest.raises(ValueError):
+        MetricsEngine(metrics=("busiest_station",))
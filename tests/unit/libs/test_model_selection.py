@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.model_selection import train_test_split
+
+
+def test_split_draws_sklearns_permutation():
+    X = pd.DataFrame({"Hour": range(10)}, index=range(100, 110))
+    y = pd.Series(range(10), index=range(100, 110), name="TotalAvailableBikes")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    permutation = np.random.RandomState(42).permutation(10)
+    assert X_test["Hour"].tolist() == permutation[:2].tolist()
+    assert X_train["Hour"].tolist() == permutation[2:].tolist()
+    # Rows stay paired and keep their index
+    assert (X_train.index == y_train.index).all()
+    assert y_test.tolist() == X_test["Hour"].tolist()
+
+
+def test_test_size_rounds_up_like_sklearn():
+    train, test = train_test_split(np.arange(7), test_size=0.25, random_state=0)
+
+    assert len(test) == 2
+    assert sorted(np.concatenate([train, test]).tolist()) == list(range(7))
+
+
+def test_arrays_of_different_lengths_are_rejected():
+    with pytest.raises(ValueError):
+        train_test_split(np.arange(4), np.arange(5))
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from bike_data_scraper.libs.preprocessing import (
+    PREPROCESSING_STAGES,
+    PreprocessingPipeline,
+    drop_incomplete_rows,
+)
+
+
+def weather_frame() -> pd.DataFrame:
+    times = pd.date_range("2023-10-14", periods=48, freq="h")
+    return pd.DataFrame(
+        {
+            "Time": times.strftime("%Y-%m-%dT%H:%M"),
+            "Temperature": np.arange(48, dtype=float),
+            "Humidity": 80.0,
+        }
+    )
+
+
+def bikes_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "stationId": ["Central", "BIKE1", "Harbour"],
+            "timestamp": [
+                "2023-10-14T10:05:00",
+                "2023-10-15T23:55:00",
+                "2023-10-16T00:05:00",
+            ],
+            "BikeIds": ["['A', 'B']", "[]", "['C']"],
+        }
+    )
+
+
+def test_pipeline_runs_every_stage_and_times_it():
+    pipeline = PreprocessingPipeline()
+
+    df = pipeline.run(weather_frame(), bikes_frame())
+
+    assert list(pipeline.timings) == [stage.name for stage in PREPROCESSING_STAGES]
+    # The last bike has no weather for its hour
+    assert df["stationId"].tolist() == ["Central", "BIKE1"]
+    assert df["Temperature"].tolist() == [10.0, 47.0]
+    assert df["TotalAvailableBikes"].tolist() == [2, 0]
+    assert df["IsWeekend"].tolist() == [1, 1]
+    assert list(df.columns[-3:]) == ["Humidity", "TotalAvailableBikes", "IsWeekend"]
+
+
+def test_pipeline_reuses_the_bikes_frame():
+    bikes = bikes_frame()
+
+    df = PreprocessingPipeline(PREPROCESSING_STAGES[:2]).run(weather_frame(), bikes)
+
+    assert df is bikes
+
+
+def test_drop_incomplete_rows_keeps_a_complete_frame():
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": ["x", "y"]})
+
+    assert drop_incomplete_rows(df) is df
+    assert len(drop_incomplete_rows(df.assign(a=[1.0, np.nan]))) == 1
+
+
+def test_drop_incomplete_rows_drops_columns_without_any_value():
+    df = pd.DataFrame({"a": [1.0, np.nan], "b": ["x", "y"], "StationId": [None, None]})
+
+    df = drop_incomplete_rows(df)
+
+    assert df.columns.tolist() == ["a", "b"]
+    assert df["b"].tolist() == ["x"]
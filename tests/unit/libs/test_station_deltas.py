@@ -0,0 +1,75 @@
+from bike_data_scraper.libs.station_deltas import (
+    SCRAPE_MARKER_STATION_ID,
+    drop_scrape_markers,
+    forward_fill_station_samples,
+    station_fingerprint,
+)
+
+
+def sample(station: str, timestamp: str, bikes: int) -> dict:
+    return {"stationId": station, "timestamp": timestamp, "AvailableBikes": str(bikes)}
+
+
+def marker(timestamp: str, keyframe: bool = False) -> dict:
+    return {
+        "stationId": SCRAPE_MARKER_STATION_ID,
+        "timestamp": timestamp,
+        "keyframe": keyframe,
+    }
+
+
+def test_fingerprint_only_depends_on_the_tracked_fields():
+    station = {"AvailableBikes": "3", "BikeIds": "[1, 2, 3]", "IsOpen": "True"}
+
+    assert station_fingerprint(station) == station_fingerprint(
+        {**station, "Lat": "57.7"}
+    )
+    assert station_fingerprint(station) != station_fingerprint(
+        {**station, "AvailableBikes": "2"}
+    )
+
+
+def test_forward_fill_carries_unchanged_stations_to_every_scrape():
+    pages = [
+        [marker("t1", keyframe=True), sample("a", "t1", 1), sample("b", "t1", 5)],
+        [marker("t2"), sample("a", "t2", 2)],
+        [marker("t3")],
+    ]
+
+    rows = [row for page in forward_fill_station_samples(pages) for row in page]
+
+    assert [
+        (row["stationId"], row["timestamp"], row["AvailableBikes"]) for row in rows
+    ] == [
+        ("a", "t1", "1"),
+        ("b", "t1", "5"),
+        ("a", "t2", "2"),
+        ("b", "t2", "5"),
+        ("a", "t3", "2"),
+        ("b", "t3", "5"),
+    ]
+
+
+def test_keyframe_drops_stations_it_did_not_write():
+    pages = [
+        [marker("t1", keyframe=True), sample("a", "t1", 1), sample("b", "t1", 5)],
+        [marker("t2", keyframe=True), sample("a", "t2", 1)],
+    ]
+
+    rows = [row for page in forward_fill_station_samples(pages) for row in page]
+
+    assert [(row["stationId"], row["timestamp"]) for row in rows[2:]] == [("a", "t2")]
+
+
+def test_samples_without_markers_pass_through():
+    pages = [[sample("a", "t1", 1)], [sample("a", "t2", 2), sample("b", "t2", 3)]]
+
+    rows = [row for page in forward_fill_station_samples(pages) for row in page]
+
+    assert rows == [row for page in pages for row in page]
+
+
+def test_drop_scrape_markers():
+    pages = [[marker("t1"), sample("a", "t1", 1)]]
+
+    assert list(drop_scrape_markers(pages)) == [[sample("a", "t1", 1)]]
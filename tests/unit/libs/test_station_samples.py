@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from bike_data_scraper.csv_client.csv_handler import IncrementalCSVEncoder
+from bike_data_scraper.libs.preprocessing import add_total_available_bikes_column
+from bike_data_scraper.libs.station_samples import (
+    StationSample,
+    decode_item,
+    decode_station_pages,
+    unpack_bike_ids,
+)
+
+TIMESTAMP = "2023-10-18T10:00:00"
+API_STATION = {
+    "StationId": 12,
+    "Name": "Central",
+    "AvailableBikes": 2,
+    "BikeIds": ["BIKE1", "BIKE2"],
+    "IsOpen": True,
+    "Lat": 57.7089,
+    "Long": 11.9746,
+    "Distance": 120.5,
+}
+# The same station as the scraper wrote it before the schema
+STRING_ITEM = {
+    "stationId": "Central",
+    "timestamp": TIMESTAMP,
+    "dayBucket": "2023-10-18",
+    **{key: str(value) for key, value in API_STATION.items()},
+}
+
+
+def test_api_station_is_stored_typed_and_packed():
+    item = StationSample.from_api(API_STATION, TIMESTAMP).to_item()
+
+    assert item["AvailableBikes"] == 2
+    assert item["IsOpen"] is True
+    assert item["Lat"] == Decimal("57.7089")
+    assert item["BikeIds"] == "BIKE1,BIKE2"
+    assert item["BikeCount"] == 2
+    assert item["Distance"] == Decimal("120.5")
+
+
+def test_typed_and_string_items_decode_to_the_same_row():
+    typed_item = {
+        "stationId": "Central",
+        "timestamp": TIMESTAMP,
+        **StationSample.from_api(API_STATION, TIMESTAMP).to_item(),
+    }
+
+    typed_row = decode_item(typed_item).to_row()
+    string_row = decode_item(STRING_ITEM).to_row()
+
+    assert typed_row.keys() == string_row.keys()
+    assert typed_row["AvailableBikes"] == string_row["AvailableBikes"] == 2
+    assert typed_row["IsOpen"] is string_row["IsOpen"] is True
+    assert typed_row["BikeIds"] == string_row["BikeIds"] == "[BIKE1,BIKE2]"
+    assert typed_row["BikeCount"] == string_row["BikeCount"] == 2
+    assert "dayBucket" not in string_row
+
+
+def test_legacy_items_with_none_and_nan_strings_decode_as_missing():
+    legacy_item = {
+        **STRING_ITEM,
+        "StationId": "None",
+        "AvailableBikes": "None",
+        "IsOpen": "nan",
+        "Lat": "NaN",
+        "Long": "None",
+    }
+
+    row = decode_item(legacy_item).to_row()
+
+    assert row["StationId"] is None
+    assert row["AvailableBikes"] is None
+    assert row["IsOpen"] is None
+    assert row["Lat"] is None
+    assert row["Long"] is None
+    assert "AvailableBikes" not in decode_item(legacy_item).to_item()
+
+
+def test_rows_keep_every_column_when_fields_are_missing():
+    sparse = {"stationId": "Harbour", "timestamp": TIMESTAMP, "Name": "Harbour"}
+    pages = decode_station_pages([[sparse], [STRING_ITEM]])
+
+    body = b"".join(IncrementalCSVEncoder().encode(pages)).decode()
+
+    header, sparse_line, full_line = body.splitlines()
+    assert header.split(",")[:10] == [
+        "stationId",
+        "timestamp",
+        "StationId",
+        "Name",
+        "AvailableBikes",
+        "BikeIds",
+        "BikeCount",
+        "IsOpen",
+        "Lat",
+        "Long",
+    ]
+    assert sparse_line == f"Harbour,{TIMESTAMP},,Harbour,,[],0,,,"
+    assert full_line.startswith(f"Central,{TIMESTAMP},12,Central,2,")
+    assert full_line.endswith(",True,57.7089,11.9746")
+
+
+def test_samples_have_no_instance_dict():
+    sample = decode_item(STRING_ITEM)
+
+    assert not hasattr(sample, "__dict__")
+
+
+def test_unpack_bike_ids_reads_every_stored_form():
+    assert unpack_bike_ids("['BIKE1', 'BIKE2']") == ("BIKE1", "BIKE2")
+    assert unpack_bike_ids("[1, 2]") == ("1", "2")
+    assert unpack_bike_ids("BIKE1,BIKE2") == ("BIKE1", "BIKE2")
+    assert unpack_bike_ids("[]") == ()
+    assert unpack_bike_ids("") == ()
+    assert unpack_bike_ids(None) == ()
+
+
+def test_decoded_pages_feed_the_bike_count_to_preprocessing():
+    empty = {**STRING_ITEM, "stationId": "Harbour", "BikeIds": "[]"}
+    pages = decode_station_pages([[STRING_ITEM], [empty]])
+    df = pd.DataFrame([row for page in pages for row in page])
+
+    df = add_total_available_bikes_column(df)
+
+    assert df["TotalAvailableBikes"].tolist() == [2, 0]
+    assert "BikeCount" not in df.columns
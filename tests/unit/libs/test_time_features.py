@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from bike_data_scraper.libs.time_features import derive_time_features
+
+
+def test_derives_calendar_features_with_compact_dtypes():
+    df = pd.DataFrame(
+        {"timestamp": ["2023-10-29T23:59:10.123456", "2024-02-29T01:02:03", None]}
+    )
+
+    df = derive_time_features(
+        df, features=("Year", "Month", "Day", "Hour", "Minute", "Weekday", "IsWeekend")
+    )
+
+    assert df[["Year", "Month", "Day", "Hour", "Minute"]].values.tolist() == [
+        [2023, 10, 29, 23, 59],
+        [2024, 2, 29, 1, 2],
+    ]
+    # Sunday and Thursday
+    assert df["Weekday"].tolist() == [6, 3]
+    assert df["IsWeekend"].tolist() == [1, 0]
+    assert df["Year"].dtype == "int16"
+    assert (df.dtypes[["Month", "Day", "Hour", "Minute", "IsWeekend"]] == "int8").all()
+
+
+def test_matches_pandas_accessors():
+    timestamps = pd.Series(
+        pd.date_range("2023-12-30 22:00", periods=5000, freq="37min")
+    )
+    df = derive_time_features(
+        pd.DataFrame({"Time": timestamps}),
+        features=("Year", "Month", "Day", "Hour", "Minute", "Weekday"),
+        column="Time",
+    )
+
+    for feature, accessor in [
+        ("Year", "year"),
+        ("Month", "month"),
+        ("Day", "day"),
+        ("Hour", "hour"),
+        ("Minute", "minute"),
+        ("Weekday", "dayofweek"),
+    ]:
+        assert (df[feature] == getattr(timestamps.dt, accessor)).all(), feature
+
+
+def test_timezone_aware_timestamps_keep_their_wall_time():
+    df = pd.DataFrame({"timestamp": ["2023-10-01T23:30:00+02:00"]})
+
+    df = derive_time_features(df, features=("Day", "Hour"))
+
+    assert df[["Day", "Hour"]].values.tolist() == [[1, 23]]
+
+
+def test_unknown_features_are_rejected():
+    with pytest.raises(ValueError):
+        derive_time_features(pd.DataFrame({"timestamp": []}), features=("Second",))
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from bike_data_scraper.libs.weather_join import join_hourly_weather
+
+
+def weather_frame():
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(
+                ["2023-10-01T00:00", "2023-10-01T01:00", "2023-10-01T03:00"]
+            ),
+            "Year": [2023, 2023, 2023],
+            "Hour": [0, 1, 3],
+            "Temperature": [10.5, 11.0, 12.5],
+            "Humidity": [80, 81, 82],
+        }
+    )
+
+
+def test_joins_the_weather_of_each_bike_rows_hour():
+    bikes = pd.DataFrame(
+        {
+            "stationId": ["a", "b", "c", "d"],
+            "timestamp": [
+                "2023-10-01T01:59:59",
+                "2023-10-01T00:00:00",
+                "2023-10-01T03:10:00",
+                "2023-10-01T01:00:01",
+            ],
+        }
+    )
+
+    df = join_hourly_weather(bikes, weather_frame())
+
+    assert list(df.columns) == ["stationId", "timestamp", "Temperature", "Humidity"]
+    assert df["Temperature"].tolist() == [11.0, 10.5, 12.5, 11.0]
+    assert df["Humidity"].tolist() == [81, 80, 82, 81]
+
+
+def test_hours_without_weather_get_nan():
+    bikes = pd.DataFrame(
+        {
+            "timestamp": [
+                "2023-10-01T02:30:00",
+                "2023-09-30T23:59:00",
+                "2023-10-01T04:00:00",
+                None,
+                "2023-10-01T00:30:00",
+            ]
+        }
+    )
+
+    df = join_hourly_weather(bikes, weather_frame(), columns=["Humidity"])
+
+    assert list(df.columns) == ["timestamp", "Humidity"]
+    assert df["Humidity"].isna().tolist() == [True, True, True, True, False]
+    assert df["Humidity"].iloc[-1] == 80
+
+
+def test_empty_weather_leaves_every_row_without_weather():
+    bikes = pd.DataFrame({"timestamp": ["2023-10-01T02:30:00"]})
+
+    df = join_hourly_weather(bikes, weather_frame().iloc[:0])
+
+    assert np.isnan(df["Temperature"]).all()
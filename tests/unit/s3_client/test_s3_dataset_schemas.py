@@ -0,0 +1,120 @@
+import boto3
+import pandas as pd
+import pytest
+
+from bike_data_scraper.s3_client.dataset_schemas import get_dataset_schema
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+STATIONS_KEY = "processed/StationaryStations.csv"
+
+
+@pytest.fixture()
+def stations_csv(s3_bucket):
+    df = pd.DataFrame(
+        {
+            "stationId": ["station1", "station2", "station1"],
+            "timestamp": [
+                "2023-10-01 00:00:10",
+                "2023-10-01 00:00:20",
+                "2023-10-01 00:00:30",
+            ],
+            "AvailableBikes": [3, 0, 7],
+            "Temperature": [10.5, 11.0, 9.5],
+            "IsWeekend": [1, 1, 1],
+            "Name": ["Central", "Harbour", "Central"],
+        }
+    )
+    boto3.client("s3").put_object(
+        Bucket=s3_bucket, Key=STATIONS_KEY, Body=df.to_csv(index=False)
+    )
+    return s3_bucket
+
+
+def test_projection_only_parses_requested_columns(stations_csv):
+    df = S3Handler().get_data_from_s3(
+        stations_csv, STATIONS_KEY, columns=["stationId", "AvailableBikes"]
+    )
+
+    assert list(df.columns) == ["stationId", "AvailableBikes"]
+    assert len(df) == 3
+
+
+def test_dataset_schema_narrows_dtypes_and_parses_dates(stations_csv):
+    df = S3Handler().get_data_from_s3(
+        stations_csv, STATIONS_KEY, dataset="StationaryStations"
+    )
+
+    assert df["stationId"].dtype == "category"
+    assert df["AvailableBikes"].dtype == "Int16"
+    assert df["Temperature"].dtype == "float32"
+    assert df["IsWeekend"].dtype == "int8"
+    assert pd.api.types.is_datetime64_any_dtype(df["timestamp"])
+
+
+def test_empty_counts_and_states_still_load(s3_bucket):
+    body = (
+        "stationId,timestamp,AvailableBikes,TotalAvailableBikes,IsOpen\n"
+        "station1,2023-10-01 00:00:10,3,,True\n"
+        "station2,2023-10-01 00:00:20,,5,\n"
+    )
+    boto3.client("s3").put_object(Bucket=s3_bucket, Key=STATIONS_KEY, Body=body)
+
+    df = S3Handler().get_data_from_s3(
+        s3_bucket, STATIONS_KEY, dataset="StationaryStations"
+    )
+
+    assert df["AvailableBikes"].isna().tolist() == [False, True]
+    assert df["TotalAvailableBikes"].tolist()[1] == 5
+    assert df["IsOpen"].dtype == "boolean"
+    assert df["IsOpen"].isna().tolist() == [False, True]
+
+
+def test_explicit_hints_take_precedence_over_the_schema(stations_csv):
+    df = S3Handler().get_data_from_s3(
+        stations_csv,
+        STATIONS_KEY,
+        columns=["stationId", "timestamp", "Temperature"],
+        dtypes={"Temperature": "float64"},
+        parse_dates=[],
+        dataset="StationaryStations",
+    )
+
+    assert df["Temperature"].dtype == "float64"
+    assert df["stationId"].dtype == "category"
+    assert df["timestamp"].dtype == object
+
+
+def test_schema_read_options_are_narrowed_to_the_projection():
+    options = get_dataset_schema("SingleBikes").read_options(["stationId", "Hour"])
+
+    assert options == {
+        "dtypes": {"stationId": "category", "Hour": "int8"},
+        "parse_dates": [],
+    }
+
+
+def test_unknown_dataset_schema_is_rejected():
+    with pytest.raises(ValueError):
+        get_dataset_schema("Unknown")
+
+
+def test_parquet_is_cast_to_the_schema(s3_bucket):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"stationId": ["station1"], "IsWeekend": [0], "Hour": [13]})
+    key = S3Handler().save_dataframe_to_s3(
+        df=df,
+        bucket_name=s3_bucket,
+        path_name="processed",
+        current_date="2023-10-01-2023-10-14",
+        sub_path="station_bikes",
+        filename="StationaryStations",
+        file_format="parquet",
+    )
+
+    loaded = S3Handler().get_data_from_s3(
+        s3_bucket, key, columns=["stationId", "IsWeekend"], dataset="StationaryStations"
+    )
+
+    assert list(loaded.columns) == ["stationId", "IsWeekend"]
+    assert loaded["IsWeekend"].dtype == "int8"
+    assert loaded["stationId"].dtype == "category"
@@ -0,0 +1,149 @@
+import gzip
+import json
+
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.s3_client import json_encoding
+from bike_data_scraper.s3_client.json_encoding import (
+    COLUMNS_LAYOUT,
+    RECORDS_LAYOUT,
+    encode_graph_data,
+)
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+
+def weather_over_timestamp(hours: int = 24 * 31) -> pd.DataFrame:
+    # Weather is hourly with one decimal, so its hourly means are those readings
+    rng = np.random.default_rng(4)
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2023-10-01", periods=hours, freq="h"),
+            "Humidity": rng.integers(40, 100, hours).astype(float),
+            "Wind_Speed": rng.uniform(0, 20, hours).round(1),
+            "Temperature": rng.normal(10, 5, hours).round(1),
+            "TotalAvailableBikes": rng.integers(0, 3000, hours),
+        }
+    )
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_encoding, "orjson", None)
+    return request.param
+
+
+def test_columns_layout_names_each_column_once(encoder):
+    correlation = pd.DataFrame(
+        [[1.0, 0.25], [0.25, 1.0]], index=["A", "B"], columns=["A", "B"]
+    )
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2023-10-01 00:00", "2023-10-01 00:10"]),
+            "IsWeekend": ["Weekdays", "Weekend"],
+            "AvailableBikes": [np.nan, 0.1],
+        }
+    )
+
+    decoded = json.loads(
+        encode_graph_data(
+            {"coldest_day": "2023-10-01", "corr": correlation, "frame": frame},
+            COLUMNS_LAYOUT,
+        )
+    )
+
+    assert decoded["layout"] == "columns"
+    assert decoded["coldest_day"] == "2023-10-01"
+    assert decoded["corr"] == {
+        "columns": ["A", "B"],
+        "dtypes": ["float32", "float32"],
+        "data": [[1.0, 0.25], [0.25, 1.0]],
+        "index": ["A", "B"],
+        "index_dtype": "object",
+    }
+    assert decoded["frame"] == {
+        "columns": ["timestamp", "IsWeekend", "AvailableBikes"],
+        "dtypes": ["datetime64[ms]", "object", "float32"],
+        "data": [
+            [1696118400000, 1696119000000],
+            ["Weekdays", "Weekend"],
+            [None, 0.1],
+        ],
+    }
+
+
+def test_evenly_spaced_timestamps_are_sent_as_a_range(encoder):
+    decoded = json.loads(
+        encode_graph_data({"hourly": weather_over_timestamp(48)}, COLUMNS_LAYOUT)
+    )
+
+    assert decoded["hourly"]["data"][0] == {
+        "start": 1696118400000,
+        "step": 3600000,
+        "length": 48,
+    }
+
+
+def test_nullable_columns_send_their_gaps_as_null(encoder):
+    frame = pd.DataFrame(
+        {
+            "AvailableBikes": pd.array([3, None, 5], dtype="Int16"),
+            "IsOpen": pd.array([True, None, False], dtype="boolean"),
+            "TotalAvailableBikes": pd.array([1, 2, 3], dtype="Int16"),
+        }
+    )
+
+    decoded = json.loads(encode_graph_data({"frame": frame}, COLUMNS_LAYOUT))
+
+    assert decoded["frame"]["dtypes"] == ["Int16", "boolean", "int16"]
+    assert decoded["frame"]["data"] == [[3, None, 5], [True, None, False], [1, 2, 3]]
+
+
+def test_records_layout_keeps_the_original_shape(encoder):
+    frame = weather_over_timestamp(2)
+
+    decoded = json.loads(encode_graph_data({"hourly": frame}, RECORDS_LAYOUT))
+
+    assert decoded["hourly"][0]["timestamp"] == "2023-10-01 00:00:00"
+    assert decoded["hourly"][1]["Humidity"] == frame["Humidity"][1]
+
+
+def test_gzip_columns_payload_is_an_order_of_magnitude_smaller(s3_bucket):
+    handler = S3Handler()
+    for layout, encoding, sub_path in [
+        (RECORDS_LAYOUT, None, "records"),
+        (COLUMNS_LAYOUT, "gzip", "columns"),
+    ]:
+        handler.save_data_as_json(
+            data={"weather_over_timestamp": weather_over_timestamp()},
+            bucket_name=s3_bucket,
+            path_name="graphs_data",
+            sub_path=sub_path,
+            current_date="2023-10-01-2023-10-31",
+            layout=layout,
+            content_encoding=encoding,
+        )
+
+    s3_client = boto3.client("s3")
+    records = s3_client.get_object(
+        Bucket=s3_bucket, Key="graphs_data/records/2023-10-01-2023-10-31/data.json"
+    )
+    columns = s3_client.get_object(
+        Bucket=s3_bucket, Key="graphs_data/columns/2023-10-01-2023-10-31/data.json"
+    )
+
+    assert columns["ContentEncoding"] == "gzip"
+    assert columns["ContentType"] == "application/json"
+    assert records["ContentLength"] >= 10 * columns["ContentLength"]
+    decoded = json.loads(gzip.decompress(columns["Body"].read()))
+    assert decoded["weather_over_timestamp"]["columns"][0] == "timestamp"
+
+
+def test_unknown_layout_and_encoding_are_rejected():
+    with pytest.raises(ValueError):
+        encode_graph_data({}, "rows")
+    with pytest.raises(ValueError):
+        json_encoding.compress(b"{}", "deflate")
@@ -0,0 +1,83 @@
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+
+@pytest.fixture()
+def processed_frame():
+    rows = 5000
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "stationId": [f"station{i % 150}" for i in range(rows)],
+            "timestamp": pd.date_range("2023-10-01", periods=rows, freq="10s"),
+            "AvailableBikes": rng.integers(0, 20, rows),
+            "Temperature": rng.normal(10, 5, rows).round(1),
+            "IsWeekend": rng.integers(0, 2, rows),
+        }
+    )
+
+
+def save(df, bucket, file_format, **kwargs):
+    return S3Handler().save_dataframe_to_s3(
+        df=df,
+        bucket_name=bucket,
+        path_name="processed",
+        current_date="2023-10-01-2023-10-14",
+        sub_path="station_bikes",
+        filename="StationaryStations",
+        file_format=file_format,
+        **kwargs,
+    )
+
+
+def object_size(bucket: str, key: str) -> int:
+    return boto3.client("s3").head_object(Bucket=bucket, Key=key)["ContentLength"]
+
+
+@pytest.mark.parametrize("compression", ["snappy", "zstd"])
+def test_parquet_round_trip_keeps_column_types(s3_bucket, processed_frame, compression):
+    key = save(processed_frame, s3_bucket, "parquet", compression=compression)
+
+    df = S3Handler().get_data_from_s3(s3_bucket, key)
+
+    assert key.endswith("StationaryStations.parquet")
+    pd.testing.assert_frame_equal(df, processed_frame)
+
+
+def test_csv_round_trip_parses_text(s3_bucket, processed_frame):
+    key = save(processed_frame, s3_bucket, "csv")
+
+    df = S3Handler().get_data_from_s3(s3_bucket, key)
+
+    assert key.endswith("StationaryStations.csv")
+    assert df["timestamp"].dtype == object
+    assert len(df) == len(processed_frame)
+
+
+def test_parquet_objects_are_smaller_than_csv(s3_bucket, processed_frame):
+    csv_key = save(processed_frame, s3_bucket, "csv")
+    parquet_key = save(processed_frame, s3_bucket, "parquet", compression="zstd")
+
+    assert object_size(s3_bucket, parquet_key) * 3 < object_size(s3_bucket, csv_key)
+
+
+def test_parquet_saves_series(s3_bucket):
+    target = pd.Series([1, 2, 3], name="TotalAvailableBikes")
+
+    key = save(target, s3_bucket, "parquet")
+
+    pd.testing.assert_frame_equal(
+        S3Handler().get_data_from_s3(s3_bucket, key), target.to_frame()
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"file_format": "json"}, {"file_format": "parquet", "compression": "lz"}]
+)
+def test_save_rejects_unknown_formats(s3_bucket, processed_frame, kwargs):
+    with pytest.raises(ValueError):
+        save(processed_frame, s3_bucket, **kwargs)
@@ -0,0 +1,62 @@
+import boto3
+import pytest
+
+from bike_data_scraper.s3_client.s3_handler import MULTIPART_MIN_PART_SIZE, S3Handler
+
+MiB = 1024 * 1024
+
+
+def chunks_of(total_size: int, chunk_size: int = 256 * 1024):
+    for start in range(0, total_size, chunk_size):
+        size = min(chunk_size, total_size - start)
+        yield bytes([start // chunk_size % 256]) * size
+
+
+def read_object(bucket: str, key: str) -> bytes:
+    return boto3.client("s3").get_object(Bucket=bucket, Key=key)["Body"].read()
+
+
+def test_upload_stream_uses_multipart_for_large_streams(s3_bucket):
+    result = S3Handler().upload_stream_to_s3(
+        chunks_of(12 * MiB), s3_bucket, "bikes.csv", part_size=MULTIPART_MIN_PART_SIZE
+    )
+
+    assert result == {"key": "bikes.csv", "bytes": 12 * MiB, "parts": 3}
+    assert read_object(s3_bucket, "bikes.csv") == b"".join(chunks_of(12 * MiB))
+
+
+def test_upload_stream_puts_small_streams_in_one_request(s3_bucket):
+    s3_handler = S3Handler()
+
+    result = s3_handler.upload_stream_to_s3(
+        [b"a,b\r\n", b"1,2\r\n"], s3_bucket, "s.csv"
+    )
+
+    assert result == {"key": "s.csv", "bytes": 10, "parts": 1}
+    assert read_object(s3_bucket, "s.csv") == b"a,b\r\n1,2\r\n"
+
+
+def test_upload_stream_writes_nothing_for_empty_streams(s3_bucket):
+    result = S3Handler().upload_stream_to_s3(iter([]), s3_bucket, "empty.csv")
+
+    assert result["bytes"] == 0
+    assert "Contents" not in boto3.client("s3").list_objects_v2(Bucket=s3_bucket)
+
+
+def test_upload_stream_aborts_multipart_upload_on_error(s3_bucket):
+    def failing_chunks():
+        yield from chunks_of(6 * MiB)
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        S3Handler().upload_stream_to_s3(
+            failing_chunks(), s3_bucket, "bikes.csv", part_size=MULTIPART_MIN_PART_SIZE
+        )
+
+    uploads = boto3.client("s3").list_multipart_uploads(Bucket=s3_bucket)
+    assert not uploads.get("Uploads")
+
+
+def test_upload_stream_rejects_parts_below_the_s3_minimum(s3_bucket):
+    with pytest.raises(ValueError):
+        S3Handler().upload_stream_to_s3([b"x"], s3_bucket, "x.csv", part_size=MiB)
@@ -0,0 +1,54 @@
+import boto3
+import pandas as pd
+import pytest
+
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+
+FRAME = pd.DataFrame(
+    {
+        "stationId": ["Central", "Harbour", "Östra"],
+        "AvailableBikes": [3, 0, 7],
+        "Lat": [57.7089, 57.71, 57.7],
+    }
+)
+
+
+def test_written_csv_reads_back_from_the_stream(s3_bucket):
+    s3_handler = S3Handler()
+
+    key = s3_handler.write_dataframe(FRAME, s3_bucket, "frames/stations.csv")
+
+    pd.testing.assert_frame_equal(s3_handler.read_csv(s3_bucket, key), FRAME)
+
+
+def test_written_csv_is_utf8_bytes(s3_bucket):
+    S3Handler().write_dataframe(FRAME, s3_bucket, "frames/stations.csv")
+
+    body = boto3.client("s3").get_object(Bucket=s3_bucket, Key="frames/stations.csv")
+    assert body["Body"].read().decode("utf-8").splitlines()[3] == "Östra,7,57.7"
+
+
+def test_series_are_written_as_one_column_frames(s3_bucket):
+    s3_handler = S3Handler()
+
+    key = s3_handler.write_dataframe(FRAME["AvailableBikes"], s3_bucket, "y.csv")
+
+    assert s3_handler.read_csv(s3_bucket, key).columns.tolist() == ["AvailableBikes"]
+
+
+def test_spooled_download_is_seekable(s3_bucket):
+    s3_handler = S3Handler()
+    key = s3_handler.write_dataframe(
+        FRAME, s3_bucket, "frames/stations.parquet", "parquet"
+    )
+
+    with s3_handler.download_to_spooled_file(s3_bucket, key) as parquet_file:
+        assert parquet_file.seekable()
+        df = pd.read_parquet(parquet_file)
+
+    pd.testing.assert_frame_equal(df, FRAME)
+
+
+def test_unknown_formats_are_rejected_before_encoding(s3_bucket):
+    with pytest.raises(ValueError):
+        S3Handler().write_dataframe(FRAME, s3_bucket, "frames/stations.xlsx", "xlsx")
@@ -0,0 +1,80 @@
+import datetime as dt
+
+import pandas as pd
+
+from bike_data_scraper.s3_client.s3_handler import S3Handler
+from bike_data_scraper.s3_client.weather_store import WeatherDayStore, split_by_day
+
+
+def open_meteo_response(start: str, hours: int) -> dict:
+    times = pd.date_range(start, periods=hours, freq="h")
+    return {
+        "hourly": {
+            "time": times.strftime("%Y-%m-%dT%H:%M").tolist(),
+            "temperature_2m": [float(hour.hour) for hour in times],
+            "relativehumidity_2m": [80] * hours,
+        }
+    }
+
+
+def test_split_by_day():
+    days = split_by_day(open_meteo_response("2023-10-01T22:00", 4))
+
+    assert list(days) == ["2023-10-01", "2023-10-02"]
+    assert days["2023-10-02"]["hourly"]["temperature_2m"] == [0.0, 1.0]
+
+
+def test_only_days_that_are_over_and_full_are_complete(s3_bucket):
+    store = WeatherDayStore(S3Handler(), s3_bucket, "weather")
+    store.save(
+        "goteborg",
+        open_meteo_response("2023-10-01T00:00", 2 * 24 + 10),
+        today=dt.date(2023, 10, 3),
+    )
+
+    missing = store.missing_days("goteborg", dt.date(2023, 9, 30), dt.date(2023, 10, 3))
+
+    assert missing == [dt.date(2023, 9, 30), dt.date(2023, 10, 3)]
+    assert store.load_manifest("goteborg")["days"]["2023-10-03"]["hours"] == 10
+
+
+def test_days_with_null_values_are_not_complete(s3_bucket):
+    store = WeatherDayStore(S3Handler(), s3_bucket, "weather")
+    response = open_meteo_response("2023-10-01T00:00", 3 * 24)
+    hourly = response["hourly"]
+    # The archive lags a few days and sends nulls for the hours it lacks
+    hourly["temperature_2m"][24:] = [None] * 48
+    hourly["relativehumidity_2m"][48:] = [None] * 24
+    store.save("goteborg", response, today=dt.date(2023, 10, 4))
+
+    missing = store.missing_days("goteborg", dt.date(2023, 10, 1), dt.date(2023, 10, 3))
+
+    assert missing == [dt.date(2023, 10, 2), dt.date(2023, 10, 3)]
+
+
+def test_complete_days_are_not_written_again(s3_bucket):
+    store = WeatherDayStore(S3Handler(), s3_bucket, "weather")
+    today = dt.date(2023, 10, 3)
+    store.save("goteborg", open_meteo_response("2023-10-01T00:00", 58), today=today)
+
+    written = store.save(
+        "goteborg", open_meteo_response("2023-10-01T00:00", 3 * 24), today=today
+    )
+
+    assert written == ["weather/goteborg/2023-10-03.csv"]
+
+
+def test_load_window_assembles_the_days(s3_bucket):
+    store = WeatherDayStore(S3Handler(), s3_bucket, "weather")
+    store.save(
+        "goteborg",
+        open_meteo_response("2023-10-01T00:00", 3 * 24),
+        today=dt.date(2023, 10, 4),
+    )
+
+    df = store.load_window("goteborg", dt.date(2023, 10, 2), dt.date(2023, 10, 3))
+
+    assert len(df) == 48
+    assert df["Time"].iloc[0] == pd.Timestamp("2023-10-02T00:00")
+    assert df["Time"].is_monotonic_increasing
+    assert df["Temperature"].dtype == "float32"